@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, List, Optional
+
+import aiohttp
+
+from jobhub_crawler.core.concurrency import AdaptiveConcurrency
+from jobhub_crawler.core.rate_limit import TokenBucket
+
+
+@dataclass
+class FetchResult:
+    """Kết quả của một request HTTP"""
+    url: str
+    status: Optional[int] = None
+    body: bytes = b""
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    meta: Optional[dict] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status == 200
+
+    @property
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Số giây chờ theo header Retry-After (dạng số giây hoặc HTTP-date), None nếu không có / không đọc được"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class AsyncFetcher:
+    """
+    Asyncio HTTP fetch engine for detail pages.
+
+    A single aiohttp session with a sized connection pool serves every request,
+    and an asyncio.Semaphore bounds how many are in flight at once, so hundreds of
+    fetches can run from one thread. When an AdaptiveConcurrency controller is given,
+    it additionally gates requests under its (moving) limit; the semaphore stays as a hard cap.
+    """
+
+    def __init__(self, max_concurrency: int = 100, timeout: float = 30, limit_per_host: int = 0,
+                 headers: Optional[Dict[str, str]] = None, cookies: Optional[Dict[str, str]] = None,
+                 retries: int = 2, retry_delay: float = 1.0, max_retry_after: float = 60.0,
+                 controller: Optional[AdaptiveConcurrency] = None, rate_limited: bool = True):
+        """
+        Initialize the fetch engine
+
+        Args:
+            max_concurrency: Maximum number of requests in flight
+            timeout: Per-request timeout in seconds
+            limit_per_host: Maximum open connections per host (0 = only bounded by max_concurrency)
+            headers: Default headers sent with every request
+            cookies: Default cookies sent with every request
+            retries: Extra attempts for connection errors, 429 and 5xx responses
+            retry_delay: Base delay between retries in seconds, doubled on each attempt
+                (used when the response carries no Retry-After header)
+            max_retry_after: Upper bound in seconds for a server-requested Retry-After wait
+            controller: Optional AIMD controller fed with each request's latency and status
+            rate_limited: Take a token from the per-host TokenBucket before each request
+        """
+        self.logger = logging.getLogger(__name__)
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.limit_per_host = limit_per_host
+        self.headers = headers or {}
+        self.cookies = cookies or {}
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.max_retry_after = max_retry_after
+        self.controller = controller
+        self.rate_limited = rate_limited
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.limit_per_host,
+                                         ttl_dns_cache=300)
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            cookies=self.cookies,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+
+    async def fetch(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, url: str,
+                    meta: Optional[dict] = None) -> FetchResult:
+        """
+        Fetch one URL, holding a semaphore slot while the request is in flight
+
+        Returns:
+            FetchResult: never raises; errors are reported in ``FetchResult.error``
+        """
+        result = FetchResult(url=url, meta=meta)
+        for attempt in range(self.retries + 1):
+            start = time.monotonic()
+            timed_out = False
+            retry_after = None
+            result.status = None
+            try:
+                if self.rate_limited:
+                    await TokenBucket.for_host(url).acquire_async()
+                async with semaphore:
+                    if self.controller:
+                        await self.controller.acquire_async()
+                        start = time.monotonic()
+                    try:
+                        async with session.get(url) as response:
+                            result.status = response.status
+                            result.body = await response.read()
+                            retry_after = _retry_after_seconds(response.headers.get('Retry-After'))
+                    except asyncio.TimeoutError:
+                        timed_out = True
+                        raise
+                    finally:
+                        if self.controller:
+                            self.controller.release(time.monotonic() - start, status=result.status,
+                                                    timeout=timed_out, error=result.status is None)
+                result.error = None
+                if response.status < 500 and response.status != 429:
+                    break
+                result.error = f"HTTP {response.status}"
+            except asyncio.TimeoutError:
+                result.error = f"Timeout after {self.timeout}s"
+            except aiohttp.ClientError as e:
+                result.error = str(e)
+            finally:
+                result.elapsed = time.monotonic() - start
+
+            if attempt < self.retries:
+                # 429 / 503 thường kèm Retry-After: chờ đúng thời gian server yêu cầu (có giới hạn),
+                # không có thì backoff luỹ thừa
+                if retry_after is not None:
+                    delay = min(retry_after, self.max_retry_after)
+                else:
+                    delay = self.retry_delay * 2 ** attempt
+                self.logger.warning(f"Retrying {url} in {delay:.1f}s ({attempt + 1}/{self.retries}): {result.error}")
+                await asyncio.sleep(delay)
+
+        if result.error:
+            self.logger.error(f"Failed to fetch {url}: {result.error}")
+        return result
+
+    async def fetch_all(self, urls: Iterable, on_result=None) -> List[FetchResult]:
+        """
+        Fetch many URLs concurrently over one shared session
+
+        Args:
+            urls: URLs to fetch; items may also be dicts with a 'url' key (passed back as ``meta``)
+            on_result: Optional callback invoked with each FetchResult as soon as it completes
+
+        Returns:
+            List of FetchResult in completion order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = []
+        async with self._create_session() as session:
+            tasks = []
+            for item in urls:
+                if isinstance(item, dict):
+                    tasks.append(self.fetch(session, semaphore, item['url'], meta=item))
+                else:
+                    tasks.append(self.fetch(session, semaphore, item))
+
+            for future in asyncio.as_completed(tasks):
+                result = await future
+                if on_result:
+                    on_result(result)
+                results.append(result)
+        return results
+
+    def run(self, urls: Iterable, on_result=None) -> List[FetchResult]:
+        """Blocking wrapper around fetch_all() for callers that are not async"""
+        return asyncio.run(self.fetch_all(urls, on_result=on_result))
@@ -1,18 +1,19 @@
 import logging
-import random
 import time
 import tempfile
 import os
 import shutil
 import atexit
-import psutil
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-import undetected_chromedriver as uc
+import threading
 
-from jobhub_crawler.utils.helpers import _get_file
+from jobhub_crawler.core.clearance import ClearanceStore
+from jobhub_crawler.core.driver_pool import ChromeDriverPool
+from jobhub_crawler.core.frontier import FrontierStore
+from jobhub_crawler.core.process_registry import BrowserProcessRegistry
+from jobhub_crawler.core.rate_limit import _rate_limit
+from jobhub_crawler.utils.cloudflare import _is_challenge_html
+from selenium.common import TimeoutException
+from selenium.webdriver.support.wait import WebDriverWait
 
 
 class BaseCrawler:
@@ -20,9 +21,11 @@ class BaseCrawler:
     _active_instances = []
     _cleanup_registered = False
 
-    def __init__(self, headless=True, user_agent=None, window_size=(1920, 1080), timeout=30, use_undetected=False):
+    def __init__(self, headless=True, user_agent=None, window_size=(1920, 1080), timeout=30, use_undetected=False,
+                 driver_pool=None, frontier=None, capture_network=False, blocked_resources=None):
         """
-        Initialize a Chrome browser for web crawling with optional Cloudflare bypass capabilities
+        Initialize the crawler; the Chrome browser (with optional Cloudflare bypass capabilities)
+        is only leased from the pool the first time ``self.driver`` is used
 
         Args:
             headless (bool): Run browser in headless mode if True
@@ -30,14 +33,42 @@ class BaseCrawler:
             window_size (tuple): Browser window dimensions (width, height)
             timeout (int): Page load timeout in seconds
             use_undetected (bool): Use undetected_chromedriver for Cloudflare bypass
+            driver_pool (ChromeDriverPool): Pool to lease the driver from (default: shared pool for this config)
+            frontier (FrontierStore): URL frontier used to decide which jobs to fetch (default: shared store)
+            capture_network (bool): Lease from a pool whose drivers record DevTools network events
+            blocked_resources (tuple): Resource groups the browser must not load
+                (default: pool default, see driver_pool.DEFAULT_BLOCKED_RESOURCES; () = block nothing)
         """
         # Set up logging
         self.logger = logging.getLogger(__name__)
         self.headless = headless
         self.timeout = timeout
-        self.driver = None
-        self.temp_dir = None
+        self._driver = None
+        self._driver_lock = threading.Lock()
+        # Số trang đã tải bằng driver đang mượn, báo lại cho pool khi trả driver
+        self._driver_pages = 0
         self.is_closed = False
+        # Queue do JobRunner.run_streaming() gán vào; None = giữ job trong self.jobs
+        self.item_queue = None
+        # Checkpoint do JobRunner gán vào; None = không checkpoint
+        self.checkpoint = None
+        # run() đặt True khi chạy hết mà không bị dừng giữa chừng (lỗi, bị chặn); JobRunner chỉ
+        # xoá checkpoint khi mọi spider đều completed
+        self.completed = False
+        self.job_count = 0
+        self.frontier = frontier or FrontierStore.shared()
+        pool_options = {}
+        if blocked_resources is not None:
+            pool_options['blocked_resources'] = tuple(blocked_resources)
+        self.driver_pool = driver_pool or ChromeDriverPool.shared(
+            headless=headless,
+            use_undetected=use_undetected,
+            user_agent=user_agent,
+            window_size=window_size,
+            timeout=timeout,
+            capture_network=capture_network,
+            **pool_options,
+        )
 
         # Register cleanup nếu chưa có
         if not BaseCrawler._cleanup_registered:
@@ -47,164 +78,102 @@ class BaseCrawler:
         # Add instance to registry
         BaseCrawler._active_instances.append(self)
 
+    @property
+    def driver(self):
+        """
+        Chrome driver of this crawler, leased from the pool on first access
+
+        Spiders (or modes) that only use HTTP never touch it, so no browser is started for them.
+        None once the crawler has been closed.
+        """
+        if self._driver is None and not self.is_closed:
+            with self._driver_lock:
+                if self._driver is None and not self.is_closed:
+                    self._lease_driver()
+        return self._driver
+
+    @driver.setter
+    def driver(self, value):
+        self._driver = value
+
+    def _lease_driver(self):
+        """Borrow a driver from the pool for this crawler"""
         try:
-            # Initialize the appropriate browser driver
-            if use_undetected:
-                self._init_undetected_driver()
-            else:
-                self._init_standard_driver(user_agent, window_size)
+            self._driver = self.driver_pool.acquire()
+            self._driver_pages = 0
+            self.logger.info("Leased Chrome browser from driver pool")
         except Exception as e:
-            self._cleanup()
+            self.logger.error(f"Failed to lease Chrome browser: {str(e)}")
             raise
 
-    def _create_temp_directory(self):
-        """Tạo thư mục temp riêng cho browser instance"""
-        try:
-            self.temp_dir = tempfile.mkdtemp(prefix='selenium_jobhub_')
-            self.logger.debug(f"Created temp directory: {self.temp_dir}")
-            return self.temp_dir
-        except Exception as e:
-            self.logger.error(f"Failed to create temp directory: {e}")
+    def _recycle_driver_if_needed(self):
+        """
+        Give the driver back between navigations when the pool wants it recycled (memory, age
+        or page budget, see ChromeDriverPool.should_recycle); the next access leases a fresh one
+        """
+        with self._driver_lock:
+            if self._driver is None:
+                return
+            reason = self.driver_pool.should_recycle(self._driver, self._driver_pages)
+            if reason is None:
+                return
+            self.logger.info(f"Recycling crawler browser ({reason})")
+            try:
+                self.driver_pool.release(self._driver, pages_served=self._driver_pages)
+            except Exception as e:
+                self.logger.warning(f"Error releasing driver: {e}")
+            self._driver = None
+
+    def _emit(self, job):
+        """Đẩy một JobItem ra ngoài: vào queue khi runner đang stream, ngược lại giữ trong self.jobs"""
+        self.job_count += 1
+        if self.checkpoint is not None:
+            self.checkpoint.record_item(type(self).__name__, job)
+        if self.item_queue is not None:
+            self.item_queue.put(job)
+        else:
+            self.jobs.append(job)
+
+    def _resume_pending(self):
+        """URL còn phải fetch từ checkpoint của lần chạy trước, None nếu phải chạy lại bước listing"""
+        if self.checkpoint is None:
             return None
+        return self.checkpoint.pending(type(self).__name__)
 
-    def _init_standard_driver(self, user_agent, window_size):
-        """Initialize standard Selenium Chrome driver"""
-        try:
-            # Tạo thư mục temp riêng
-            temp_dir = self._create_temp_directory()
-
-            # Configure Chrome options
-            chrome_options = Options()
-            if self.headless:
-                chrome_options.add_argument("--headless=new")
-
-            # Temp directory settings
-            if temp_dir:
-                chrome_options.add_argument(f'--user-data-dir={temp_dir}')
-                chrome_options.add_argument(f'--data-path={temp_dir}')
-                chrome_options.add_argument(f'--disk-cache-dir={temp_dir}/cache')
-
-            # Basic security and performance settings
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--enable-unsafe-swiftshader")
-            chrome_options.add_argument("--disable-extensions")
-            chrome_options.add_argument("--disable-plugins")
-            chrome_options.add_argument("--disable-images")  # Tiết kiệm băng thông
-            chrome_options.add_argument("--disable-javascript")  # Nếu không cần JS
-
-            # Reduce logging to minimize temp files
-            chrome_options.add_argument("--log-level=3")
-            chrome_options.add_argument("--silent")
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-
-            # Set window size
-            chrome_options.add_argument(f"--window-size={window_size[0]},{window_size[1]}")
-
-            # Set custom user agent if provided
-            if user_agent:
-                chrome_options.add_argument(f"user-agent={user_agent}")
-
-            # Initialize Chrome driver with service object
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-
-            # Set page load timeout
-            self.driver.set_page_load_timeout(self.timeout)
-
-            self.logger.info("Standard Chrome browser initialized successfully")
-        except Exception as e:
-            self.logger.error(f"Failed to initialize Chrome browser: {str(e)}")
-            raise
+    def _checkpoint_pending(self, url_objs):
+        """Lưu danh sách URL cần fetch ngay khi bước listing xong"""
+        if self.checkpoint is not None:
+            self.checkpoint.save_pending(type(self).__name__, url_objs)
 
-    def _init_undetected_driver(self):
-        """Initialize undetected_chromedriver to bypass Cloudflare protection"""
-        try:
-            # Tạo thư mục temp riêng
-            temp_dir = self._create_temp_directory()
-
-            options = uc.ChromeOptions()
-
-            # Temp directory settings
-            if temp_dir:
-                options.add_argument(f'--user-data-dir={temp_dir}')
-                options.add_argument(f'--data-path={temp_dir}')
-                options.add_argument(f'--disk-cache-dir={temp_dir}/cache')
-
-            # Add options for undetected_chromedriver
-            options.add_argument("--enable-unsafe-swiftshader")
-            options.add_argument("--disable-blink-features=AutomationControlled")
-            options.add_argument("--disable-extensions")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-infobars")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--ignore-certificate-errors")
-            options.add_argument("--disable-gpu")
-            options.add_argument("--start-maximized")
-            options.add_argument("--disable-plugins")
-            options.add_argument("--disable-images")
-
-            # Reduce logging
-            options.add_argument("--log-level=3")
-            options.add_argument("--silent")
-
-            if self.headless:
-                options.add_argument("--headless=new")
-
-            # Set a common user agent
-            options.add_argument(
-                "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36")
-
-            # Initialize the undetected ChromeDriver
-            self.driver = uc.Chrome(options=options)
-
-            self._inject_stealth_js()
-            # Set page load timeout
-            self.driver.set_page_load_timeout(self.timeout)
-
-            self.logger.info("Initialized undetected ChromeDriver for Cloudflare bypass")
-        except Exception as e:
-            self.logger.error(f"Error initializing undetected ChromeDriver: {str(e)}")
-            raise
-
-    def _inject_stealth_js(self):
-        """Inject stealth JavaScript"""
-        try:
-            js_file = _get_file('js', 'stealth.min.js')
-
-            # Đọc nội dung file stealth.min.js
-            with open(js_file, "r", encoding="utf-8") as f:
-                stealth_script = f.read()
-
-            # Dùng DevTools Protocol để inject
-            self.driver.execute_cdp_cmd(
-                'Page.addScriptToEvaluateOnNewDocument',
-                {
-                    'source': stealth_script
-                }
-            )
-        except Exception as e:
-            self.logger.warning(f"Failed to inject stealth JS: {e}")
+    def _checkpoint_failed(self, url_obj):
+        if self.checkpoint is not None:
+            self.checkpoint.record_failed(type(self).__name__, url_obj)
 
     def get(self, url, wait_time=0, bypass_cloudflare=False):
         """
         Navigate to URL with proper waiting and retry mechanism
 
+        Every navigation first takes a token from the per-host rate limiter, so request
+        rate stays bounded across all crawlers and threads without fixed sleeps.
+
         Args:
             url (str): URL to navigate to
             wait_time (int): Time to wait after page load in seconds
-            bypass_cloudflare (bool): Use enhanced Cloudflare bypass techniques
+            bypass_cloudflare (bool): Use enhanced Cloudflare bypass techniques: reuse the clearance
+                saved by an earlier session (ClearanceStore), wait for the challenge only when it is
+                actually served, and save the new clearance once it passes
         """
         if self.is_closed:
             self.logger.error("Cannot navigate - browser has been closed")
             return False
+        self._recycle_driver_if_needed()
 
         if not bypass_cloudflare:
             # Standard navigation
             try:
+                _rate_limit(url)
                 self.driver.get(url)
+                self._driver_pages += 1
                 if wait_time > 0:
                     time.sleep(wait_time)
                 return True
@@ -215,21 +184,37 @@ class BaseCrawler:
             # Enhanced Cloudflare bypass navigation
             max_retries = 3
             retry_delay = 5
+            clearance = ClearanceStore.shared()
+            # Dùng lại clearance còn hạn (của lần chạy trước / driver khác) để Cloudflare không challenge lại
+            applied = clearance.apply_to_driver(self.driver, url)
 
             for attempt in range(max_retries):
                 try:
                     self.logger.info(f"Navigating to {url}, attempt {attempt + 1}")
+                    _rate_limit(url)
                     self.driver.get(url)
-
-                    # Wait for page to load after potential Cloudflare challenge
-                    time.sleep(random.uniform(3, 7))
-
-                    # Check if we're still on Cloudflare challenge page
-                    if "checking your browser" in self.driver.page_source.lower():
-                        self.logger.info("Detected Cloudflare challenge, waiting longer...")
-                        time.sleep(10)  # Wait longer for Cloudflare challenge to complete
+                    self._driver_pages += 1
+
+                    if applied and _is_challenge_html(self.driver.page_source):
+                        # Clearance đã lưu không còn tác dụng: bỏ đi, giải challenge như bình thường
+                        clearance.invalidate(url)
+                        applied = False
+
+                    # Chờ tới khi trang Cloudflare challenge biến mất (trả về ngay nếu không có challenge)
+                    try:
+                        WebDriverWait(self.driver, 15).until(
+                            lambda driver: not _is_challenge_html(driver.page_source)
+                        )
+                        challenge_passed = True
+                    except TimeoutException:
+                        challenge_passed = False
+
+                    if not challenge_passed:
+                        self.logger.info("Cloudflare challenge did not clear, retrying...")
                     else:
                         # Successfully loaded page
+                        if not applied:
+                            clearance.save_from_driver(self.driver, url)
                         if wait_time > 0:
                             time.sleep(wait_time)
                         return True
@@ -239,8 +224,6 @@ class BaseCrawler:
                     if attempt < max_retries - 1:
                         time.sleep(retry_delay * (attempt + 1))  # Exponential backoff
 
-            # Add a random delay to mimic human behavior
-            time.sleep(random.uniform(1, 3))
             return False
 
     def _cleanup(self):
@@ -249,21 +232,14 @@ class BaseCrawler:
             return
 
         try:
-            # Close browser
-            if hasattr(self, 'driver') and self.driver:
+            # Trả driver về pool (pool sẽ quit và xoá temp dir khi recycle); chưa từng mượn thì không có gì để trả
+            if getattr(self, '_driver', None):
                 try:
-                    self.driver.quit()
-                    self.logger.debug("Browser driver closed")
+                    self.driver_pool.release(self._driver, pages_served=max(1, self._driver_pages))
+                    self.logger.debug("Browser driver returned to pool")
                 except Exception as e:
-                    self.logger.warning(f"Error closing driver: {e}")
-
-            # Remove temp directory
-            if self.temp_dir and os.path.exists(self.temp_dir):
-                try:
-                    shutil.rmtree(self.temp_dir, ignore_errors=True)
-                    self.logger.debug(f"Removed temp directory: {self.temp_dir}")
-                except Exception as e:
-                    self.logger.warning(f"Error removing temp directory: {e}")
+                    self.logger.warning(f"Error releasing driver: {e}")
+                self._driver = None
 
             self.is_closed = True
 
@@ -290,23 +266,21 @@ class BaseCrawler:
             except:
                 pass
         cls._active_instances.clear()
+        ChromeDriverPool.close_all()
 
         # Kill remaining Chrome processes
         cls._kill_orphaned_chrome_processes()
 
     @staticmethod
     def _kill_orphaned_chrome_processes():
-        """Kill các Chrome processes còn sót lại"""
+        """
+        Kill các Chrome processes còn sót lại
+
+        Chỉ dừng cây process của các browser do chính process này khởi chạy (BrowserProcessRegistry),
+        không đụng tới Chrome của crawler khác chạy chung máy.
+        """
         try:
-            killed_count = 0
-            for proc in psutil.process_iter(['pid', 'name']):
-                try:
-                    proc_name = proc.info['name'].lower()
-                    if any(name in proc_name for name in ['chrome', 'chromedriver']):
-                        proc.kill()
-                        killed_count += 1
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
+            killed_count = BrowserProcessRegistry.shared().kill_all()
             if killed_count > 0:
                 logging.getLogger(__name__).info(f"Killed {killed_count} orphaned Chrome processes")
         except Exception as e:
@@ -326,9 +300,13 @@ class BaseCrawler:
             'chromedriver_*'
         ]
 
+        # Profile của Chrome đang chạy (của process này hay crawler khác trên máy) phải giữ lại
+        in_use = BrowserProcessRegistry.shared().live_temp_dirs()
         cleaned_count = 0
         for pattern in patterns:
             for file_path in glob.glob(os.path.join(temp_dir, pattern)):
+                if file_path in in_use:
+                    continue
                 try:
                     if os.path.isfile(file_path):
                         os.unlink(file_path)
@@ -351,5 +329,5 @@ class BaseCrawler:
 
     def __del__(self):
         """Destructor để đảm bảo cleanup khi object bị garbage collected"""
-        if not self.is_closed:
+        if not getattr(self, 'is_closed', True):
             self._cleanup()
\ No newline at end of file
@@ -0,0 +1,169 @@
+import os
+import json
+import time
+import shutil
+import logging
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+from jobhub_crawler.core.job_item import JobItem
+from jobhub_crawler.utils.urls import _job_key
+
+# Cấu trúc thư mục checkpoint:
+#   items.jsonl : mỗi job đã thu thập một dòng, ghi + flush ngay khi spider emit
+#   state.json  : theo từng spider: 'pending' (URL cần fetch sau bước listing) và 'failed'
+#                 ghi định kỳ, thay thế nguyên tử (file tạm + os.replace)
+ITEMS_FILE = "items.jsonl"
+STATE_FILE = "state.json"
+
+
+class CrawlCheckpoint:
+    """
+    Periodic checkpoint of a crawl so a killed multi-hour run can be resumed.
+
+    Collected items are appended to disk as they are emitted; the URLs still to fetch
+    (saved once listing discovery finishes) and the failed URLs are snapshotted every
+    ``interval`` seconds. On resume, items already on disk are replayed to the sinks and
+    each spider continues with its pending + failed URLs, skipping listing discovery and
+    every detail page it already fetched.
+    """
+
+    def __init__(self, directory: str, resume: bool = False, interval: float = 30.0):
+        """
+        Open the checkpoint directory
+
+        Args:
+            directory: Where checkpoint files live
+            resume: Load the previous checkpoint; otherwise it is discarded and a fresh one started
+            interval: Minimum seconds between two state snapshots
+        """
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory
+        self.items_path = os.path.join(directory, ITEMS_FILE)
+        self.state_path = os.path.join(directory, STATE_FILE)
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = 0.0
+        self._state: Dict[str, Any] = {"spiders": {}}
+        self._done: Dict[str, set] = {}
+
+        if resume and os.path.exists(self.state_path):
+            self._load()
+        else:
+            if os.path.exists(self.state_path):
+                self.logger.info(f"Discarding previous checkpoint in {directory} (not resuming)")
+            self.clear()
+        os.makedirs(directory, exist_ok=True)
+        self._items_file = open(self.items_path, "a", encoding="utf-8")
+
+    def _load(self):
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            self._state = json.load(f)
+        # URL đã xong lấy từ items.jsonl (luôn mới hơn state.json)
+        for spider, job in self._iter_item_records():
+            self._done.setdefault(spider, set()).add(_job_key(job.get("url")))
+        done = sum(len(keys) for keys in self._done.values())
+        self.logger.info(f"Resuming from checkpoint {self.directory}: {done} jobs already collected")
+
+    def _iter_item_records(self) -> Iterator:
+        if not os.path.exists(self.items_path):
+            return
+        with open(self.items_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Dòng cuối có thể bị cắt dở khi process bị kill
+                    continue
+                yield record["spider"], record["job"]
+
+    def _spider(self, spider: str) -> Dict[str, Any]:
+        return self._state["spiders"].setdefault(spider, {})
+
+    # ------------------------------------------------------------------ ghi
+
+    def save_pending(self, spider: str, url_objs: List[Dict[str, Any]]):
+        """Record the URLs a spider still has to fetch once listing discovery is done"""
+        with self._lock:
+            state = self._spider(spider)
+            state["pending"] = list(url_objs)
+            state.setdefault("failed", [])
+            self._dirty = True
+        self.save(force=True)
+
+    def record_item(self, spider: str, job: JobItem):
+        """Append a collected job; its URL no longer counts as pending"""
+        line = json.dumps({"spider": spider, "job": job.to_dict()}, ensure_ascii=False)
+        with self._lock:
+            self._items_file.write(line + "\n")
+            self._items_file.flush()
+            self._done.setdefault(spider, set()).add(_job_key(job.url))
+        self.save()
+
+    def record_failed(self, spider: str, url_obj: Dict[str, Any]):
+        with self._lock:
+            failed = self._spider(spider).setdefault("failed", [])
+            if all(_job_key(item["url"]) != _job_key(url_obj["url"]) for item in failed):
+                failed.append(url_obj)
+                self._dirty = True
+        self.save()
+
+    def save(self, force: bool = False):
+        """Snapshot state.json if it changed and ``interval`` has elapsed (or force)"""
+        with self._lock:
+            now = time.monotonic()
+            if not self._dirty or (not force and now - self._last_save < self.interval):
+                return
+            self._state["updated_at"] = time.time()
+            tmp_path = self.state_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._state, f, ensure_ascii=False)
+            os.replace(tmp_path, self.state_path)
+            self._dirty = False
+            self._last_save = now
+
+    # ------------------------------------------------------------------ đọc
+
+    def pending(self, spider: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        URLs a resumed spider still has to fetch (pending + failed, minus collected)
+
+        Returns:
+            None when the spider has no checkpointed listing (it must run discovery)
+        """
+        with self._lock:
+            state = self._state["spiders"].get(spider)
+            if not state or "pending" not in state:
+                return None
+            done = self._done.get(spider, set())
+            remaining = {}
+            for url_obj in state["pending"] + state.get("failed", []):
+                key = _job_key(url_obj["url"])
+                if key not in done:
+                    remaining[key] = url_obj
+            return list(remaining.values())
+
+    def iter_items(self) -> Iterator[JobItem]:
+        """Jobs collected before the checkpoint, to be replayed to sinks on resume"""
+        for _, job in self._iter_item_records():
+            yield JobItem(**job)
+
+    def clear(self):
+        """Discard the checkpoint (after a run completed)"""
+        items_file = getattr(self, "_items_file", None)
+        if items_file:
+            items_file.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self._state = {"spiders": {}}
+        self._done = {}
+        self._dirty = False
+
+    def close(self, completed: bool = False):
+        """Flush everything; a completed run removes its checkpoint"""
+        if completed:
+            self.clear()
+            self.logger.info("Run completed, checkpoint removed")
+            return
+        self.save(force=True)
+        self._items_file.close()
@@ -0,0 +1,149 @@
+import os
+import json
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from jobhub_crawler.core.concurrency import _host_of
+from jobhub_crawler.utils.check import output_folder
+
+# Cookie chứng nhận đã vượt challenge; không có cookie này thì không có gì đáng lưu
+CLEARANCE_COOKIE = 'cf_clearance'
+# Thời hạn mặc định khi cookie không có expiry, và thời hạn tối đa dù cookie ghi hạn dài hơn
+DEFAULT_TTL = 30 * 60
+MAX_TTL = 24 * 3600
+
+
+class ClearanceStore:
+    """
+    Small JSON store of Cloudflare clearances (cf_clearance + related cookies + user agent) per host.
+
+    A clearance obtained by a browser is saved with an expiry and reused by later sessions
+    and runs: injected into new drivers before navigation (so the challenge page is not
+    served again) and into HTTP sessions. Entries are dropped on expiry or as soon as a
+    caller reports that the clearance no longer works.
+    """
+
+    _shared: Optional['ClearanceStore'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open the store
+
+        Args:
+            path: JSON file (default: $CLEARANCE_STORE or <output>/clearance.json)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = path or os.getenv('CLEARANCE_STORE') or os.path.join(output_folder or 'output', 'clearance.json')
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    @classmethod
+    def shared(cls) -> 'ClearanceStore':
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable clearance store {self.path}: {e}")
+            return {}
+
+    def _write(self):
+        # Gọi khi đang giữ self._lock
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def get(self, url_or_host: str) -> Optional[Dict[str, Any]]:
+        """Saved clearance {'cookies', 'user_agent', 'expires_at'} for the host, None if missing or expired"""
+        host = _host_of(url_or_host)
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry and entry['expires_at'] > time.time():
+                return entry
+            if entry:
+                del self._entries[host]
+                self._write()
+            return None
+
+    def save(self, url_or_host: str, cookies: List[Dict[str, Any]], user_agent: str) -> bool:
+        """
+        Save a clearance obtained by a browser
+
+        Args:
+            cookies: Selenium-style cookies of the host (driver.get_cookies())
+            user_agent: The browser's navigator.userAgent (Cloudflare binds the clearance to it)
+
+        Returns:
+            bool: False when the cookies carry no cf_clearance (nothing worth persisting)
+        """
+        clearance = next((c for c in cookies if c.get('name') == CLEARANCE_COOKIE), None)
+        if clearance is None:
+            return False
+        now = time.time()
+        expires_at = min(clearance.get('expiry') or now + DEFAULT_TTL, now + MAX_TTL)
+        host = _host_of(url_or_host)
+        with self._lock:
+            self._entries[host] = {'cookies': cookies, 'user_agent': user_agent, 'saved_at': now,
+                                   'expires_at': expires_at}
+            self._write()
+        self.logger.info(f"Saved Cloudflare clearance for {host} (valid {int(expires_at - now)}s)")
+        return True
+
+    def invalidate(self, url_or_host: str):
+        """Drop a clearance that was just rejected (challenge served despite the cookies)"""
+        host = _host_of(url_or_host)
+        with self._lock:
+            if self._entries.pop(host, None) is not None:
+                self._write()
+                self.logger.info(f"Cloudflare clearance for {host} no longer works, discarded")
+
+    def save_from_driver(self, driver, url: str) -> bool:
+        """Persist the clearance of a driver that just got past the challenge on url"""
+        try:
+            return self.save(url, driver.get_cookies(), driver.execute_script("return navigator.userAgent"))
+        except Exception as e:
+            self.logger.debug(f"Could not read clearance from driver: {e}")
+            return False
+
+    def apply_to_driver(self, driver, url: str) -> bool:
+        """
+        Inject the saved clearance into a driver before it navigates to url
+
+        Uses Network.setCookies so it works on a blank tab. Skipped when the driver's user
+        agent differs from the one the clearance was issued to (Cloudflare would reject it).
+        """
+        entry = self.get(url)
+        if not entry:
+            return False
+        try:
+            if driver.execute_script("return navigator.userAgent") != entry['user_agent']:
+                return False
+            cookies = []
+            for cookie in entry['cookies']:
+                cdp_cookie = {'name': cookie['name'], 'value': cookie['value'], 'domain': cookie.get('domain'),
+                              'path': cookie.get('path', '/'), 'secure': cookie.get('secure', False),
+                              'httpOnly': cookie.get('httpOnly', False)}
+                if cookie.get('expiry'):
+                    cdp_cookie['expires'] = cookie['expiry']
+                if cookie.get('sameSite'):
+                    cdp_cookie['sameSite'] = cookie['sameSite']
+                cookies.append(cdp_cookie)
+            driver.execute_cdp_cmd('Network.setCookies', {'cookies': cookies})
+            return True
+        except Exception as e:
+            self.logger.debug(f"Could not apply saved clearance to driver: {e}")
+            return False
@@ -0,0 +1,247 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+# Phản hồi coi là tín hiệu "site đang quá tải / đang throttle"
+THROTTLE_STATUSES = (429, 503)
+
+
+def _host_of(url_or_host: str) -> str:
+    """'https://www.topdev.vn/a?b' -> 'topdev.vn'; chuỗi không phải URL được coi là host"""
+    host = urlsplit(url_or_host).netloc or url_or_host
+    host = host.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class _Outcome:
+    """Kết quả một request, do caller điền vào bên trong AdaptiveConcurrency.slot()"""
+
+    def __init__(self):
+        self.status: Optional[int] = None
+        self.timeout = False
+
+
+class AdaptiveConcurrency:
+    """
+    Per-domain AIMD concurrency controller.
+
+    Works like a semaphore whose size (``limit``) moves at runtime: after each round of
+    ``limit`` successful requests with healthy latency and error rate, the limit grows
+    by ``increase``; on 429/503 or a timeout it is multiplied by ``decrease``. A cut is
+    applied at most once per cooldown so one burst of throttled responses counts once.
+
+    Usable from threads (``acquire``/``release``/``slot``) and from asyncio
+    (``acquire_async``); both share the same limit.
+    """
+
+    _registry: Dict[str, 'AdaptiveConcurrency'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, name: str, initial: int = 4, min_limit: int = 1, max_limit: int = 64,
+                 latency_target: float = 2.0, error_threshold: float = 0.1, increase: int = 1,
+                 decrease: float = 0.5, window: int = 50):
+        """
+        Initialize the controller
+
+        Args:
+            name: Domain (used in logs and metrics)
+            initial: Starting concurrency limit
+            min_limit: Limit never drops below this
+            max_limit: Limit never grows above this (size thread pools / drivers for it)
+            latency_target: Average latency (s) above which the limit stops growing
+            error_threshold: Error rate over the last ``window`` requests above which the limit stops growing
+            increase: Additive step per healthy round
+            decrease: Multiplicative factor on 429/503/timeout
+            window: Number of recent outcomes used for the error rate
+        """
+        self.logger = logging.getLogger(__name__)
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(max(initial, self.min_limit), self.max_limit)
+        self.latency_target = latency_target
+        self.error_threshold = error_threshold
+        self.increase = increase
+        self.decrease = decrease
+
+        self.in_flight = 0
+        self.avg_latency = 0.0
+        self.total_requests = 0
+        self.throttled = 0
+        self.increases = 0
+        self.decreases = 0
+        self._outcomes = deque(maxlen=window)
+        self._round_successes = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self._async_waiters = deque()
+
+    @classmethod
+    def for_host(cls, url_or_host: str, **kwargs) -> 'AdaptiveConcurrency':
+        """
+        Process-wide controller for a host; kwargs only apply when it is first created
+        """
+        host = _host_of(url_or_host)
+        with cls._registry_lock:
+            controller = cls._registry.get(host)
+            if controller is None:
+                controller = cls(host, **kwargs)
+                cls._registry[host] = controller
+            return controller
+
+    @classmethod
+    def all_metrics(cls) -> Dict[str, Dict[str, Any]]:
+        """Metrics of every registered controller, keyed by host"""
+        with cls._registry_lock:
+            controllers = list(cls._registry.values())
+        return {c.name: c.metrics() for c in controllers}
+
+    # ------------------------------------------------------------------ gate
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Block until a slot is free under the current limit; False on timeout"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.in_flight < self.limit, timeout=timeout):
+                return False
+            self.in_flight += 1
+            return True
+
+    async def acquire_async(self):
+        """asyncio counterpart of acquire()"""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self.in_flight < self.limit:
+                    self.in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._cond:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+                    else:
+                        # Đã được đánh thức nhưng bị huỷ: nhường lượt cho waiter khác
+                        self._notify()
+                raise
+
+    def release(self, latency: float = 0.0, status: Optional[int] = None, timeout: bool = False,
+                error: bool = False):
+        """
+        Free a slot and feed the outcome to the AIMD loop
+
+        Args:
+            latency: Request duration in seconds
+            status: HTTP status (None when unknown, e.g. Selenium navigation)
+            timeout: Request timed out
+            error: Request failed for another reason (counts towards error rate, no cut)
+        """
+        with self._cond:
+            self.in_flight -= 1
+            self.total_requests += 1
+
+            if timeout or status in THROTTLE_STATUSES:
+                self.throttled += 1
+                self._outcomes.append(False)
+                self._on_throttle()
+            elif error or (status is not None and status >= 500):
+                self._outcomes.append(False)
+            else:
+                self._outcomes.append(True)
+                self._on_success(latency)
+
+            self._notify()
+
+    @contextmanager
+    def slot(self):
+        """
+        Hold a slot for the duration of one request::
+
+            with controller.slot() as outcome:
+                response = session.get(url)
+                outcome.status = response.status_code
+
+        Exceptions are recorded as errors (``requests``/``asyncio`` timeouts as timeouts) and re-raised.
+        """
+        self.acquire()
+        outcome = _Outcome()
+        start = time.monotonic()
+        error = False
+        try:
+            yield outcome
+        except Exception as e:
+            if 'timeout' in type(e).__name__.lower():
+                outcome.timeout = True
+            else:
+                error = True
+            raise
+        finally:
+            self.release(time.monotonic() - start, status=outcome.status, timeout=outcome.timeout, error=error)
+
+    # ------------------------------------------------------------------ AIMD
+
+    def _error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def _on_success(self, latency: float):
+        # Trung bình trượt hàm mũ, đủ nhạy mà không nhảy theo từng request lẻ
+        self.avg_latency = latency if self.avg_latency == 0.0 else 0.8 * self.avg_latency + 0.2 * latency
+        self._round_successes += 1
+        if self._round_successes < self.limit:
+            return
+        self._round_successes = 0
+        if (self.limit < self.max_limit and self.avg_latency <= self.latency_target
+                and self._error_rate() <= self.error_threshold):
+            self.limit = min(self.max_limit, self.limit + self.increase)
+            self.increases += 1
+            self.logger.debug(f"[{self.name}] concurrency +{self.increase} -> {self.limit}")
+
+    def _on_throttle(self):
+        now = time.monotonic()
+        # Một đợt 429 liên tiếp chỉ tính là một lần cắt
+        cooldown = max(self.avg_latency, 1.0)
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        self._round_successes = 0
+        new_limit = max(self.min_limit, int(self.limit * self.decrease))
+        if new_limit < self.limit:
+            self.logger.info(f"[{self.name}] throttled, concurrency {self.limit} -> {new_limit}")
+            self.limit = new_limit
+            self.decreases += 1
+
+    def _notify(self):
+        # Gọi khi đang giữ self._cond: đánh thức luồng và coroutine đang chờ slot
+        self._cond.notify_all()
+        free = self.limit - self.in_flight
+        while free > 0 and self._async_waiters:
+            loop, waiter = self._async_waiters.popleft()
+            loop.call_soon_threadsafe(_wake, waiter)
+            free -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'limit': self.limit,
+                'in_flight': self.in_flight,
+                'avg_latency': round(self.avg_latency, 3),
+                'error_rate': round(self._error_rate(), 3),
+                'requests': self.total_requests,
+                'throttled': self.throttled,
+                'increases': self.increases,
+                'decreases': self.decreases,
+            }
+
+
+def _wake(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
@@ -0,0 +1,186 @@
+import os
+import re
+import sys
+import shutil
+import logging
+import threading
+import subprocess
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import undetected_chromedriver as uc
+from webdriver_manager.chrome import ChromeDriverManager
+
+# Tên file chromedriver theo hệ điều hành
+_DRIVER_NAME = 'chromedriver.exe' if sys.platform.startswith('win') else 'chromedriver'
+_VERSION_RE = re.compile(r'(\d+)\.(\d+)\.(\d+)\.(\d+)')
+_CHROME_COMMANDS = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome')
+
+
+def _chrome_executable() -> Optional[str]:
+    """Đường dẫn Chrome đã cài trên máy, None nếu không tìm thấy"""
+    for command in _CHROME_COMMANDS:
+        path = shutil.which(command)
+        if path:
+            return path
+    try:
+        return uc.find_chrome_executable()
+    except Exception:
+        return None
+
+
+def _chrome_version() -> Optional[str]:
+    """
+    Phiên bản Chrome đã cài (vd '124.0.6367.91'), đọc hoàn toàn offline
+
+    Windows: đọc từ registry (chrome.exe --version không in gì ra console);
+    các hệ khác: chạy `chrome --version`.
+    """
+    if sys.platform.startswith('win'):
+        try:
+            import winreg
+            for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+                try:
+                    with winreg.OpenKey(hive, r'Software\Google\Chrome\BLBeacon') as key:
+                        return winreg.QueryValueEx(key, 'version')[0]
+                except OSError:
+                    continue
+        except ImportError:
+            pass
+
+    executable = _chrome_executable()
+    if not executable:
+        return None
+    try:
+        output = subprocess.run([executable, '--version'], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = _VERSION_RE.search(output or '')
+    return match.group(0) if match else None
+
+
+class DriverBinaryCache:
+    """
+    Local cache of chromedriver binaries keyed by the installed Chrome version.
+
+    ``ChromeDriverManager().install()`` does a version lookup over the network on every
+    call and ``uc.Chrome`` re-patches a fresh chromedriver copy on every start. The cache
+    resolves both once per Chrome version and reuses them across drivers, pools and runs,
+    offline:
+
+        <directory>/<chrome version>/chromedriver              (standard Selenium)
+        <directory>/<chrome version>/undetected/chromedriver   (patched by undetected_chromedriver)
+
+    When Chrome is upgraded the version changes and a new entry is resolved once.
+    """
+
+    _shared: Optional['DriverBinaryCache'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Open the cache
+
+        Args:
+            directory: Cache root (default: $DRIVER_CACHE_DIR or ~/.cache/jobhub_crawler/drivers)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory or os.getenv('DRIVER_CACHE_DIR') or os.path.join(
+            os.path.expanduser('~'), '.cache', 'jobhub_crawler', 'drivers')
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._version_checked = False
+        self._patched = set()
+        self._patch_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> 'DriverBinaryCache':
+        """Process-wide cache used by every ChromeDriverPool"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @property
+    def chrome_version(self) -> Optional[str]:
+        """Installed Chrome version, detected once per process"""
+        with self._lock:
+            if not self._version_checked:
+                self._version = _chrome_version()
+                self._version_checked = True
+                if self._version is None:
+                    self.logger.warning("Could not detect the installed Chrome version, driver cache disabled")
+            return self._version
+
+    @property
+    def chrome_major(self) -> Optional[int]:
+        version = self.chrome_version
+        return int(version.split('.')[0]) if version else None
+
+    def _entry(self, *parts) -> str:
+        # Chỉ gọi sau khi chrome_version đã được đọc (không khoá lại self._lock)
+        return os.path.join(self.directory, self._version, *parts, _DRIVER_NAME)
+
+    def _store(self, source: str, target: str):
+        """Copy a chromedriver into the cache atomically (another process may be reading it)"""
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        shutil.copy2(source, tmp_path)
+        os.replace(tmp_path, target)
+
+    def _resolve(self) -> str:
+        # Gọi khi đang giữ self._lock
+        path = self._entry()
+        if not os.path.exists(path):
+            self.logger.info(f"Resolving chromedriver for Chrome {self._version}")
+            self._store(ChromeDriverManager().install(), path)
+        return path
+
+    def chromedriver_path(self) -> str:
+        """
+        Path of a chromedriver matching the installed Chrome
+
+        Resolved through webdriver_manager only on a cache miss; falls back to a plain
+        install() when the Chrome version cannot be detected.
+        """
+        if self.chrome_version is None:
+            return ChromeDriverManager().install()
+        with self._lock:
+            return self._resolve()
+
+    def undetected_path(self) -> Optional[str]:
+        """
+        Path of the chromedriver copy reserved for undetected_chromedriver, None if unknown
+
+        uc patches the file in place on its first start and skips patching when given an
+        already patched binary, so every later start reuses it as is.
+        """
+        if self.chrome_version is None:
+            return None
+        path = self._entry('undetected')
+        with self._lock:
+            if not os.path.exists(path):
+                self._store(self._resolve(), path)
+        return path
+
+    @contextmanager
+    def undetected_binary(self) -> Iterator[Optional[str]]:
+        """
+        Yield the uc chromedriver path (None when the version is unknown)
+
+        The first driver start per process is serialized, since uc patches the file in place;
+        later starts run concurrently.
+        """
+        path = self.undetected_path()
+        if path is None or path in self._patched:
+            yield path
+            return
+        with self._patch_lock:
+            yield path
+            self._patched.add(path)
+
+    def clear(self):
+        """Remove every cached binary (forces a fresh resolve on next use)"""
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self._patched.clear()
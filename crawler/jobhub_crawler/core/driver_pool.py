@@ -0,0 +1,603 @@
+import itertools
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import undetected_chromedriver as uc
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from jobhub_crawler.core.driver_cache import DriverBinaryCache
+from jobhub_crawler.core.driver_watchdog import DriverWatchdog
+from jobhub_crawler.core.process_registry import BrowserProcessRegistry
+from jobhub_crawler.core.profile_template import ProfileTemplate
+from jobhub_crawler.core.rate_limit import _rate_limit
+from jobhub_crawler.utils.helpers import _get_file
+from jobhub_crawler.utils.processes import _driver_root_pids
+
+DEFAULT_UNDETECTED_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/124.0.0.0 Safari/537.36"
+)
+
+# Nhóm tài nguyên có thể chặn, mỗi nhóm là danh sách pattern cho Network.setBlockedURLs ('*' = wildcard).
+# Pattern đuôi file kết thúc bằng '*' để khớp cả URL có query string (vd logo.png?v=2)
+BLOCKABLE_RESOURCES: Dict[str, Tuple[str, ...]] = {
+    'image': ('*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.avif*', '*.svg*', '*.ico*'),
+    'font': ('*.woff*', '*.woff2*', '*.ttf*', '*.otf*', '*.eot*'),
+    'media': ('*.mp4*', '*.webm*', '*.mp3*', '*.m3u8*', '*.ogg*'),
+    'stylesheet': ('*.css*',),
+    'analytics': ('*google-analytics.com*', '*googletagmanager.com*', '*hotjar.com*', '*clarity.ms*',
+                  '*connect.facebook.net*', '*mixpanel.com*', '*segment.io*', '*amplitude.com*'),
+    'ads': ('*doubleclick.net*', '*googlesyndication.com*', '*googleadservices.com*', '*adservice.google.*',
+            '*criteo.*', '*taboola.com*', '*outbrain.com*'),
+}
+# Mặc định không chặn 'stylesheet' / 'font' (chỉ bật khi cần): trang challenge Cloudflare và các lần chờ
+# phần tử hiển thị phụ thuộc vào layout, và cache CSS/font của profile mẫu chỉ có ích khi chúng được tải
+DEFAULT_BLOCKED_RESOURCES = ('image', 'media', 'analytics', 'ads')
+_MB = 1024 * 1024
+
+
+def _blocked_url_patterns(resources: Iterable[str], extra_urls: Iterable[str] = ()) -> List[str]:
+    """
+    Ghép danh sách pattern để chặn từ tên nhóm tài nguyên + pattern tuỳ chỉnh
+
+    Args:
+        resources: Tên nhóm trong BLOCKABLE_RESOURCES
+        extra_urls: Pattern bổ sung (vd '*tracking.example.com*')
+    """
+    patterns = []
+    for resource in resources:
+        if resource not in BLOCKABLE_RESOURCES:
+            raise ValueError(f"Unknown resource type '{resource}', expected one of {sorted(BLOCKABLE_RESOURCES)}")
+        patterns.extend(BLOCKABLE_RESOURCES[resource])
+    patterns.extend(extra_urls)
+    return list(dict.fromkeys(patterns))
+
+
+class DriverPoolTimeout(Exception):
+    """Raised when no driver could be leased from the pool in time"""
+
+
+@dataclass
+class _DriverSlot:
+    """Bookkeeping cho một driver nằm trong pool"""
+    driver: object
+    temp_dir: Optional[str]
+    created_at: float = field(default_factory=time.time)
+    pages_served: int = 0
+    # PID chromedriver / Chrome để watchdog đo RSS của cả cây process
+    pids: List[int] = field(default_factory=list)
+    rss: int = 0
+    rss_peak: int = 0
+    # Lý do phải recycle do watchdog đánh dấu; driver đang được mượn sẽ bị huỷ khi trả về
+    recycle_reason: Optional[str] = None
+    # Khoá trong BrowserProcessRegistry: cây process được dọn khi huỷ driver
+    registry_key: Optional[str] = None
+
+
+class ChromeDriverPool:
+    """
+    Bounded pool of warm Chrome drivers with acquire/release leasing.
+
+    Drivers are created lazily up to ``max_size``, handed out one lease at a time,
+    health-checked before every lease and recycled between leases once they have served
+    ``max_pages_per_driver`` pages, lived ``max_driver_age`` seconds or grown past
+    ``max_rss_mb`` (process tree RSS sampled by DriverWatchdog).
+    """
+
+    # Pool dùng chung theo cấu hình, để nhiều BaseCrawler cùng mượn driver
+    _shared_pools: Dict[Tuple, "ChromeDriverPool"] = {}
+    _shared_lock = threading.Lock()
+    _all_pools = weakref.WeakSet()
+    _ids = itertools.count(1)
+
+    def __init__(self, headless=True, use_undetected=True, max_size=2, min_idle=0, max_pages_per_driver=50,
+                 user_agent=None, window_size=(1920, 1080), timeout=30, capture_network=False,
+                 blocked_resources=DEFAULT_BLOCKED_RESOURCES, blocked_urls=(), use_profile_template=True,
+                 profile_warm_urls=(), max_rss_mb=1536, max_driver_age=0):
+        """
+        Initialize the driver pool
+
+        Args:
+            headless (bool): Run browsers in headless mode if True
+            use_undetected (bool): Build undetected_chromedriver instances instead of standard Selenium
+            max_size (int): Maximum number of live drivers (leased + idle)
+            min_idle (int): Number of drivers to start eagerly by warm()
+            max_pages_per_driver (int): Page budget before a driver is recycled (0 = unlimited)
+            user_agent (str): Custom user agent string
+            window_size (tuple): Browser window dimensions (width, height)
+            timeout (int): Page load timeout in seconds
+            capture_network (bool): Enable Chrome performance logging so DevTools network events
+                (and response bodies) can be read back, see utils.network_capture
+            blocked_resources (tuple): Resource groups from BLOCKABLE_RESOURCES that every driver
+                refuses to load (empty = block nothing)
+            blocked_urls (tuple): Extra URL patterns to block, '*' as wildcard
+            use_profile_template (bool): Start each driver from a clone of a pre-built profile
+                (see ProfileTemplate) instead of an empty user-data-dir
+            profile_warm_urls (tuple): Pages loaded once when the template is built, to warm its disk cache
+            max_rss_mb (int): Recycle a driver whose process tree (chromedriver + Chrome + renderers)
+                uses more memory than this (0 = unlimited)
+            max_driver_age (float): Recycle a driver after this many seconds (0 = unlimited)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.headless = headless
+        self.use_undetected = use_undetected
+        self.max_size = max(1, max_size)
+        self.min_idle = min(min_idle, self.max_size)
+        self.max_pages_per_driver = max_pages_per_driver
+        self.user_agent = user_agent
+        self.window_size = window_size
+        self.timeout = timeout
+        self.capture_network = capture_network
+        self.blocked_url_patterns = _blocked_url_patterns(blocked_resources, blocked_urls)
+        self.use_profile_template = use_profile_template
+        self.profile_warm_urls = tuple(profile_warm_urls)
+        self.max_rss_mb = max_rss_mb
+        self.max_driver_age = max_driver_age
+        self.name = f"{'undetected' if use_undetected else 'standard'}-{next(ChromeDriverPool._ids)}"
+
+        self._idle = deque()
+        self._leased: Dict[int, _DriverSlot] = {}
+        self._total = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+        # Metrics: số driver bị huỷ theo lý do, tổng số trang, RSS cao nhất của một driver
+        self._retired: Dict[str, int] = {}
+        self._pages_served = 0
+        self._rss_high_water = 0
+        # Watchdog chỉ bắt đầu theo dõi khi pool khởi động driver đầu tiên: pool của spider chỉ dùng
+        # HTTP không bao giờ tạo driver nên không kéo theo luồng lấy mẫu bộ nhớ
+        self._watched = False
+        ChromeDriverPool._all_pools.add(self)
+
+    @classmethod
+    def shared(cls, **kwargs) -> "ChromeDriverPool":
+        """Return the process-wide pool for this configuration, creating it on first use"""
+        key = tuple(sorted((name, str(value)) for name, value in kwargs.items()))
+        with cls._shared_lock:
+            pool = cls._shared_pools.get(key)
+            if pool is None or pool._closed:
+                pool = cls(**kwargs)
+                cls._shared_pools[key] = pool
+            return pool
+
+    @classmethod
+    def close_all(cls):
+        """Close every pool created in this process (dùng khi script kết thúc)"""
+        with cls._shared_lock:
+            cls._shared_pools.clear()
+        for pool in list(cls._all_pools):
+            pool.close()
+
+    @classmethod
+    def all_metrics(cls) -> Dict[str, Dict[str, Any]]:
+        """Metrics of every pool created in this process, keyed by pool name"""
+        return {pool.name: pool.metrics() for pool in list(cls._all_pools)}
+
+    # ------------------------------------------------------------------ leasing
+
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Lease a healthy driver from the pool
+
+        Args:
+            timeout (float): Seconds to wait for a free driver (None = wait forever)
+
+        Returns:
+            WebDriver: A driver leased to the caller; must be given back via release()
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            slot = None
+            create = False
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Driver pool has been closed")
+                    if self._idle:
+                        slot = self._idle.popleft()
+                        break
+                    if self._total < self.max_size:
+                        self._total += 1
+                        create = True
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise DriverPoolTimeout(f"No driver available after {timeout}s")
+                    self._cond.wait(remaining)
+
+            if create:
+                try:
+                    slot = self._create_slot()
+                except Exception:
+                    with self._cond:
+                        self._total -= 1
+                        self._cond.notify()
+                    raise
+            else:
+                reason = self._recycle_reason(slot)
+                if reason is None and not self._is_healthy(slot):
+                    reason = 'unhealthy'
+                if reason:
+                    self._destroy_slot(slot, reason)
+                    continue
+
+            with self._cond:
+                self._leased[id(slot.driver)] = slot
+            return slot.driver
+
+    def release(self, driver, pages_served: int = 1, discard: bool = False):
+        """
+        Return a leased driver to the pool
+
+        Args:
+            driver: Driver previously returned by acquire()
+            pages_served (int): Number of pages loaded during this lease
+            discard (bool): Quit the driver instead of keeping it warm (e.g. after an error)
+        """
+        if driver is None:
+            return
+
+        with self._cond:
+            slot = self._leased.pop(id(driver), None)
+        if slot is None:
+            self.logger.warning("Released a driver that was not leased from this pool")
+            return
+
+        slot.pages_served += pages_served
+        with self._cond:
+            self._pages_served += pages_served
+        reason = 'discarded' if discard else self._recycle_reason(slot)
+        if reason or self._closed:
+            self._destroy_slot(slot, reason)
+            return
+
+        with self._cond:
+            self._idle.append(slot)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None, pages_served: int = 1):
+        """
+        Context manager around acquire()/release()
+
+        Nếu có exception trong block, driver sẽ bị huỷ thay vì trả về pool.
+        """
+        driver = self.acquire(timeout=timeout)
+        try:
+            yield driver
+        except Exception:
+            self.release(driver, pages_served=pages_served, discard=True)
+            raise
+        else:
+            self.release(driver, pages_served=pages_served)
+
+    def warm(self, count: Optional[int] = None):
+        """Pre-start idle drivers so the first leases do not pay browser startup"""
+        target = self.min_idle if count is None else min(count, self.max_size)
+        while True:
+            with self._cond:
+                if self._closed or len(self._idle) >= target or self._total >= self.max_size:
+                    return
+                self._total += 1
+            try:
+                slot = self._create_slot()
+            except Exception as e:
+                with self._cond:
+                    self._total -= 1
+                self.logger.warning(f"Failed to warm driver pool: {e}")
+                return
+            with self._cond:
+                self._idle.append(slot)
+                self._cond.notify()
+
+    def close(self):
+        """Quit every idle driver; leased drivers are quit when released"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for slot in idle:
+            self._destroy_slot(slot)
+        DriverWatchdog.shared().unwatch(self)
+
+    def stats(self) -> Dict[str, int]:
+        """Current pool occupancy"""
+        with self._cond:
+            return {
+                "total": self._total,
+                "idle": len(self._idle),
+                "leased": len(self._leased),
+                "max_size": self.max_size,
+            }
+
+    def metrics(self) -> Dict[str, Any]:
+        """Recycles per reason, pages served and memory (current total / high-water mark of one driver)"""
+        with self._cond:
+            slots = list(self._idle) + list(self._leased.values())
+            return {
+                "drivers": self._total,
+                "pages_served": self._pages_served,
+                "rss_mb": round(sum(slot.rss for slot in slots) / _MB, 1),
+                "rss_high_water_mb": round(self._rss_high_water / _MB, 1),
+                "retired": dict(self._retired),
+            }
+
+    # ---------------------------------------------------------------- watchdog
+
+    def watched_slots(self) -> List[_DriverSlot]:
+        """Live drivers (idle and leased) for DriverWatchdog to measure"""
+        with self._cond:
+            return list(self._idle) + list(self._leased.values())
+
+    def record_memory(self, slot: _DriverSlot, rss: int):
+        """
+        Record a memory sample of a driver and flag it for recycling when over the limits
+
+        An idle flagged driver is retired immediately; a leased one when it is released.
+        """
+        with self._cond:
+            slot.rss = rss
+            slot.rss_peak = max(slot.rss_peak, rss)
+            self._rss_high_water = max(self._rss_high_water, rss)
+            if slot.recycle_reason is None:
+                if self.max_rss_mb and rss >= self.max_rss_mb * _MB:
+                    slot.recycle_reason = 'memory'
+                elif self.max_driver_age and time.time() - slot.created_at >= self.max_driver_age:
+                    slot.recycle_reason = 'age'
+            retire_now = slot.recycle_reason is not None and slot in self._idle
+            if retire_now:
+                self._idle.remove(slot)
+        if retire_now:
+            self._destroy_slot(slot, slot.recycle_reason)
+
+    def should_recycle(self, driver, pages_served: int = 0) -> Optional[str]:
+        """
+        Whether a leased driver should be given back now so it gets recycled
+
+        For callers that keep a driver across many tasks (a crawler's own driver, the tab pool's
+        browsers): checked between tasks, a non-None reason ('memory', 'age', 'pages') means
+        release the driver and lease a fresh one.
+
+        Args:
+            driver: Driver previously returned by acquire()
+            pages_served (int): Pages loaded during the current lease, not yet reported by release()
+        """
+        with self._cond:
+            slot = self._leased.get(id(driver))
+        if slot is None:
+            return None
+        return self._recycle_reason(slot, pages_served)
+
+    # ---------------------------------------------------------------- lifecycle
+
+    def _recycle_reason(self, slot: _DriverSlot, pages_served: int = 0) -> Optional[str]:
+        if slot.recycle_reason:
+            return slot.recycle_reason
+        if 0 < self.max_pages_per_driver <= slot.pages_served + pages_served:
+            return 'pages'
+        if self.max_driver_age and time.time() - slot.created_at >= self.max_driver_age:
+            return 'age'
+        return None
+
+    def _is_healthy(self, slot: _DriverSlot) -> bool:
+        """Check that the browser session is still alive"""
+        try:
+            slot.driver.execute_script("return 1")
+            return True
+        except Exception as e:
+            self.logger.debug(f"Driver health check failed: {e}")
+            return False
+
+    def _create_slot(self) -> _DriverSlot:
+        temp_dir = self._create_temp_directory()
+        try:
+            if self.use_undetected:
+                driver = self._build_undetected_driver(temp_dir)
+            else:
+                driver = self._build_standard_driver(temp_dir)
+            driver.set_page_load_timeout(self.timeout)
+            self._block_resources(driver)
+        except Exception:
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+        self.logger.info(f"Started new {'undetected' if self.use_undetected else 'standard'} Chrome for pool")
+        if not self._watched:
+            self._watched = True
+            DriverWatchdog.shared().watch(self)
+        pids = _driver_root_pids(driver)
+        return _DriverSlot(driver=driver, temp_dir=temp_dir, pids=pids,
+                           registry_key=BrowserProcessRegistry.shared().register(pids, temp_dir))
+
+    def _block_resources(self, driver):
+        """
+        Chặn các nhóm tài nguyên đã cấu hình (ảnh, media, analytics, quảng cáo...) ngay trong Chrome qua DevTools.
+
+        Network.setBlockedURLs áp dụng cho mọi request của tab (kể cả sau khi điều hướng),
+        nên chỉ cần gọi một lần khi tạo driver. Không dùng các switch --disable-images /
+        --disable-javascript vì Chrome không có các switch này.
+        """
+        if not self.blocked_url_patterns:
+            return
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_url_patterns})
+        except Exception as e:
+            self.logger.warning(f"Failed to enable resource blocking: {e}")
+
+    def _destroy_slot(self, slot: _DriverSlot, reason: Optional[str] = None):
+        if reason:
+            self.logger.info(f"Recycling driver ({reason}) after {slot.pages_served} pages, "
+                             f"{time.time() - slot.created_at:.0f}s, peak RSS {slot.rss_peak / _MB:.0f} MB")
+        try:
+            slot.driver.quit()
+        except Exception as e:
+            self.logger.warning(f"Error closing pooled driver: {e}")
+        # Dừng nốt process của đúng cây này nếu quit() để sót (không quét mọi process Chrome trên máy)
+        BrowserProcessRegistry.shared().kill(slot.registry_key)
+        if slot.temp_dir and os.path.exists(slot.temp_dir):
+            shutil.rmtree(slot.temp_dir, ignore_errors=True)
+        with self._cond:
+            self._total -= 1
+            if reason:
+                self._retired[reason] = self._retired.get(reason, 0) + 1
+            self._cond.notify()
+
+    def _create_temp_directory(self):
+        """Tạo thư mục temp riêng cho mỗi browser instance (clone từ profile mẫu nếu có)"""
+        if self.use_profile_template:
+            flavor = 'undetected' if self.use_undetected else 'standard'
+            try:
+                return ProfileTemplate.shared().clone(flavor, self._build_profile_template, self.profile_warm_urls)
+            except Exception as e:
+                self.logger.warning(f"Profile template unavailable, starting from an empty profile: {e}")
+        try:
+            return tempfile.mkdtemp(prefix='selenium_jobhub_')
+        except Exception as e:
+            self.logger.error(f"Failed to create temp directory: {e}")
+            return None
+
+    def _build_profile_template(self, user_data_dir, warm_urls):
+        """Chạy Chrome một lần trên thư mục mẫu để Chrome tạo profile (và nạp cache từ warm_urls) rồi thoát"""
+        if self.use_undetected:
+            driver = self._build_undetected_driver(user_data_dir)
+        else:
+            driver = self._build_standard_driver(user_data_dir)
+        registry = BrowserProcessRegistry.shared()
+        key = registry.register(_driver_root_pids(driver))
+        try:
+            driver.set_page_load_timeout(self.timeout)
+            for url in warm_urls:
+                try:
+                    _rate_limit(url)
+                    driver.get(url)
+                except Exception as e:
+                    self.logger.warning(f"Failed to warm profile template with {url}: {e}")
+        finally:
+            driver.quit()
+            registry.kill(key)
+
+    def _build_standard_driver(self, temp_dir):
+        """Build a standard Selenium Chrome driver"""
+        chrome_options = Options()
+        if self.headless:
+            chrome_options.add_argument("--headless=new")
+
+        if temp_dir:
+            chrome_options.add_argument(f'--user-data-dir={temp_dir}')
+            chrome_options.add_argument(f'--data-path={temp_dir}')
+            chrome_options.add_argument(f'--disk-cache-dir={temp_dir}/cache')
+
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--no-first-run")
+        chrome_options.add_argument("--no-default-browser-check")
+        chrome_options.add_argument("--disable-component-update")
+        chrome_options.add_argument("--disable-background-networking")
+        chrome_options.add_argument("--disable-sync")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--enable-unsafe-swiftshader")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-plugins")
+
+        chrome_options.add_argument("--log-level=3")
+        chrome_options.add_argument("--silent")
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+
+        chrome_options.add_argument(f"--window-size={self.window_size[0]},{self.window_size[1]}")
+        if self.user_agent:
+            chrome_options.add_argument(f"user-agent={self.user_agent}")
+        if self.capture_network:
+            chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+        # chromedriver lấy từ cache theo phiên bản Chrome, không tra cứu qua mạng mỗi lần khởi tạo
+        service = Service(DriverBinaryCache.shared().chromedriver_path())
+        return webdriver.Chrome(service=service, options=chrome_options)
+
+    def _build_undetected_driver(self, temp_dir):
+        """Build an undetected_chromedriver instance to bypass Cloudflare protection"""
+        options = uc.ChromeOptions()
+
+        if temp_dir:
+            options.add_argument(f'--user-data-dir={temp_dir}')
+            options.add_argument(f'--data-path={temp_dir}')
+            options.add_argument(f'--disk-cache-dir={temp_dir}/cache')
+
+        options.add_argument("--enable-unsafe-swiftshader")
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--no-first-run")
+        options.add_argument("--no-default-browser-check")
+        options.add_argument("--disable-component-update")
+        options.add_argument("--disable-sync")
+        options.add_argument("--disable-infobars")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--ignore-certificate-errors")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-software-rasterizer")
+        options.add_argument("--start-maximized")
+        options.add_argument("--disable-plugins")
+
+        options.add_argument("--log-level=3")
+        options.add_argument("--silent")
+
+        if self.headless:
+            options.add_argument("--headless=new")
+
+        options.add_argument(f"user-agent={DEFAULT_UNDETECTED_USER_AGENT}")
+        if self.capture_network:
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+        # Dùng lại chromedriver đã patch trong cache thay vì để uc tải + patch bản mới mỗi lần
+        cache = DriverBinaryCache.shared()
+        with cache.undetected_binary() as driver_path:
+            if driver_path:
+                driver = uc.Chrome(options=options, use_subprocess=False, driver_executable_path=driver_path,
+                                   version_main=cache.chrome_major)
+            else:
+                driver = uc.Chrome(options=options, use_subprocess=False)
+        self._inject_stealth_js(driver)
+        return driver
+
+    @staticmethod
+    def _stealth_script() -> str:
+        with open(_get_file('js', 'stealth.min.js'), "r", encoding="utf-8") as f:
+            return f.read()
+
+    def _inject_stealth_js(self, driver):
+        """Inject stealth JavaScript"""
+        try:
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': self._stealth_script()})
+        except Exception as e:
+            self.logger.warning(f"Failed to inject stealth JS: {e}")
+
+    def target_setup_commands(self) -> List[Tuple[str, dict]]:
+        """
+        CDP commands a new tab (target) of one of this pool's browsers needs to behave like the
+        driver's own tab: resource blocking and, for undetected drivers, the stealth script
+        """
+        commands = []
+        if self.blocked_url_patterns:
+            commands.append(('Network.enable', {}))
+            commands.append(('Network.setBlockedURLs', {'urls': self.blocked_url_patterns}))
+        if self.use_undetected:
+            try:
+                commands.append(('Page.addScriptToEvaluateOnNewDocument', {'source': self._stealth_script()}))
+            except OSError as e:
+                self.logger.warning(f"Failed to load stealth JS: {e}")
+        return commands
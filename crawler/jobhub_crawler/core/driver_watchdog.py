@@ -0,0 +1,89 @@
+import os
+import logging
+import threading
+import weakref
+from typing import Optional
+
+from jobhub_crawler.utils.processes import _process_tree_rss
+
+DEFAULT_INTERVAL = 15.0
+
+
+class DriverWatchdog:
+    """
+    Background thread that samples the memory of every pooled driver.
+
+    Every ``interval`` seconds it measures the RSS of each driver's process tree
+    (chromedriver + Chrome + renderers) and hands it to the owning ChromeDriverPool, which
+    records the high-water marks and decides whether the driver has to be recycled. Drivers
+    are never killed mid-task: idle ones are retired right away, leased ones when they are
+    released (see ChromeDriverPool.should_recycle).
+    """
+
+    _shared: Optional['DriverWatchdog'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, interval: Optional[float] = None):
+        """
+        Initialize the watchdog (the thread starts with the first watched pool)
+
+        Args:
+            interval: Seconds between samples (default: $DRIVER_WATCHDOG_INTERVAL or 15)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.interval = interval or float(os.getenv('DRIVER_WATCHDOG_INTERVAL') or DEFAULT_INTERVAL)
+        self._pools = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def shared(cls) -> 'DriverWatchdog':
+        """Process-wide watchdog used by every ChromeDriverPool"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def watch(self, pool):
+        """Start sampling the drivers of a pool"""
+        with self._lock:
+            self._pools.add(pool)
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='driver-watchdog', daemon=True)
+                self._thread.start()
+
+    def unwatch(self, pool):
+        with self._lock:
+            self._pools.discard(pool)
+
+    def stop(self):
+        """Stop the sampling thread"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.interval)
+
+    def sample(self):
+        """Measure every watched driver once"""
+        with self._lock:
+            pools = list(self._pools)
+        for pool in pools:
+            for slot in pool.watched_slots():
+                if not slot.pids:
+                    continue
+                try:
+                    rss = _process_tree_rss(slot.pids)
+                except Exception as e:
+                    self.logger.debug(f"Failed to measure driver memory: {e}")
+                    continue
+                if rss:
+                    pool.record_memory(slot, rss)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                self.logger.warning(f"Driver watchdog sample failed: {e}")
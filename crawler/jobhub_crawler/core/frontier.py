@@ -0,0 +1,261 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from jobhub_crawler.utils.check import output_folder, last_file_output
+from jobhub_crawler.utils.jsonl import _iter_jobs
+from jobhub_crawler.utils.urls import _job_key
+
+# Trạng thái của một URL trong frontier
+STATUS_NEW = 'new'          # chưa từng fetch
+STATUS_FETCHED = 'fetched'  # fetch + parse thành công và job đã nằm trong output
+STATUS_FAILED = 'failed'    # lần fetch gần nhất lỗi (network, HTTP != 200 hoặc parse lỗi)
+STATUS_STALE = 'stale'      # đã fetch nhưng quá hạn stale_after
+
+# Tăng khi đổi schema; DB cũ được tạo lại (frontier chỉ là cache, seed lại từ output được)
+_SCHEMA_VERSION = 2
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS frontier (
+    job_key       TEXT PRIMARY KEY,
+    url           TEXT NOT NULL,
+    source        TEXT NOT NULL,
+    title         TEXT,
+    first_seen    REAL NOT NULL,
+    last_seen     REAL NOT NULL,
+    last_fetched  REAL,
+    http_status   INTEGER,
+    content_hash  TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_frontier_source_seen ON frontier (source, last_seen);
+"""
+
+
+def _content_hash(job) -> str:
+    """Hash nội dung job đã parse (JobItem hoặc dict) để phát hiện tin tuyển dụng thay đổi"""
+    data = job.to_dict() if hasattr(job, 'to_dict') else job
+    payload = json.dumps(data, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class FrontierStore:
+    """
+    Persistent URL frontier backed by SQLite, keyed by the canonical job key (urls._job_key).
+
+    Replaces "read the latest output file and diff" dedup: every URL a spider sees is
+    recorded with first_seen / last_seen, and every fetch with last_fetched, HTTP status
+    and a content hash. Whether a URL is new, stale or failed is answered by a primary-key
+    lookup instead of a full parse of the previous output.
+
+    A successful fetch is only held in memory until commit_fetched(), which JobRunner calls
+    once the job is safely in the output: a run that dies (or whose output is lost) must
+    not leave URLs marked as fetched that no output contains.
+
+    One connection is shared by all spider threads and guarded by a lock.
+    """
+
+    _shared: Optional['FrontierStore'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, db_path: Optional[str] = None, stale_after: Optional[float] = None):
+        """
+        Open (or create) the frontier database
+
+        Args:
+            db_path: SQLite file (default: $FRONTIER_DB or <output>/frontier.db)
+            stale_after: Seconds after which a fetched URL is due for a refetch (None = never)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path or os.getenv('FRONTIER_DB') or os.path.join(output_folder or 'output', 'frontier.db')
+        self.stale_after = stale_after
+        self._lock = threading.Lock()
+        # job_key -> (last_fetched, http_status, content_hash) của các fetch thành công chờ commit_fetched()
+        self._pending: Dict[str, tuple] = {}
+
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        # WAL để đọc không bị chặn bởi ghi, synchronous=NORMAL là đủ an toàn với WAL
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        if self._conn.execute('PRAGMA user_version').fetchone()[0] != _SCHEMA_VERSION:
+            self._conn.execute('DROP TABLE IF EXISTS frontier')
+            self._conn.execute(f'PRAGMA user_version = {_SCHEMA_VERSION}')
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    @classmethod
+    def shared(cls) -> 'FrontierStore':
+        """
+        Process-wide store used by spiders that are not given one explicitly.
+
+        On first use with an empty database the URLs of the latest output file are imported,
+        so switching to the frontier does not refetch everything already collected.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                store = cls()
+                if store.count() == 0 and last_file_output:
+                    store.import_output(last_file_output)
+                cls._shared = store
+            return cls._shared
+
+    # ------------------------------------------------------------------ ghi
+
+    def mark_seen(self, source: str, url_objs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Record URLs found on listing pages and return those that need fetching
+
+        Args:
+            source: Spider source (e.g. base_url)
+            url_objs: {'title', 'url'} dicts from the listing pages
+
+        Returns:
+            The url dicts whose job is new, stale or failed, in input order without duplicate job keys
+        """
+        now = time.time()
+        url_objs = list({_job_key(obj['url']): obj for obj in url_objs if obj.get('url')}.values())
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT INTO frontier (job_key, url, source, title, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(job_key) DO UPDATE SET
+                    url = excluded.url, last_seen = excluded.last_seen, title = excluded.title
+                """,
+                [(_job_key(obj['url']), obj['url'], source, obj.get('title', ''), now, now) for obj in url_objs]
+            )
+            self._conn.commit()
+        return [obj for obj in url_objs if self.status(obj['url'], now) != STATUS_FETCHED]
+
+    def record_fetch(self, url: str, http_status: Optional[int], job=None):
+        """
+        Record the outcome of fetching a detail page
+
+        A failure is written right away (the URL stays due for a refetch). A parsed job is
+        only kept pending until commit_fetched(), so the row remains new / failed until the
+        job has been persisted.
+
+        Args:
+            url: Detail page URL
+            http_status: HTTP status code (0 = network error / no response)
+            job: Parsed JobItem (or dict); None marks the fetch as failed
+        """
+        key = _job_key(url)
+        if job is not None:
+            pending = (time.time(), http_status, _content_hash(job))
+            with self._lock:
+                self._pending[key] = pending
+            return
+        with self._lock:
+            self._pending.pop(key, None)
+            self._conn.execute(
+                """
+                UPDATE frontier SET last_fetched = ?, http_status = ?, content_hash = NULL
+                WHERE job_key = ?
+                """,
+                (time.time(), http_status, key)
+            )
+            self._conn.commit()
+
+    def commit_fetched(self, exclude: Iterable[str] = ()) -> int:
+        """
+        Mark the pending successful fetches as fetched, once their jobs are in the output
+
+        Args:
+            exclude: URLs whose job could not be written (they stay due for a refetch)
+
+        Returns:
+            Number of URLs marked as fetched
+        """
+        excluded = {_job_key(url) for url in exclude}
+        with self._lock:
+            rows = [(*pending, key) for key, pending in self._pending.items() if key not in excluded]
+            self._pending.clear()
+            self._conn.executemany(
+                """
+                UPDATE frontier SET last_fetched = ?, http_status = ?, content_hash = ?
+                WHERE job_key = ?
+                """,
+                rows
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def discard_pending(self) -> int:
+        """Drop the pending fetches when the output could not be saved; returns how many were dropped"""
+        with self._lock:
+            dropped = len(self._pending)
+            self._pending.clear()
+        return dropped
+
+    def import_output(self, file_path: str, source: Optional[str] = None) -> int:
+        """
+        Seed the frontier from an output file (legacy .json or JSONL)
+
+        Jobs in the file are recorded as fetched, so they are not treated as new.
+
+        Returns:
+            Number of jobs imported
+        """
+        now = time.time()
+        rows = [
+            (_job_key(job['url']), job['url'], source or job.get('source', ''), job.get('title', ''),
+             now, now, now, 200, _content_hash(job))
+            for job in _iter_jobs(file_path) if job.get('url')
+        ]
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT OR IGNORE INTO frontier
+                    (job_key, url, source, title, first_seen, last_seen, last_fetched, http_status, content_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+            self._conn.commit()
+        self.logger.info(f"Imported {len(rows)} URLs into frontier from {file_path}")
+        return len(rows)
+
+    # ------------------------------------------------------------------ đọc
+
+    def status(self, url: str, now: Optional[float] = None) -> str:
+        """Return STATUS_NEW / STATUS_FETCHED / STATUS_FAILED / STATUS_STALE for a URL"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_fetched, http_status, content_hash FROM frontier WHERE job_key = ?", (_job_key(url),)
+            ).fetchone()
+
+        if row is None or row['last_fetched'] is None:
+            return STATUS_NEW
+        if row['http_status'] != 200 or row['content_hash'] is None:
+            return STATUS_FAILED
+        if self.stale_after is not None and (now or time.time()) - row['last_fetched'] > self.stale_after:
+            return STATUS_STALE
+        return STATUS_FETCHED
+
+    def is_new(self, url: str) -> bool:
+        return self.status(url) == STATUS_NEW
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Full frontier record of a URL, None if never seen"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM frontier WHERE job_key = ?", (_job_key(url),)).fetchone()
+        return dict(row) if row else None
+
+    def count(self, source: Optional[str] = None) -> int:
+        with self._lock:
+            if source:
+                return self._conn.execute("SELECT COUNT(*) FROM frontier WHERE source = ?", (source,)).fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM frontier").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -14,6 +14,10 @@ class JobItem:
     url: str
     source: str
     description: Optional[str] = None
+    # Hạn nộp hồ sơ (validThrough của JSON-LD), chỉ có khi trang khai báo
+    valid_through: Optional[str] = None
+    # Ngày đăng dạng ISO (datePosted của JSON-LD); posted_at vẫn giữ chuỗi hiển thị của trang
+    date_posted: Optional[str] = None
 
     def to_dict(self):
         return asdict(self)
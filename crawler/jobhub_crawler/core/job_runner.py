@@ -1,13 +1,19 @@
 import threading
-import json
 import logging
 import os
+import queue
 import time
-from datetime import datetime
 from typing import List, Type, Optional, Dict, Any
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from jobhub_crawler.core.checkpoint import CrawlCheckpoint
+from jobhub_crawler.core.concurrency import AdaptiveConcurrency
+from jobhub_crawler.core.driver_pool import ChromeDriverPool
+from jobhub_crawler.core.frontier import FrontierStore
 from jobhub_crawler.core.job_item import JobItem
+from jobhub_crawler.core.rate_limit import TokenBucket
+from jobhub_crawler.core.sinks import JobSink, StatsSink
+from jobhub_crawler.utils.jsonl import JsonlWriter, _output_filename
 
 
 class JobRunner:
@@ -16,19 +22,27 @@ class JobRunner:
     and consolidates their results into a single output.
     """
 
-    def __init__(self, output_dir: str = "output", log_level: int = logging.INFO):
+    def __init__(self, output_dir: str = "output", log_level: int = logging.INFO, resume: bool = False,
+                 checkpoint_interval: float = 30.0):
         """
         Initialize the JobRunner
 
         Args:
             output_dir: Directory to save output files
             log_level: Logging level (e.g., logging.INFO, logging.DEBUG)
+            resume: Continue from the checkpoint left by an interrupted run
+            checkpoint_interval: Seconds between checkpoint snapshots
         """
         self.jobs: List[JobItem] = []
         self.lock = threading.Lock()
         self.output_dir = output_dir
         self.start_time = None
         self.end_time = None
+        self.stream_stats: Optional[StatsSink] = None
+        # Frontier của các spider: URL chỉ được đánh dấu đã fetch khi job đã lưu vào output
+        self._frontiers = set()
+        # Spider bị lỗi / dừng giữa chừng trong lần chạy này: còn spider nào thì giữ checkpoint để --resume
+        self.failed_spiders: List[str] = []
 
         # Configure root logger first to ensure all loggers display to console
         root_logger = logging.getLogger()
@@ -60,22 +74,41 @@ class JobRunner:
             os.makedirs(output_dir)
             self.logger.info(f"Created output directory: {output_dir}")
 
-    def run_spider(self, spider_class: Type) -> List[JobItem]:
+        # Checkpoint trong output/checkpoint: job đã thu thập + URL còn lại của từng spider
+        self.checkpoint = CrawlCheckpoint(os.path.join(output_dir, "checkpoint"), resume=resume,
+                                          interval=checkpoint_interval)
+
+    def run_spider(self, spider_class: Type, item_queue: Optional[queue.Queue] = None) -> List[JobItem]:
         """
         Run a single spider and return its results
 
+        A spider that raised or did not finish cleanly (``spider.completed`` still False) is
+        added to ``failed_spiders``, which keeps the checkpoint for a later --resume.
+
         Args:
             spider_class: The spider class to instantiate and run
+            item_queue: If given, the spider streams each JobItem into this queue instead of keeping it
 
         Returns:
-            List of JobItem objects collected by the spider
+            List of JobItem objects collected by the spider (empty when streaming)
         """
         spider_name = spider_class.__name__
         self.logger.info(f"Starting spider: {spider_name}")
 
         try:
             spider = spider_class()
+            spider.checkpoint = self.checkpoint
+            with self.lock:
+                self._frontiers.add(spider.frontier)
+            if item_queue is not None:
+                spider.item_queue = item_queue
+                spider.run()
+                self._check_completed(spider, spider_name)
+                self.logger.info(f"Spider {spider_name} streamed {spider.job_count} jobs")
+                return []
+
             jobs = spider.run()  # Assuming updated spider.run() returns the jobs list
+            self._check_completed(spider, spider_name)
 
             if jobs:
                 self.logger.info(f"Spider {spider_name} collected {len(jobs)} jobs")
@@ -88,8 +121,16 @@ class JobRunner:
 
         except Exception as e:
             self.logger.error(f"Error running spider {spider_name}: {str(e)}")
+            with self.lock:
+                self.failed_spiders.append(spider_name)
             return []
 
+    def _check_completed(self, spider, spider_name: str):
+        if not spider.completed:
+            self.logger.warning(f"Spider {spider_name} did not finish cleanly, keeping checkpoint")
+            with self.lock:
+                self.failed_spiders.append(spider_name)
+
     def run_all(self, spiders: List[Type], max_workers: Optional[int] = None, timeout: Optional[int] = None) -> List[
         JobItem]:
         """
@@ -110,6 +151,9 @@ class JobRunner:
         max_workers = max_workers or len(spiders)
         self.logger.info(f"Using thread pool with {max_workers} workers")
 
+        # Job đã thu thập trước khi lần chạy trước bị dừng (rỗng nếu không resume)
+        self.jobs.extend(self._replay_checkpoint())
+
         results = {}
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             # Submit all spiders to the executor
@@ -128,6 +172,8 @@ class JobRunner:
                     self.logger.error(f"Spider {spider_name} generated an exception: {str(e)}")
 
         self.end_time = time.time()
+        # Checkpoint chỉ bị xoá khi save_results() đã ghi xong output
+        self.checkpoint.close(completed=False)
         duration = self.end_time - self.start_time
         self.logger.info(f"All spiders completed in {duration:.2f} seconds")
         self.logger.info(f"Results summary: {results}")
@@ -135,49 +181,143 @@ class JobRunner:
 
         return self.jobs
 
-    def save_results(self, filename: Optional[str] = None) -> str:
+    def run_streaming(self, spiders: List[Type], sinks: List[JobSink], max_workers: Optional[int] = None,
+                      queue_size: int = 1000) -> Dict[str, Any]:
         """
-        Save collected jobs to a JSON file
+        Run all spiders concurrently and stream their items to sinks as they arrive
+
+        Spiders push each JobItem into a bounded queue (blocking when it is full) and this
+        thread drains it into every sink, so memory stays flat regardless of run size.
 
         Args:
-            filename: Optional filename override
+            spiders: List of spider classes to run
+            sinks: Destinations for the streamed items (e.g. JsonlFileSink)
+            max_workers: Maximum number of concurrent threads (default: number of spiders)
+            queue_size: Maximum number of items buffered between spiders and sinks
 
         Returns:
-            Path to the saved file
+            Statistics of the run, same shape as get_stats()
         """
-        if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"jobs_{timestamp}.json"
+        self.start_time = time.time()
+        self.stream_stats = StatsSink()
+        sinks = [self.stream_stats] + list(sinks)
+        item_queue = queue.Queue(maxsize=queue_size)
 
-        filepath = os.path.join(self.output_dir, filename)
+        self.logger.info(f"Starting streaming job runner with {len(spiders)} spiders")
+        for sink in sinks:
+            sink.open()
 
-        # Convert jobs to dictionaries
-        data = [job.to_dict() for job in self.jobs]
+        # URL của job không ghi được vào sink nào đó: frontier không đánh dấu là đã fetch
+        unsaved = set()
+        # Phát lại job đã có trong checkpoint để output cuối cùng đầy đủ (không có gì nếu không resume)
+        for job in self._replay_checkpoint():
+            if not self._write_to_sinks(sinks, job):
+                unsaved.add(job.url)
 
-        # Add metadata
-        metadata = {
-            "total_jobs": len(data),
-            "created_at": datetime.now().isoformat(),
-            "execution_time": self.end_time - self.start_time if self.end_time and self.start_time else 0.0,
-            "sources": self._get_job_sources()
-        }
+        max_workers = max_workers or len(spiders)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self.run_spider, spider, item_queue) for spider in spiders]
 
-        output = {
-            "metadata": metadata,
-            "jobs": data
-        }
+            # Đọc queue cho tới khi mọi spider đã xong và queue rỗng
+            while True:
+                try:
+                    job = item_queue.get(timeout=0.5)
+                except queue.Empty:
+                    if all(future.done() for future in futures):
+                        break
+                    continue
+
+                if not self._write_to_sinks(sinks, job):
+                    unsaved.add(job.url)
+
+        self.end_time = time.time()
+        run_info = {"execution_time": self.end_time - self.start_time}
+        persisted = True
+        for sink in sinks:
+            try:
+                sink.close(run_info)
+            except Exception as e:
+                self.logger.error(f"Error closing sink {type(sink).__name__}: {str(e)}")
+                persisted = False
+        self._commit_frontiers(persisted, exclude=unsaved)
+        self.checkpoint.close(completed=persisted and not self.failed_spiders)
+
+        stats = self.get_stats()
+        self.logger.info(f"All spiders completed in {run_info['execution_time']:.2f} seconds")
+        self.logger.info(f"Total jobs streamed: {stats['total_jobs']}")
+        return stats
+
+    def _write_to_sinks(self, sinks: List[JobSink], job: JobItem) -> bool:
+        """Ghi job vào mọi sink; False nếu có sink ghi lỗi"""
+        written = True
+        for sink in sinks:
+            try:
+                sink.write(job)
+            except Exception as e:
+                self.logger.error(f"Sink {type(sink).__name__} failed to write job {job.url}: {str(e)}")
+                written = False
+        return written
+
+    def _replay_checkpoint(self):
+        """Job trong checkpoint của lần chạy trước; được ghi lại vào frontier để đánh dấu khi output lưu xong"""
+        for job in self.checkpoint.iter_items():
+            frontier = FrontierStore.shared()
+            frontier.record_fetch(job.url, 200, job)
+            with self.lock:
+                self._frontiers.add(frontier)
+            yield job
+
+    def _commit_frontiers(self, persisted: bool, exclude=()):
+        """
+        Đánh dấu các URL đã fetch trong frontier sau khi output đã lưu; output lỗi thì bỏ,
+        để lần chạy sau fetch lại thay vì mất job
+        """
+        with self.lock:
+            frontiers = list(self._frontiers)
+        for frontier in frontiers:
+            if persisted:
+                committed = frontier.commit_fetched(exclude)
+                self.logger.info(f"Marked {committed} URLs as fetched in frontier")
+            else:
+                dropped = frontier.discard_pending()
+                self.logger.warning(f"Output not saved, {dropped} fetched URLs stay due for the next run")
+
+    def save_results(self, filename: Optional[str] = None, compression: Optional[str] = "gzip") -> str:
+        """
+        Save collected jobs to a JSONL file (one job per line, header/footer metadata records)
+
+        Once the file is written the checkpoint is removed, unless a spider did not finish cleanly.
+
+        Args:
+            filename: Optional filename override
+            compression: 'gzip', 'zstd' or None
 
-        # Write to file
+        Returns:
+            Path to the saved file
+        """
+        filepath = os.path.join(self.output_dir, filename or _output_filename("jobs", compression))
+
+        # Write to file, one job at a time
+        writer = None
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(output, f, ensure_ascii=False, indent=2)
+            writer = JsonlWriter(filepath)
+            for job in self.jobs:
+                writer.write_job(job.to_dict())
+            writer.close(execution_time=self.end_time - self.start_time if self.end_time and self.start_time else 0.0)
 
-            self.logger.info(f"Saved {len(data)} jobs to {filepath}")
-            return filepath
+            self.logger.info(f"Saved {len(self.jobs)} jobs to {filepath}")
         except Exception as e:
             self.logger.error(f"Error saving results to {filepath}: {str(e)}")
+            if writer:
+                writer.abort()
+            self._commit_frontiers(False)
             return ""
 
+        self._commit_frontiers(True)
+        if not self.failed_spiders:
+            self.checkpoint.close(completed=True)
+        return filepath
+
     def _get_job_sources(self) -> Dict[str, int]:
         """
         Count jobs by source
@@ -197,8 +337,11 @@ class JobRunner:
         Returns:
             Dictionary with job statistics
         """
+        if self.stream_stats is not None:
+            return self._with_concurrency(self.stream_stats.get_stats())
+
         if not self.jobs:
-            return {"total_jobs": 0}
+            return self._with_concurrency({"total_jobs": 0})
 
         stats = {
             "total_jobs": len(self.jobs),
@@ -231,4 +374,21 @@ class JobRunner:
         top_tags = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)[:10]
         stats["top_tags"] = dict(top_tags)
 
+        return self._with_concurrency(stats)
+
+    @staticmethod
+    def _with_concurrency(stats: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Thêm giới hạn concurrency (AdaptiveConcurrency) và rate limit (TokenBucket) của từng host,
+        cùng số lần recycle / RSS cao nhất của các driver pool vào stats
+        """
+        metrics = AdaptiveConcurrency.all_metrics()
+        if metrics:
+            stats["concurrency"] = metrics
+        rate_limits = TokenBucket.all_metrics()
+        if rate_limits:
+            stats["rate_limits"] = rate_limits
+        driver_pools = ChromeDriverPool.all_metrics()
+        if driver_pools:
+            stats["driver_pools"] = driver_pools
         return stats
\ No newline at end of file
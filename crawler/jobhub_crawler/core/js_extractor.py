@@ -0,0 +1,62 @@
+import json
+import logging
+import threading
+from typing import Any, Dict
+
+from jobhub_crawler.utils.helpers import _get_file
+
+
+class JsExtractor:
+    """
+    Field extractor that runs inside the rendered page.
+
+    The script (``utils/js/<name>.js``) is a function expression; it is called in the page
+    with JSON-serializable arguments and returns only the fields a spider needs, so neither
+    the serialized DOM (``page_source``, often MBs) crosses the WebDriver wire nor does
+    Python reparse it. Works on a WebDriver (``execute_script``) and on a ChromeTab
+    (``Runtime.evaluate``). A script returns null when it does not recognize the page, and
+    ``run()`` returns None on that or on any script error, so callers fall back to parsing
+    ``page_source``.
+    """
+
+    _sources: Dict[str, str] = {}
+    _sources_lock = threading.Lock()
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: Script file name without extension, looked up in the js folder
+        """
+        self.name = name
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def source(self) -> str:
+        with JsExtractor._sources_lock:
+            source = JsExtractor._sources.get(self.name)
+            if source is None:
+                path = _get_file('js', f'{self.name}.js')
+                if path is None:
+                    raise FileNotFoundError(f"Extractor script {self.name}.js not found")
+                with open(path, 'r', encoding='utf-8') as f:
+                    source = JsExtractor._sources[self.name] = f.read().strip().rstrip(';')
+            return source
+
+    def run(self, page, *args) -> Any:
+        """
+        Run the extractor in a page
+
+        Args:
+            page: WebDriver or ChromeTab showing the page
+            *args: Arguments passed to the script function
+
+        Returns:
+            The script's JSON result, None if it did not recognize the page or failed
+        """
+        try:
+            if hasattr(page, 'execute_script'):
+                return page.execute_script(f"return ({self.source}).apply(null, arguments);", *args)
+            return page.evaluate(f"({self.source}).apply(null, {json.dumps(list(args))})")
+        except Exception as e:
+            self.logger.warning(f"Extractor {self.name} failed, falling back to page_source: {e}")
+            return None
@@ -0,0 +1,62 @@
+import logging
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Optional
+
+
+class ParseStage:
+    """
+    CPU-bound HTML parsing stage backed by a ProcessPoolExecutor.
+
+    Fetch threads / coroutines hand raw page bytes to ``submit()`` or ``parse()``;
+    the parser function runs in a worker process so BeautifulSoup no longer
+    competes with network I/O for the GIL. Parse concurrency is sized
+    independently from fetch concurrency.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize the parse stage
+
+        Args:
+            max_workers: Number of parser processes (default: os.cpu_count(); 0 = parse inline in the caller)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Tạo pool khi cần để spider không parse thì không tốn process
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                self.logger.info(f"Started parse stage with {self.max_workers} processes")
+            return self._executor
+
+    def submit(self, parser: Callable, page: bytes, *args) -> Future:
+        """
+        Schedule ``parser(page, *args)`` and return a Future with its result
+
+        ``parser`` must be a module-level function so it can be pickled.
+        """
+        if self.max_workers == 0:
+            future = Future()
+            try:
+                future.set_result(parser(page, *args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        return self._get_executor().submit(parser, page, *args)
+
+    def parse(self, parser: Callable, page: bytes, *args):
+        """Blocking variant of submit() for worker threads"""
+        return self.submit(parser, page, *args).result()
+
+    def close(self):
+        """Shut down the worker processes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=True)
@@ -0,0 +1,164 @@
+import os
+import json
+import glob
+import shutil
+import logging
+import tempfile
+import threading
+import itertools
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import psutil
+
+from jobhub_crawler.utils.processes import _kill_process_tree, _snapshot_tree
+
+
+def _owner_alive(owner: Dict[str, float]) -> bool:
+    """Process crawler ghi file registry còn chạy không (so create_time để bỏ qua PID bị cấp lại)"""
+    try:
+        return abs(psutil.Process(int(owner['pid'])).create_time() - owner['create_time']) < 0.01
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess, KeyError, ValueError):
+        return False
+
+
+class BrowserProcessRegistry:
+    """
+    Process trees and user-data-dirs of the browsers launched by this crawler process.
+
+    Every driver's tree (chromedriver, Chrome and the processes they have spawned) is
+    snapshotted at launch as PID + create time and written to
+    ``<directory>/<owner pid>.json``. Cleanup only ever touches those trees, never "every
+    process named chrome" on the host, so several crawler processes can share a machine:
+    each tears down its own browsers, and trees left behind by a crawler that died are
+    reaped by whoever finds its file with the owner gone (``reap_stale()``).
+    """
+
+    _shared: Optional['BrowserProcessRegistry'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Open the registry of the current process
+
+        Args:
+            directory: Where registry files live (default: $BROWSER_REGISTRY_DIR or <tmp>/jobhub_browsers)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory or os.getenv('BROWSER_REGISTRY_DIR') or os.path.join(
+            tempfile.gettempdir(), 'jobhub_browsers')
+        self.path = os.path.join(self.directory, f'{os.getpid()}.json')
+        self._owner = {'pid': os.getpid(), 'create_time': psutil.Process().create_time()}
+        self._browsers: Dict[str, Dict] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> 'BrowserProcessRegistry':
+        """Registry of this process; trees orphaned by crawlers that died are reaped on first use"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+                cls._shared.reap_stale()
+            return cls._shared
+
+    def _write(self):
+        # Gọi khi đang giữ self._lock
+        if not self._browsers:
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'owner': self._owner, 'browsers': self._browsers}, f)
+        os.replace(tmp_path, self.path)
+
+    def register(self, root_pids: Iterable[int], temp_dir: Optional[str] = None) -> str:
+        """
+        Record a freshly launched browser
+
+        Args:
+            root_pids: chromedriver / Chrome PIDs of the driver (see utils.processes._driver_root_pids)
+            temp_dir: The driver's user-data-dir, removed with the tree if the owner dies
+
+        Returns:
+            str: Key to pass to kill() / unregister()
+        """
+        snapshot = _snapshot_tree(root_pids)
+        with self._lock:
+            key = str(next(self._ids))
+            self._browsers[key] = {'processes': snapshot, 'temp_dir': temp_dir}
+            self._write()
+        return key
+
+    def unregister(self, key: Optional[str]):
+        with self._lock:
+            if self._browsers.pop(key, None) is not None:
+                self._write()
+
+    def kill(self, key: Optional[str], timeout: float = 3) -> int:
+        """
+        Tear down what is left of one browser's tree (after driver.quit() nothing should be)
+        and forget it; returns the number of processes stopped
+        """
+        with self._lock:
+            browser = self._browsers.get(key)
+        if browser is None:
+            return 0
+        killed = _kill_process_tree(browser['processes'], timeout=timeout)
+        if killed:
+            self.logger.info(f"Stopped {killed} leftover browser processes")
+        self.unregister(key)
+        return killed
+
+    def kill_all(self, timeout: float = 3) -> int:
+        """Tear down every browser this process launched (used when the script exits)"""
+        with self._lock:
+            keys = list(self._browsers)
+        return sum(self.kill(key, timeout=timeout) for key in keys)
+
+    def temp_dirs(self) -> Set[str]:
+        """User-data-dirs of the browsers this process has running"""
+        with self._lock:
+            return {b['temp_dir'] for b in self._browsers.values() if b.get('temp_dir')}
+
+    def _read_files(self):
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    yield path, json.load(f)
+            except (OSError, ValueError):
+                continue
+
+    def live_temp_dirs(self) -> Set[str]:
+        """User-data-dirs still in use by any running crawler process on this host (temp sweeps must keep them)"""
+        dirs = self.temp_dirs()
+        for path, data in self._read_files():
+            if _owner_alive(data.get('owner', {})):
+                dirs.update(b['temp_dir'] for b in data.get('browsers', {}).values() if b.get('temp_dir'))
+        return dirs
+
+    def reap_stale(self, timeout: float = 3) -> Tuple[int, int]:
+        """
+        Tear down browsers recorded by crawler processes that are no longer running
+
+        Returns:
+            tuple: (processes stopped, temp dirs removed)
+        """
+        killed = removed = 0
+        for path, data in self._read_files():
+            if path == self.path or _owner_alive(data.get('owner', {})):
+                continue
+            for browser in data.get('browsers', {}).values():
+                killed += _kill_process_tree(browser.get('processes', {}), timeout=timeout)
+                temp_dir = browser.get('temp_dir')
+                if temp_dir and os.path.isdir(temp_dir):
+                    shutil.rmtree(temp_dir, ignore_errors=True)
+                    removed += 1
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        if killed or removed:
+            self.logger.info(f"Reaped {killed} browser processes and {removed} temp dirs left by exited crawlers")
+        return killed, removed
@@ -0,0 +1,201 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+import subprocess
+from typing import Callable, Dict, Iterable, Optional
+
+from jobhub_crawler.core.driver_cache import DriverBinaryCache
+
+# Preferences ghi sẵn vào profile mẫu: bỏ các bước first-run, popup và dịch vụ nền không cần khi crawl
+TEMPLATE_PREFERENCES = {
+    'browser': {'has_seen_welcome_page': True, 'check_default_browser': False},
+    'profile': {
+        'exit_type': 'Normal',
+        'exited_cleanly': True,
+        'default_content_setting_values': {'notifications': 2, 'geolocation': 2, 'media_stream': 2},
+        'password_manager_enabled': False,
+    },
+    'credentials_enable_service': False,
+    'translate': {'enabled': False},
+    'safebrowsing': {'enabled': False},
+    'search': {'suggest_enabled': False},
+    'sync_promo': {'show_on_first_run_allowed': False},
+}
+
+# File/thư mục không được nằm trong profile mẫu: lock của process đã thoát, crash dump, session cũ
+_PRUNE = ('SingletonLock', 'SingletonCookie', 'SingletonSocket', 'lockfile', 'DevToolsActivePort',
+          'Crashpad', 'BrowserMetrics', 'ShaderCache', 'GrShaderCache', os.path.join('Default', 'Sessions'),
+          os.path.join('Default', 'Current Session'), os.path.join('Default', 'Current Tabs'))
+
+
+def _write_preferences(profile_dir: str):
+    """Gộp TEMPLATE_PREFERENCES vào Default/Preferences (Chrome giữ lại các key này khi ghi đè file)"""
+    prefs_path = os.path.join(profile_dir, 'Default', 'Preferences')
+    os.makedirs(os.path.dirname(prefs_path), exist_ok=True)
+    prefs = {}
+    if os.path.exists(prefs_path):
+        try:
+            with open(prefs_path, 'r', encoding='utf-8') as f:
+                prefs = json.load(f)
+        except ValueError:
+            prefs = {}
+
+    def merge(target: Dict, source: Dict):
+        for key, value in source.items():
+            if isinstance(value, dict) and isinstance(target.get(key), dict):
+                merge(target[key], value)
+            else:
+                target[key] = value
+
+    merge(prefs, TEMPLATE_PREFERENCES)
+    with open(prefs_path, 'w', encoding='utf-8') as f:
+        json.dump(prefs, f)
+
+
+def _clone_tree(src: str, dst: str):
+    """
+    Copy nội dung src vào dst (đã tồn tại), ưu tiên copy-on-write
+
+    Linux: cp --reflink=auto (btrfs/xfs chỉ tạo reflink, hệ khác tự copy thường);
+    macOS: cp -c (clonefile trên APFS). Không dùng hardlink: Chrome ghi đè tại chỗ
+    các file SQLite / disk cache nên hardlink sẽ làm hỏng profile mẫu.
+    """
+    command = None
+    if sys.platform.startswith('linux'):
+        command = ['cp', '-a', '--reflink=auto', os.path.join(src, '.'), dst]
+    elif sys.platform == 'darwin':
+        command = ['cp', '-cR', src + '/', dst]
+    if command:
+        try:
+            subprocess.run(command, check=True, capture_output=True)
+            return
+        except (OSError, subprocess.CalledProcessError):
+            pass
+    shutil.copytree(src, dst, dirs_exist_ok=True)
+
+
+class ProfileTemplate:
+    """
+    Chrome user-data-dir template built once and cloned for every new driver.
+
+    A fresh, empty user-data-dir makes Chrome spend its first launch creating the profile
+    (first-run state, preferences, component data) and starts with a cold disk cache. The
+    template is built by launching Chrome once on a staging directory (optionally loading
+    ``warm_urls`` to fill the disk cache), pruning lock files, and is then copied into each
+    driver's ``selenium_jobhub_*`` temp dir with copy-on-write where the filesystem allows.
+
+    Templates live outside the temp dir (so temp sweeps do not remove them), keyed by
+    flavor and Chrome version, and are rebuilt after ``max_age`` seconds.
+    """
+
+    _shared: Optional['ProfileTemplate'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, directory: Optional[str] = None, max_age: float = 7 * 24 * 3600):
+        """
+        Initialize the template store
+
+        Args:
+            directory: Where templates are kept (default: $PROFILE_TEMPLATE_DIR or ~/.cache/jobhub_crawler/profiles)
+            max_age: Seconds after which a template is rebuilt (its disk cache has gone stale)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory or os.getenv('PROFILE_TEMPLATE_DIR') or os.path.join(
+            os.path.expanduser('~'), '.cache', 'jobhub_crawler', 'profiles')
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> 'ProfileTemplate':
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def path(self, flavor: str, warm_urls: Iterable[str] = ()) -> str:
+        """Template directory for a driver flavor ('standard' / 'undetected') and set of warm URLs"""
+        name = flavor
+        warm_urls = tuple(warm_urls)
+        if warm_urls:
+            name += '-' + hashlib.sha1('\n'.join(warm_urls).encode('utf-8')).hexdigest()[:8]
+        version = DriverBinaryCache.shared().chrome_version or 'unknown'
+        return os.path.join(self.directory, version, name)
+
+    def _is_fresh(self, path: str) -> bool:
+        return os.path.isdir(path) and time.time() - os.path.getmtime(path) < self.max_age
+
+    def ensure(self, flavor: str, build: Callable[[str, Iterable[str]], None], warm_urls: Iterable[str] = ()) -> str:
+        """
+        Return the template directory, building it first if it is missing or too old
+
+        Args:
+            flavor: Driver flavor the template is for
+            build: Callback ``build(user_data_dir, warm_urls)`` that launches Chrome on the
+                directory, loads the warm URLs and quits
+            warm_urls: Pages loaded once while building, to pre-fill the disk cache
+        """
+        path = self.path(flavor, warm_urls)
+        with self._lock:
+            if self._is_fresh(path):
+                return path
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            staging = tempfile.mkdtemp(prefix=f'{os.path.basename(path)}.', dir=os.path.dirname(path))
+            try:
+                start = time.monotonic()
+                _write_preferences(staging)
+                build(staging, warm_urls)
+                for name in _PRUNE:
+                    target = os.path.join(staging, name)
+                    if os.path.isdir(target):
+                        shutil.rmtree(target, ignore_errors=True)
+                    elif os.path.lexists(target):
+                        os.unlink(target)
+                # Chrome ghi đè Preferences khi thoát: ghi lại để chắc chắn profile được coi là thoát sạch
+                _write_preferences(staging)
+
+                # Đổi tên nguyên tử; process khác có thể vừa build xong cùng template
+                old = None
+                if os.path.exists(path):
+                    old = f"{path}.old.{os.getpid()}"
+                    os.replace(path, old)
+                try:
+                    os.replace(staging, path)
+                except OSError:
+                    if not self._is_fresh(path):
+                        raise
+                    shutil.rmtree(staging, ignore_errors=True)
+                if old:
+                    shutil.rmtree(old, ignore_errors=True)
+                self.logger.info(f"Built Chrome profile template {path} in {time.monotonic() - start:.1f}s")
+            except Exception:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+        return path
+
+    def clone(self, flavor: str, build: Callable[[str, Iterable[str]], None], warm_urls: Iterable[str] = ()) -> str:
+        """
+        Create a new ``selenium_jobhub_*`` temp dir pre-populated from the template
+
+        Returns:
+            str: The new user-data-dir (removed by the driver pool when the driver is destroyed)
+        """
+        template = self.ensure(flavor, build, warm_urls)
+        temp_dir = tempfile.mkdtemp(prefix='selenium_jobhub_')
+        try:
+            _clone_tree(template, temp_dir)
+        except Exception:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+        return temp_dir
+
+    def clear(self):
+        """Remove every template (next driver rebuilds it)"""
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
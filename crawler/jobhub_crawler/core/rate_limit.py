@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from jobhub_crawler.core.concurrency import _host_of
+
+# Giới hạn mặc định theo host: (số request mỗi giây, burst)
+DEFAULT_RATE = (5.0, 10)
+HOST_RATES: Dict[str, Tuple[float, int]] = {
+    'topdev.vn': (5.0, 10),
+    'itviec.com': (1.0, 3),
+}
+
+
+def _parse_rate_env(value: Optional[str]) -> Dict[str, Tuple[float, int]]:
+    """
+    Đọc cấu hình dạng "topdev.vn=5:10,itviec.com=0.5:2" (host=rate:burst) từ biến môi trường RATE_LIMITS
+    """
+    rates = {}
+    for item in (value or '').split(','):
+        if '=' not in item:
+            continue
+        host, spec = item.split('=', 1)
+        rate, _, burst = spec.partition(':')
+        try:
+            rate = float(rate)
+            if not rate > 0:
+                # TokenBucket không chấp nhận rate <= 0: bỏ entry thay vì làm mọi request tới host lỗi
+                raise ValueError(f"rate must be positive: {rate}")
+            rates[_host_of(host.strip())] = (rate, int(burst) if burst else max(1, int(rate)))
+        except ValueError:
+            logging.getLogger(__name__).warning(f"Ignoring invalid RATE_LIMITS entry: {item}")
+    return rates
+
+
+class TokenBucket:
+    """
+    Token bucket: ``rate`` tokens per second refill up to ``burst``.
+
+    ``acquire()`` returns immediately while tokens are available and otherwise sleeps
+    exactly until the next token is due, so callers never wait longer than the rate
+    requires. Thread-safe; ``acquire_async()`` is the asyncio counterpart.
+    """
+
+    _registry: Dict[str, 'TokenBucket'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, rate: float, burst: int = 1, name: str = ''):
+        """
+        Initialize the bucket
+
+        Args:
+            rate: Tokens (requests) per second
+            burst: Maximum tokens that can accumulate while idle
+            name: Host name (used in logs and metrics)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.name = name
+        self.total_wait = 0.0
+        self.acquired = 0
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_host(cls, url_or_host: str) -> 'TokenBucket':
+        """
+        Process-wide bucket for a host, shared by every spider and thread.
+
+        Rates come from RATE_LIMITS (env), then HOST_RATES, then DEFAULT_RATE.
+        """
+        host = _host_of(url_or_host)
+        with cls._registry_lock:
+            bucket = cls._registry.get(host)
+            if bucket is None:
+                rate, burst = _parse_rate_env(os.getenv('RATE_LIMITS')).get(host) or HOST_RATES.get(host, DEFAULT_RATE)
+                bucket = cls(rate, burst, name=host)
+                cls._registry[host] = bucket
+            return bucket
+
+    @classmethod
+    def all_metrics(cls) -> Dict[str, Dict[str, float]]:
+        with cls._registry_lock:
+            buckets = list(cls._registry.values())
+        return {b.name: b.metrics() for b in buckets}
+
+    def _reserve(self, tokens: float) -> float:
+        """Trừ token (có thể âm = đặt chỗ trước) và trả về số giây phải chờ"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.acquired += 1
+            self.total_wait += wait
+            return wait
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until ``tokens`` are available; returns the time waited"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def metrics(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'rate': self.rate,
+                'burst': self.burst,
+                'acquired': self.acquired,
+                'total_wait': round(self.total_wait, 3),
+            }
+
+
+def _rate_limit(url: str) -> float:
+    """Chờ tới lượt request tới host của url (dùng trước mỗi session.get / driver.get)"""
+    return TokenBucket.for_host(url).acquire()
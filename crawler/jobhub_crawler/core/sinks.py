@@ -0,0 +1,102 @@
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from jobhub_crawler.core.job_item import JobItem
+from jobhub_crawler.utils.jsonl import JsonlWriter, _output_filename
+
+
+class JobSink:
+    """
+    Destination for JobItems streamed by JobRunner.run_streaming().
+
+    open() is called once before the first item, write() once per item as it
+    arrives, and close() once at the end with run-level info such as
+    ``execution_time``.
+    """
+
+    def open(self):
+        pass
+
+    def write(self, job: JobItem):
+        raise NotImplementedError
+
+    def close(self, run_info: Optional[Dict[str, Any]] = None):
+        pass
+
+
+class StatsSink(JobSink):
+    """Keeps running counters so stats are available without holding the jobs themselves"""
+
+    def __init__(self):
+        self.total_jobs = 0
+        self.sources: Dict[str, int] = {}
+        self.companies = set()
+        self.locations = set()
+        self.tag_counts: Dict[str, int] = {}
+        self.execution_time = None
+
+    def write(self, job: JobItem):
+        self.total_jobs += 1
+        self.sources[job.source] = self.sources.get(job.source, 0) + 1
+        if job.company:
+            self.companies.add(job.company)
+        if job.location:
+            self.locations.add(", ".join(job.location) if isinstance(job.location, list) else job.location)
+        for tag in job.tags or []:
+            self.tag_counts[tag] = self.tag_counts.get(tag, 0) + 1
+
+    def close(self, run_info: Optional[Dict[str, Any]] = None):
+        self.execution_time = (run_info or {}).get("execution_time")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Same shape as JobRunner.get_stats()"""
+        if not self.total_jobs:
+            return {"total_jobs": 0}
+
+        top_tags = sorted(self.tag_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        return {
+            "total_jobs": self.total_jobs,
+            "sources": dict(self.sources),
+            "execution_time": self.execution_time,
+            "unique_companies": len(self.companies),
+            "unique_locations": len(self.locations),
+            "top_tags": dict(top_tags),
+        }
+
+
+class JsonlFileSink(JobSink):
+    """
+    Writes one job per line (JSONL), optionally gzip- or zstd-compressed.
+
+    The file starts with a header record and ends with a footer record holding the
+    run metadata, so readers can stream it with jsonl._iter_jobs() in constant memory.
+    A run that produced no jobs leaves no file behind, so "latest output file" lookups
+    keep pointing at the last real result.
+    """
+
+    def __init__(self, output_dir: str = "output", filename: Optional[str] = None, compression: Optional[str] = "gzip"):
+        self.logger = logging.getLogger(__name__)
+        self.path = os.path.join(output_dir, filename or _output_filename("jobs", compression))
+        self.metadata: Dict[str, Any] = {}
+        self._writer: Optional[JsonlWriter] = None
+
+    def open(self):
+        self._writer = JsonlWriter(self.path)
+
+    def write(self, job: JobItem):
+        self._writer.write_job(job.to_dict())
+
+    def close(self, run_info: Optional[Dict[str, Any]] = None):
+        if self._writer is None:
+            return
+
+        writer, self._writer = self._writer, None
+        if writer.total_jobs == 0:
+            writer.abort()
+            self.path = ""
+            self.logger.info("No jobs collected, removed empty output file")
+            return
+
+        self.metadata = writer.close(execution_time=(run_info or {}).get("execution_time", 0.0))
+        self.logger.info(f"Saved {writer.total_jobs} jobs to {self.path}")
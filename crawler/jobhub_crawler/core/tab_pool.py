@@ -0,0 +1,315 @@
+import json
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from websockets.sync.client import connect
+
+from jobhub_crawler.core.driver_pool import ChromeDriverPool, DriverPoolTimeout
+
+
+class CdpError(Exception):
+    """Raised when Chrome answers a DevTools command with an error"""
+
+
+class _Browser:
+    """Một Chrome mượn từ ChromeDriverPool, phục vụ nhiều tab"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.debugger_address = driver.capabilities.get('goog:chromeOptions', {}).get('debuggerAddress')
+        if not self.debugger_address:
+            raise CdpError("Driver does not expose a DevTools debugger address")
+        self.tabs = 0
+        self.pages_served = 0
+        self.broken = False
+        # Pool muốn recycle browser (bộ nhớ / tuổi / số trang): không mở tab mới, trả driver khi hết tab
+        self.retiring = False
+        # Lệnh WebDriver trên cùng một session phải chạy tuần tự
+        self.lock = threading.Lock()
+
+
+class ChromeTab:
+    """
+    One page target of a pooled Chrome, driven over its own DevTools websocket.
+
+    Independent of the WebDriver session (which can only drive one window at a time), so
+    several tabs of the same browser can navigate concurrently from different threads.
+    A tab is used by one thread at a time (leased from ChromeTabPool).
+    """
+
+    def __init__(self, browser: _Browser, target_id: str, timeout: float = 30):
+        self.browser = browser
+        self.target_id = target_id
+        self.timeout = timeout
+        self._ws = connect(f"ws://{browser.debugger_address}/devtools/page/{target_id}",
+                           max_size=None, compression=None, open_timeout=timeout)
+        self._next_id = 0
+        self._events = set()
+
+    def _recv(self, deadline: float) -> Dict[str, Any]:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("Timed out waiting for Chrome")
+        message = json.loads(self._ws.recv(timeout=remaining))
+        if message.get('method') == 'Page.loadEventFired':
+            self._events.add(message['method'])
+        return message
+
+    def send(self, method: str, params: Optional[dict] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send one CDP command to this tab and return its result (events received meanwhile are consumed)"""
+        self._next_id += 1
+        message_id = self._next_id
+        self._ws.send(json.dumps({'id': message_id, 'method': method, 'params': params or {}}))
+        deadline = time.monotonic() + (timeout or self.timeout)
+        while True:
+            message = self._recv(deadline)
+            if message.get('id') == message_id:
+                if 'error' in message:
+                    raise CdpError(f"{method}: {message['error'].get('message')}")
+                return message.get('result', {})
+
+    def navigate(self, url: str, timeout: Optional[float] = None):
+        """Navigate and wait for the load event"""
+        deadline = time.monotonic() + (timeout or self.timeout)
+        self._events.discard('Page.loadEventFired')
+        result = self.send('Page.navigate', {'url': url}, timeout)
+        if result.get('errorText'):
+            raise CdpError(f"Navigation to {url} failed: {result['errorText']}")
+        while 'Page.loadEventFired' not in self._events:
+            self._recv(deadline)
+        self.browser.pages_served += 1
+
+    def evaluate(self, expression: str, timeout: Optional[float] = None) -> Any:
+        """Evaluate a JS expression in the page and return its value"""
+        result = self.send('Runtime.evaluate', {'expression': expression, 'returnByValue': True,
+                                                'awaitPromise': True}, timeout)
+        if 'exceptionDetails' in result:
+            raise CdpError(f"JS error: {result['exceptionDetails'].get('text')}")
+        return result.get('result', {}).get('value')
+
+    @property
+    def page_source(self) -> str:
+        return self.evaluate('document.documentElement.outerHTML')
+
+    def wait_for_xpath(self, xpath: str, timeout: float = 20, poll: float = 0.25) -> bool:
+        """Chờ tới khi có phần tử khớp XPath; False nếu hết timeout"""
+        expression = (f"document.evaluate({json.dumps(xpath)}, document, null, "
+                      f"XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue !== null")
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.evaluate(expression):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(poll)
+
+    def close(self):
+        try:
+            self._ws.close()
+        except Exception:
+            pass
+
+
+class ChromeTabPool:
+    """
+    Pool of browser tabs multiplexed over a few Chrome processes.
+
+    Browsers are leased from a ChromeDriverPool (so they get its profile, resource blocking
+    and stealth setup) and each serves up to ``tabs_per_browser`` tabs opened with
+    ``Target.createTarget``. Concurrency scales with tabs instead of Chrome processes:
+    ``max_tabs`` workers need only ``ceil(max_tabs / tabs_per_browser)`` browsers.
+
+    A browser the driver pool wants recycled (see ChromeDriverPool.should_recycle) is retired
+    between tasks: its tabs are closed as they are released and the driver is given back once
+    the last one is gone, while new tabs open in a fresh browser.
+    """
+
+    def __init__(self, driver_pool: ChromeDriverPool, tabs_per_browser: int = 8, max_tabs: int = 8,
+                 timeout: float = 30, on_browser: Optional[Callable[[Any], None]] = None):
+        """
+        Initialize the tab pool
+
+        Args:
+            driver_pool: Pool the browsers are leased from
+            tabs_per_browser: Tabs opened in one browser before another browser is leased
+            max_tabs: Maximum number of live tabs (leased + idle)
+            timeout: Default timeout (s) of tab commands and navigations
+            on_browser: Called with each newly leased driver (e.g. to inject cookies shared by its tabs)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.driver_pool = driver_pool
+        self.tabs_per_browser = max(1, tabs_per_browser)
+        self.max_tabs = max(1, max_tabs)
+        self.timeout = timeout
+        self.on_browser = on_browser
+
+        self._browsers: List[_Browser] = []
+        self._idle = deque()
+        self._total = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+
+    # ------------------------------------------------------------------ leasing
+
+    def acquire(self, timeout: Optional[float] = None) -> ChromeTab:
+        """Lease a tab, opening a new one (and leasing a browser if needed) up to max_tabs"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Tab pool has been closed")
+                if self._idle:
+                    return self._idle.popleft()
+                if self._total < self.max_tabs:
+                    self._total += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise DriverPoolTimeout(f"No tab available after {timeout}s")
+                self._cond.wait(remaining)
+
+        try:
+            return self._open_tab()
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, tab: ChromeTab, discard: bool = False):
+        """Return a leased tab; broken tabs (discard=True) are closed instead of reused"""
+        browser = tab.browser
+        if not (discard or browser.broken or browser.retiring):
+            reason = self.driver_pool.should_recycle(browser.driver, browser.pages_served)
+            if reason:
+                self.logger.info(f"Retiring browser of tab pool ({reason})")
+                self._retire(browser)
+        if discard or self._closed or browser.broken or browser.retiring:
+            self._close_tab(tab)
+            return
+        with self._cond:
+            self._idle.append(tab)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """Context manager around acquire()/release(); the tab is closed if the block raises"""
+        tab = self.acquire(timeout=timeout)
+        try:
+            yield tab
+        except Exception:
+            self.release(tab, discard=True)
+            raise
+        else:
+            self.release(tab)
+
+    def close(self):
+        """Close idle tabs and give their browsers back; leased tabs are closed on release"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for tab in idle:
+            self._close_tab(tab)
+        with self._cond:
+            unused = [browser for browser in self._browsers if browser.tabs == 0]
+        for browser in unused:
+            self._release_browser(browser)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "browsers": len(self._browsers),
+                "tabs": self._total,
+                "idle": len(self._idle),
+                "max_tabs": self.max_tabs,
+            }
+
+    # ---------------------------------------------------------------- lifecycle
+
+    def _retire(self, browser: _Browser):
+        """Stop using a browser: close its idle tabs now, leased ones when they are released"""
+        with self._cond:
+            browser.retiring = True
+            idle = [tab for tab in self._idle if tab.browser is browser]
+            for tab in idle:
+                self._idle.remove(tab)
+        for tab in idle:
+            self._close_tab(tab)
+
+    def _open_tab(self) -> ChromeTab:
+        with self._cond:
+            browser = next((b for b in self._browsers
+                            if not b.broken and not b.retiring and b.tabs < self.tabs_per_browser), None)
+            if browser:
+                browser.tabs += 1
+        if browser is None:
+            browser = self._lease_browser()
+
+        target_id = None
+        try:
+            with browser.lock:
+                target_id = browser.driver.execute_cdp_cmd('Target.createTarget', {'url': 'about:blank'})['targetId']
+            tab = ChromeTab(browser, target_id, timeout=self.timeout)
+            tab.send('Page.enable')
+            for method, params in self.driver_pool.target_setup_commands():
+                tab.send(method, params)
+            return tab
+        except Exception as e:
+            self.logger.warning(f"Failed to open a tab, retiring its browser: {e}")
+            browser.broken = True
+            if target_id:
+                self._close_target(browser, target_id)
+            self._forget_tab(browser)
+            raise
+
+    def _lease_browser(self) -> _Browser:
+        driver = self.driver_pool.acquire()
+        try:
+            browser = _Browser(driver)
+            if self.on_browser:
+                self.on_browser(driver)
+        except Exception:
+            self.driver_pool.release(driver, discard=True)
+            raise
+        browser.tabs = 1
+        with self._cond:
+            self._browsers.append(browser)
+        self.logger.info(f"Leased browser #{len(self._browsers)} for tab pool")
+        return browser
+
+    def _close_target(self, browser: _Browser, target_id: str):
+        try:
+            with browser.lock:
+                browser.driver.execute_cdp_cmd('Target.closeTarget', {'targetId': target_id})
+        except Exception as e:
+            self.logger.debug(f"Error closing tab: {e}")
+
+    def _close_tab(self, tab: ChromeTab):
+        tab.close()
+        if not tab.browser.broken:
+            self._close_target(tab.browser, tab.target_id)
+        self._forget_tab(tab.browser)
+        with self._cond:
+            self._total -= 1
+            self._cond.notify()
+
+    def _forget_tab(self, browser: _Browser):
+        """Bớt một tab của browser; browser hỏng hoặc pool đã đóng thì trả driver khi hết tab"""
+        with self._cond:
+            browser.tabs -= 1
+            done = browser.tabs == 0 and (browser.broken or browser.retiring or self._closed)
+        if done:
+            self._release_browser(browser)
+
+    def _release_browser(self, browser: _Browser):
+        with self._cond:
+            if browser not in self._browsers:
+                return
+            self._browsers.remove(browser)
+        self.driver_pool.release(browser.driver, pages_served=browser.pages_served, discard=browser.broken)
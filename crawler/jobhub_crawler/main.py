@@ -1,5 +1,6 @@
 import os
 import sys
+import argparse
 import json
 import time
 import logging
@@ -8,11 +9,13 @@ from datetime import datetime
 from dotenv import load_dotenv
 
 from jobhub_crawler.core.job_runner import JobRunner
+from jobhub_crawler.core.sinks import JsonlFileSink
 from jobhub_crawler.spiders.newtopdev import NewTopDevSpider
 from jobhub_crawler.spiders.newitviec import NewItViecSpider
 from jobhub_crawler.utils.SaveToDatabase import _SaveToData
 
-from jobhub_crawler.utils.check import _open_and_read_file, _merge_two_records
+from jobhub_crawler.utils.check import _open_and_read_file, _merge_output_files
+from jobhub_crawler.utils.jsonl import _read_metadata
 from jobhub_crawler.utils.notifier import _send_telegram_message, _send_telegram_file
 
 
@@ -23,6 +26,7 @@ logging.basicConfig(filename='crawler.log', level=logging.INFO,
 # Load environment variables
 load_dotenv()
 INTERVAL_SECONDS = int(os.getenv("INTERVAL_SECONDS", 120))  # Default to 120 seconds if not set
+OUTPUT_COMPRESSION = os.getenv("OUTPUT_COMPRESSION", "gzip")  # gzip | zstd | none
 
 
 def send_crawler_status(crawl_time, file_path, data):
@@ -41,18 +45,18 @@ def handle_merge(file_path):
     from pathlib import Path
 
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            record2 = json.load(file)
+        file_path_merge = _merge_output_files(file_path, compression=OUTPUT_COMPRESSION)
+        if not file_path_merge:
+            # Không gộp được (vd: lần chạy đầu tiên) -> giữ nguyên file vừa crawl
+            _send_telegram_message('', f"Không gộp được, giữ nguyên file {file_path}", "", "", "")
+            return
 
-        file_path_merge = _merge_two_records(record2)
         file_path = Path(file_path)
         # Kiểm tra nếu file tồn tại rồi mới xóa
         if file_path.exists():
             file_path.unlink()
             _send_telegram_message('', f"File {file_path} đã được xóa thành công!", "", "", "")
-            with open(file_path_merge, "r", encoding="utf-8") as file:
-                d = json.load(file)
-                metadata = d['metadata']
+            metadata = _read_metadata(file_path_merge)
 
             _send_telegram_message(metadata['created_at'], 'Đã gộp bản ghi ở file', metadata['total_jobs'],
                                    metadata['execution_time'], "")
@@ -65,22 +69,24 @@ def handle_merge(file_path):
         _send_telegram_message('', "Lỗi gộp bản ghi!", "", "", f"Error while merging records: {str(e)}")
 
 
-def run_crawler():
-    """Run the crawling process."""
+def run_crawler(resume=False):
+    """Run the crawling process (resume=True continues from the last checkpoint)."""
     crawl_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    runner = JobRunner()
-    runner.run_all([
+    runner = JobRunner(resume=resume)
+    # Stream job ra file ngay khi spider thu thập được, không giữ toàn bộ trong bộ nhớ
+    json_sink = JsonlFileSink(runner.output_dir, compression=OUTPUT_COMPRESSION)
+    runner.run_streaming([
         #     # VietnamworksSpider
         NewTopDevSpider,
         # NewItViecSpider
-    ])
+    ], sinks=[json_sink])
     try:
         # Notify start of the crawling process
         _send_telegram_message('', 'Đang đọc file!', '', '', '')
 
         total_jobs = runner.get_stats().get('total_jobs', 0)
         if total_jobs >= 1:
-            file_path = runner.save_results()
+            file_path = json_sink.path
             data = _open_and_read_file(file_path, "metadata", "")
 
             if data['total_jobs'] >= 1:
@@ -99,8 +105,13 @@ def run_crawler():
 
 def main():
     """Run one crawler cycle and restart process after interval."""
-    logging.info('🚀 Start crawling...')
-    run_crawler()
+    parser = argparse.ArgumentParser(description='JobHub crawler')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted run from output/checkpoint instead of starting over')
+    args = parser.parse_args()
+
+    logging.info('🚀 Start crawling...' if not args.resume else '🚀 Resume crawling from checkpoint...')
+    run_crawler(resume=args.resume)
     # logging.info("✅ Crawling finished. ⏳ Bắt đầu lưu dữ liệu và DATABASE...")
     # _SaveToData()
     # logging.info("✅ Save finished. ⏳ Đợi %d giây rồi khởi động lại...", INTERVAL_SECONDS)
@@ -0,0 +1,62 @@
+import re
+from typing import Optional, Union
+
+from lxml import html as lxml_html
+
+# Các backend parser được hỗ trợ:
+#   'html.parser'  - BeautifulSoup + parser thuần Python (chậm nhất, không cần thư viện C)
+#   'lxml'         - BeautifulSoup + tree builder lxml (cùng code traversal, nhanh hơn)
+#   'lxml-native'  - cây lxml gốc với XPath biên dịch sẵn, không tạo cây BeautifulSoup
+PARSER_BACKENDS = ('html.parser', 'lxml', 'lxml-native')
+DEFAULT_BACKEND = 'lxml'
+
+_UTF8_HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
+
+def _check_backend(backend: str) -> str:
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend '{backend}', expected one of {PARSER_BACKENDS}")
+    return backend
+
+
+def _bs4_features(backend: str) -> str:
+    """Tree builder BeautifulSoup tương ứng với backend (lxml-native dùng lxml cho các trang listing)"""
+    return 'html.parser' if _check_backend(backend) == 'html.parser' else 'lxml'
+
+
+def _html_tree(page: Union[bytes, str]):
+    """Dựng cây lxml từ HTML thô; bytes được coi là UTF-8"""
+    if isinstance(page, bytes):
+        return lxml_html.document_fromstring(page, parser=_UTF8_HTML_PARSER)
+    return lxml_html.document_fromstring(page)
+
+
+def _html_slice(page: Union[bytes, str], start_re: re.Pattern, end_re: re.Pattern) -> Optional[bytes]:
+    """
+    Đoạn HTML từ thẻ khớp start_re tới ngay trước thẻ khớp end_re, cắt bằng cách quét byte
+
+    Dùng để chỉ dựng cây lxml cho một vùng nhỏ của trang; None nếu không tìm thấy một trong hai mốc.
+    """
+    data = page.encode('utf-8') if isinstance(page, str) else page
+    start = start_re.search(data)
+    if start is None:
+        return None
+    end = end_re.search(data, start.end())
+    if end is None:
+        return None
+    return data[start.start():end.start()]
+
+
+def _has_class(name: str) -> str:
+    """Điều kiện XPath tương đương class_=name của BeautifulSoup"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _text(element) -> str:
+    """Tương đương element.text.strip() của BeautifulSoup"""
+    return element.text_content().strip()
+
+
+def _stripped_text(element) -> str:
+    """Tương đương element.get_text(strip=True) của BeautifulSoup"""
+    return ''.join(part.strip() for part in element.itertext())
@@ -0,0 +1,185 @@
+import re
+import logging
+from typing import Optional, Union
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+from jobhub_crawler.core.job_item import JobItem
+from jobhub_crawler.parsers.backends import DEFAULT_BACKEND, _bs4_features, _check_backend, _has_class, \
+    _html_slice, _html_tree, _stripped_text, _text
+from jobhub_crawler.parsers.jsonld import _json_ld_fields
+from jobhub_crawler.utils.helpers import _remove_duplicates
+
+logger = logging.getLogger(__name__)
+
+TAG_HEADINGS = ['Skills:', 'Job Domain:', 'Kỹ năng:', 'Lĩnh vực:']
+EXPERIENCE_HEADINGS = ['Job Expertise:', 'Chuyên môn:']
+
+# XPath biên dịch sẵn cho backend lxml-native
+_XP_HEADER = etree.XPath(f"//div[{_has_class('job-header-info')}]")
+_XP_TITLE = etree.XPath(".//h1")
+_XP_COMPANY = etree.XPath(f".//div[{_has_class('employer-name')}]")
+_XP_SALARY = etree.XPath(".//a")
+_XP_JOB_MID = etree.XPath(f"ancestor::div[{_has_class('job-show-header')}][1]/following-sibling::*[1]")
+_XP_SPANS = etree.XPath(".//span")
+_XP_DIVS = etree.XPath(".//div")
+_XP_NEXT_DIV = etree.XPath("following-sibling::div[1]")
+_XP_LINKS = etree.XPath(".//a")
+_XP_DESCRIPTION = etree.XPath(f"//section[{_has_class('job-content')}]")
+
+# Mốc byte của vùng header (job-show-header + khối overview ngay sau nó), dừng trước phần mô tả
+_HEADER_START_RE = re.compile(rb'<div[^>]*\sclass=["\'][^"\']*\bjob-show-header\b')
+_HEADER_END_RE = re.compile(rb'<section[^>]*\sclass=["\'][^"\']*\bjob-content\b')
+
+
+def _extract_fields_bs4(page: Union[bytes, str], features: str) -> dict:
+    soup = BeautifulSoup(page, features)
+
+    # --- Parse thông tin cơ bản ---
+    job_header = soup.find('div', class_='job-header-info')
+    job_title = job_header.find('h1').text.strip()
+    company_name = job_header.find('div', class_='employer-name').text.strip()
+    salary = job_header.find('a').text.strip()
+
+    job_mid = job_header.find_parent('div', class_='job-show-header').find_next_sibling()
+    location_spans = job_mid.find_all('span')
+    locations_text = [span.text.strip() for span in location_spans if span.text.strip()]
+    posted_at = locations_text[-1] if locations_text else ''
+    location = locations_text[:-1] if len(locations_text) > 1 else []
+
+    # --- Parse kỹ năng và kinh nghiệm ---
+    tags, experience = [], []
+
+    overview_divs = job_mid.find_all('div')
+    for div in overview_divs:
+        text = div.get_text(strip=True)
+        if text in TAG_HEADINGS:
+            next_div = div.find_next_sibling("div")
+            if next_div:
+                tag_elements = next_div.find_all('a')
+                if tag_elements:
+                    tags.extend(tag.text.strip() for tag in tag_elements)
+                else:
+                    tags.extend(
+                        span.get_text(strip=True)
+                        for span in next_div.find_all('div')
+                    )
+
+        if text in EXPERIENCE_HEADINGS:
+            next_div = div.find_next_sibling("div")
+            if next_div:
+                experience_elems = next_div.find_all('a')
+                experience.extend(exp.text.strip() for exp in experience_elems)
+
+    description_section = soup.find('section', class_='job-content')
+    description = description_section.text.strip() if description_section else ''
+
+    return dict(title=job_title, company=company_name, location=location, salary=salary, posted_at=posted_at,
+                experience=experience, tags=tags, description=description)
+
+
+def _header_fields_lxml(tree) -> dict:
+    """Các field nằm ở header và khối overview ngay sau nó (mọi thứ trừ mô tả)"""
+    job_header = _XP_HEADER(tree)[0]
+    job_title = _text(_XP_TITLE(job_header)[0])
+    company_name = _text(_XP_COMPANY(job_header)[0])
+    salary = _text(_XP_SALARY(job_header)[0])
+
+    job_mid = _XP_JOB_MID(job_header)[0]
+    locations_text = [_text(span) for span in _XP_SPANS(job_mid) if _text(span)]
+    posted_at = locations_text[-1] if locations_text else ''
+    location = locations_text[:-1] if len(locations_text) > 1 else []
+
+    tags, experience = [], []
+    for div in _XP_DIVS(job_mid):
+        text = _stripped_text(div)
+        if text not in TAG_HEADINGS and text not in EXPERIENCE_HEADINGS:
+            continue
+        next_div = _XP_NEXT_DIV(div)
+        if not next_div:
+            continue
+        links = _XP_LINKS(next_div[0])
+        if text in TAG_HEADINGS:
+            if links:
+                tags.extend(_text(tag) for tag in links)
+            else:
+                tags.extend(_stripped_text(span) for span in _XP_DIVS(next_div[0]))
+        else:
+            experience.extend(_text(exp) for exp in links)
+
+    return dict(title=job_title, company=company_name, location=location, salary=salary, posted_at=posted_at,
+                experience=experience, tags=tags)
+
+
+def _extract_fields_lxml(page: Union[bytes, str]) -> dict:
+    tree = _html_tree(page)
+    fields = _header_fields_lxml(tree)
+
+    description_section = _XP_DESCRIPTION(tree)
+    description = _text(description_section[0]) if description_section else ''
+
+    return dict(fields, description=description)
+
+
+def _header_fields(page: Union[bytes, str]) -> Optional[dict]:
+    """
+    Field header (định dạng như parser DOM) chỉ từ đoạn HTML header, không dựng cây cả trang
+
+    Returns:
+        dict field trừ description, hoặc None nếu không tìm thấy / không đọc được vùng header
+    """
+    fragment = _html_slice(page, _HEADER_START_RE, _HEADER_END_RE)
+    if fragment is None:
+        return None
+    try:
+        return _header_fields_lxml(_html_tree(fragment))
+    except Exception as e:
+        logger.debug(f"Could not read ItViec header: {e}")
+        return None
+
+
+def _empty_header_fields() -> dict:
+    return dict(location=[], salary='', posted_at='', experience=[], tags=[])
+
+
+def _job_from_fields(fields: dict, url_obj: dict, source: str) -> JobItem:
+    """JobItem từ dict field, do parser HTML hoặc extractor chạy trong trang (utils/js/itviec_detail.js) trả về"""
+    fields['tags'] = _remove_duplicates(fields['tags'])
+    fields['experience'] = _remove_duplicates(fields['experience'])
+    return JobItem(url=url_obj['url'], source=source, level='', **fields)  # Chưa phân tích được level
+
+
+def _parse_job_detail(page: Union[bytes, str], url_obj: dict, source: str,
+                      backend: str = DEFAULT_BACKEND, json_ld: bool = True) -> Optional[JobItem]:
+    """
+    Parse trang chi tiết việc làm ItViec thành JobItem.
+
+    Hàm ở cấp module (không phụ thuộc spider) để có thể chạy trong ProcessPoolExecutor.
+    Block JSON-LD JobPosting (nếu trang có tiêu đề, công ty, mô tả) được đọc trước bằng cách quét
+    byte; khi đó các field còn lại chỉ lấy từ đoạn HTML header (để trống nếu không có), không dựng
+    cây DOM cả trang. Không có JSON-LD thì parse DOM theo backend.
+
+    Args:
+        page: Nội dung HTML thô (bytes hoặc str)
+        url_obj: Dict {'title', 'url'} của job
+        source: URL nguồn của spider
+        backend: Một trong PARSER_BACKENDS
+        json_ld: Thử đọc JSON-LD trước parser DOM
+
+    Returns:
+        JobItem hoặc None nếu không nhận diện được bố cục trang
+    """
+    _check_backend(backend)
+    try:
+        fields = _json_ld_fields(page) if json_ld else None
+        if fields:
+            fields.update(_header_fields(page) or _empty_header_fields())
+        elif backend == 'lxml-native':
+            fields = _extract_fields_lxml(page)
+        else:
+            fields = _extract_fields_bs4(page, _bs4_features(backend))
+        return _job_from_fields(fields, url_obj, source)
+    except Exception as e:
+        logger.error(f"❌ Error while parsing {url_obj['url']} - {str(e)}")
+        return None
@@ -0,0 +1,112 @@
+import re
+import json
+import html
+from typing import Any, Iterator, Optional, Union
+
+from jobhub_crawler.parsers.backends import _html_tree, _text
+
+# Block JSON-LD nằm trong <script type="application/ld+json">...</script>
+_LD_MARKER = b'application/ld+json'
+_SCRIPT_END_RE = re.compile(rb'</script', re.IGNORECASE)
+
+
+def _json_ld_blocks(page: Union[bytes, str]) -> Iterator[Any]:
+    """
+    Giải mã lần lượt các block JSON-LD của trang bằng cách quét byte, không dựng cây DOM
+
+    Chỉ tìm marker 'application/ld+json', lùi về '<script' chứa nó và cắt tới '</script'.
+    Block không phải JSON hợp lệ được bỏ qua.
+    """
+    data = page.encode('utf-8') if isinstance(page, str) else page
+    pos = 0
+    while True:
+        marker = data.find(_LD_MARKER, pos)
+        if marker < 0:
+            return
+        pos = marker + len(_LD_MARKER)
+        # Marker phải là thuộc tính của thẻ <script đang mở (không phải chuỗi nằm trong một script khác)
+        tag_start = data.rfind(b'<', 0, marker)
+        if data[tag_start:tag_start + 7].lower() != b'<script' or data.find(b'>', tag_start, marker) >= 0:
+            continue
+        start = data.find(b'>', marker) + 1
+        end = _SCRIPT_END_RE.search(data, start) if start else None
+        if end is None:
+            return
+        pos = end.start()
+        body = data[start:pos].strip()
+        if body.startswith(b'<!--'):
+            body = body[4:].rstrip(b'->').strip()
+        try:
+            # strict=False: một số trang để nguyên xuống dòng trong chuỗi (description)
+            yield json.loads(body, strict=False)
+        except ValueError:
+            continue
+
+
+def _has_type(node: dict, type_name: str) -> bool:
+    node_type = node.get('@type')
+    return node_type == type_name or (isinstance(node_type, list) and type_name in node_type)
+
+
+def _find_job_posting(page: Union[bytes, str]) -> Optional[dict]:
+    """Node schema.org JobPosting đầu tiên trong các block JSON-LD của trang (kể cả trong list / @graph)"""
+    for block in _json_ld_blocks(page):
+        stack = [block]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(reversed(node))
+            elif isinstance(node, dict):
+                if _has_type(node, 'JobPosting'):
+                    return node
+                if '@graph' in node:
+                    stack.append(node['@graph'])
+    return None
+
+
+def _name(value: Any) -> str:
+    """Tên của một Thing (dict có 'name') hoặc chính chuỗi đó"""
+    if isinstance(value, dict):
+        value = value.get('name')
+    return str(value).strip() if value else ''
+
+
+def _html_text(value: Any) -> str:
+    """
+    Description của JSON-LD (HTML, thường đã escape thêm một lần) thành text giống parser DOM (_text)
+    """
+    if not value:
+        return ''
+    markup = str(value)
+    if '<' not in markup:
+        markup = html.unescape(markup)
+    if not markup.strip():
+        return ''
+    return _text(_html_tree(markup))
+
+
+def _fields_from_job_posting(posting: dict) -> Optional[dict]:
+    """
+    Field JobItem từ một node JobPosting
+
+    Chỉ lấy các field JobPosting khai báo cùng nghĩa với parser DOM (tiêu đề, công ty, mô tả);
+    datePosted / validThrough giữ nguyên dạng ISO trong field riêng.
+
+    Returns:
+        dict (title, company, description, date_posted, valid_through) hoặc None khi thiếu
+        tiêu đề / công ty / mô tả, để caller quay lại parser DOM
+    """
+    title = _name(posting.get('title'))
+    company = _name(posting.get('hiringOrganization'))
+    description = _html_text(posting.get('description'))
+    if not title or not company or not description:
+        return None
+    return dict(title=html.unescape(title), company=html.unescape(company), description=description,
+                date_posted=_name(posting.get('datePosted')) or None,
+                valid_through=_name(posting.get('validThrough')) or None)
+
+
+def _json_ld_fields(page: Union[bytes, str]) -> Optional[dict]:
+    """Field JobItem lấy từ block JSON-LD JobPosting của trang, None nếu trang không có (hoặc thiếu field chính)"""
+    posting = _find_job_posting(page)
+    return _fields_from_job_posting(posting) if posting else None
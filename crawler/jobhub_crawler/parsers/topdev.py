@@ -0,0 +1,253 @@
+import re
+import logging
+from typing import Any, List, Optional, Union
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+from jobhub_crawler.core.job_item import JobItem
+from jobhub_crawler.parsers.backends import DEFAULT_BACKEND, _bs4_features, _check_backend, _has_class, \
+    _html_slice, _html_tree, _text
+from jobhub_crawler.parsers.jsonld import _json_ld_fields
+from jobhub_crawler.utils.urls import _canonical_url, _job_id
+
+logger = logging.getLogger(__name__)
+
+# XPath biên dịch sẵn cho backend lxml-native
+_XP_CARD_JOB = etree.XPath(
+    "//section[@id='detailJobPage']//div[re:test(@id, '^card-job-\\d+$')]",
+    namespaces={'re': 'http://exslt.org/regular-expressions'})
+_XP_HEADER = etree.XPath(".//section[@id='detailJobHeader']")
+_XP_TITLE = etree.XPath(".//h1")
+_XP_COMPANY = etree.XPath(".//p")
+_XP_LOCATION = etree.XPath(".//div[@data-testid='flowbite-tooltip']")
+_XP_MIDDLE = etree.XPath("following-sibling::section[1]")
+_XP_POSTED = etree.XPath(".//text()[contains(., 'Posted')]")
+_XP_SALARY = etree.XPath(".//button[.='Sign In to view salary']")
+_XP_EXPERIENCE = etree.XPath(".//h3[.='Year of experience']/following::a[1]")
+_XP_LEVEL = etree.XPath(".//h3[.='Job Level']/following::a[1]")
+_XP_SKILLS = etree.XPath(f".//a//span[{_has_class('text-xs')} or {_has_class('md:text-sm')}]")
+_XP_DESCRIPTION_SECTION = etree.XPath(".//section[@id='cardContentDetailJob']")
+_XP_DESCRIPTION = etree.XPath(".//div[@id='JobDescription']")
+
+_XP_HEADER_SECTION = etree.XPath("//section[@id='detailJobHeader']")
+
+# Mốc byte của vùng header (detailJobHeader + section kế tiếp), dừng trước phần mô tả
+_HEADER_START_RE = re.compile(rb'<section[^>]*\sid=["\']detailJobHeader["\']')
+_HEADER_END_RE = re.compile(rb'<section[^>]*\sid=["\']cardContentDetailJob["\']')
+
+
+def _extract_fields_bs4(page: Union[bytes, str], features: str) -> dict:
+    salary = posted_at = experience = level = ''
+    soup = BeautifulSoup(page, features)
+
+    card_job = soup.find('section', id='detailJobPage').find('div', id=re.compile(r'^card-job-\d+$'))
+
+    # lấy dữ liệu từ header
+    card_job_header = card_job.find('section', id='detailJobHeader')
+    job_title = card_job_header.find('h1').text.strip()
+    company_name = card_job_header.find('p').text.strip()
+    location = [card_job_header.find("div", {"data-testid": "flowbite-tooltip"}).text.strip()]
+
+    card_job_middle = card_job_header.find_next_sibling('section')
+    time_text = card_job_middle.find(string=lambda t: "Posted" in t).parent.get_text()
+    if time_text:
+        posted_at = time_text.strip()
+    salary_e = card_job_middle.find("button", string="Sign In to view salary")
+    if salary_e:
+        salary = salary_e.text.strip()
+    exp_section = card_job_middle.find("h3", string="Year of experience")
+    if exp_section:
+        experience = exp_section.find_next("a").text.strip()
+    level_section = card_job_middle.find("h3", string="Job Level")
+    if level_section:
+        level = level_section.find_next("a").text.strip()
+
+    skills = card_job_middle.select("a span.text-xs, a span.md\\:text-sm")
+    tags = [skill.text.strip() for skill in skills if skill.text.strip()]
+
+    # BUG: xuất hiện trường hợp không lấy được description: tìm dữ liệu mẫu không lấy được -> thực hiện trích xuất lại dữ liệu
+    job_Description = card_job.find('section', id='cardContentDetailJob')
+    if job_Description:
+        description = job_Description.find('div', id='JobDescription').text.strip()
+    else:
+        description = ''
+
+    return dict(title=job_title, company=company_name, location=location, salary=salary, posted_at=posted_at,
+                experience=experience, level=level, tags=tags, description=description)
+
+
+def _header_fields_lxml(card_job_header) -> dict:
+    """Các field nằm ở header và section ngay sau nó (mọi thứ trừ mô tả)"""
+    salary = posted_at = experience = level = ''
+    job_title = _text(_XP_TITLE(card_job_header)[0])
+    company_name = _text(_XP_COMPANY(card_job_header)[0])
+    location = [_text(_XP_LOCATION(card_job_header)[0])]
+
+    card_job_middle = _XP_MIDDLE(card_job_header)[0]
+    time_node = _XP_POSTED(card_job_middle)[0]
+    # Text node là tail thì phần tử cha thật sự là cha của getparent()
+    time_parent = time_node.getparent().getparent() if time_node.is_tail else time_node.getparent()
+    time_text = time_parent.text_content()
+    if time_text:
+        posted_at = time_text.strip()
+    salary_e = _XP_SALARY(card_job_middle)
+    if salary_e:
+        salary = _text(salary_e[0])
+    exp_link = _XP_EXPERIENCE(card_job_middle)
+    if exp_link:
+        experience = _text(exp_link[0])
+    level_link = _XP_LEVEL(card_job_middle)
+    if level_link:
+        level = _text(level_link[0])
+
+    tags = [_text(skill) for skill in _XP_SKILLS(card_job_middle) if _text(skill)]
+
+    return dict(title=job_title, company=company_name, location=location, salary=salary, posted_at=posted_at,
+                experience=experience, level=level, tags=tags)
+
+
+def _extract_fields_lxml(page: Union[bytes, str]) -> dict:
+    description = ''
+    tree = _html_tree(page)
+
+    card_job = _XP_CARD_JOB(tree)[0]
+    fields = _header_fields_lxml(_XP_HEADER(card_job)[0])
+
+    job_Description = _XP_DESCRIPTION_SECTION(card_job)
+    if job_Description:
+        description = _text(_XP_DESCRIPTION(job_Description[0])[0])
+
+    return dict(fields, description=description)
+
+
+def _header_fields(page: Union[bytes, str]) -> Optional[dict]:
+    """
+    Field header (định dạng như parser DOM) chỉ từ đoạn HTML header, không dựng cây cả trang
+
+    Returns:
+        dict field trừ description, hoặc None nếu không tìm thấy / không đọc được vùng header
+    """
+    fragment = _html_slice(page, _HEADER_START_RE, _HEADER_END_RE)
+    if fragment is None:
+        return None
+    try:
+        return _header_fields_lxml(_XP_HEADER_SECTION(_html_tree(fragment))[0])
+    except Exception as e:
+        logger.debug(f"Không đọc được header TopDev: {e}")
+        return None
+
+
+def _empty_header_fields() -> dict:
+    return dict(location=[], salary='', posted_at='', experience='', level='', tags=[])
+
+
+def _parse_job_detail(page: Union[bytes, str], url_obj: dict, source: str,
+                      backend: str = DEFAULT_BACKEND, json_ld: bool = True) -> Optional[JobItem]:
+    """
+    Parse trang chi tiết việc làm TopDev thành JobItem.
+
+    Hàm ở cấp module (không phụ thuộc spider) để có thể chạy trong ProcessPoolExecutor.
+    Block JSON-LD JobPosting (nếu trang có tiêu đề, công ty, mô tả) được đọc trước bằng cách quét
+    byte; khi đó các field còn lại chỉ lấy từ đoạn HTML header (để trống nếu không có), không dựng
+    cây DOM cả trang. Không có JSON-LD thì parse DOM theo backend.
+
+    Args:
+        page: Nội dung HTML thô (bytes hoặc str)
+        url_obj: Dict {'title', 'url'} của job
+        source: URL nguồn của spider
+        backend: Một trong PARSER_BACKENDS
+        json_ld: Thử đọc JSON-LD trước parser DOM
+
+    Returns:
+        JobItem hoặc None nếu không nhận diện được bố cục trang
+    """
+    _check_backend(backend)
+    try:
+        fields = _json_ld_fields(page) if json_ld else None
+        if fields:
+            fields.update(_header_fields(page) or _empty_header_fields())
+        elif backend == 'lxml-native':
+            fields = _extract_fields_lxml(page)
+        else:
+            fields = _extract_fields_bs4(page, _bs4_features(backend))
+
+        return JobItem(url=url_obj['url'], source=source, **fields)
+    except Exception as e:
+        logger.error(f"Lỗi khi parse {url_obj['url']}: {str(e)}")
+        return None
+
+
+TOPDEV_DETAIL_BASE = 'https://topdev.vn/detail-jobs/'
+
+
+def _is_job_url(url: str) -> bool:
+    """URL (đã chuẩn hoá) có phải trang chi tiết job TopDev không: /detail-jobs/<slug>-<id> trên topdev.vn"""
+    return url.startswith(TOPDEV_DETAIL_BASE) and _job_id(url) is not None
+
+
+def _job_url_from_api_item(item: dict) -> str:
+    """
+    URL trang chi tiết của một job trong JSON API: ưu tiên field URL có sẵn, không có thì ghép slug-id
+
+    Chỉ nhận URL trang chi tiết job của topdev.vn (banner, link công ty, host ngoài bị bỏ qua).
+    """
+    for key in ('detail_url', 'detail_link', 'url', 'link'):
+        value = item.get(key)
+        if isinstance(value, str) and '/' in value:
+            url = _canonical_url(value if value.startswith('http') else 'https://topdev.vn' + value)
+            if _is_job_url(url):
+                return url
+
+    slug, job_id = item.get('slug'), item.get('id')
+    if isinstance(slug, str) and slug and job_id:
+        slug = slug if slug.endswith(f'-{job_id}') else f'{slug}-{job_id}'
+        url = _canonical_url(TOPDEV_DETAIL_BASE + slug)
+        if _is_job_url(url):
+            return url
+    return ''
+
+
+def _job_urls_from_api(payload: Any) -> List[dict]:
+    """
+    Trích danh sách {'title', 'url'} từ response JSON của API listing TopDev.
+
+    Không phụ thuộc vào cấu trúc cụ thể của response: duyệt toàn bộ JSON và nhận các object
+    có 'title' cùng URL trang chi tiết job topdev.vn (hoặc slug + id), nên vẫn chạy khi API thêm/bớt lớp bọc.
+    """
+    urls = []
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            title = node.get('title')
+            url = _job_url_from_api_item(node) if isinstance(title, str) else ''
+            if url:
+                urls.append({'title': title.strip(), 'url': url})
+            else:
+                stack.extend(reversed(list(node.values())))
+    return urls
+
+
+def _api_last_page(payload: Any) -> Optional[int]:
+    """
+    Số trang cuối từ phần phân trang của response API listing, None nếu response không có thông tin này.
+
+    Hỗ trợ dạng {'meta': {'last_page'}} / {'meta': {'total', 'per_page'}} và biến thể 'pagination'.
+    """
+    if not isinstance(payload, dict):
+        return None
+    for meta in (payload.get('meta'), payload.get('pagination'), payload):
+        if not isinstance(meta, dict):
+            continue
+        if isinstance(meta.get('pagination'), dict):
+            meta = meta['pagination']
+        for key in ('last_page', 'total_pages', 'page_count'):
+            if isinstance(meta.get(key), int):
+                return meta[key]
+        total, per_page = meta.get('total'), meta.get('per_page')
+        if isinstance(total, int) and isinstance(per_page, int) and per_page > 0:
+            return -(-total // per_page)
+    return None
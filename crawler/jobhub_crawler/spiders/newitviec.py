@@ -1,44 +1,58 @@
 import time
 import requests
 import threading
-import undetected_chromedriver as uc
 
-from threading import Lock
 from bs4 import BeautifulSoup
 from fake_useragent import UserAgent
+from requests.adapters import HTTPAdapter
+from selenium.common import TimeoutException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.wait import WebDriverWait
+from urllib3.util.request import ACCEPT_ENCODING
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from jobhub_crawler.core.job_item import JobItem
 from jobhub_crawler.core.base_crawler import BaseCrawler
+from jobhub_crawler.core.clearance import ClearanceStore
+from jobhub_crawler.core.concurrency import AdaptiveConcurrency
+from jobhub_crawler.core.driver_pool import ChromeDriverPool, DEFAULT_BLOCKED_RESOURCES
+from jobhub_crawler.core.js_extractor import JsExtractor
+from jobhub_crawler.core.parse_stage import ParseStage
+from jobhub_crawler.core.tab_pool import ChromeTabPool
+from jobhub_crawler.core.rate_limit import _rate_limit
+from jobhub_crawler.parsers.backends import _bs4_features, _check_backend
+from jobhub_crawler.parsers.itviec import EXPERIENCE_HEADINGS, TAG_HEADINGS, _job_from_fields, \
+    _parse_job_detail as _parse_itviec_detail
+from jobhub_crawler.utils.cloudflare import _is_challenge_html, _is_cloudflare_challenge
 from jobhub_crawler.utils.notifier import _send_telegram_message
-from jobhub_crawler.utils.check import _get_data_in_file, _find_diff_dict
-from jobhub_crawler.utils.helpers import _get_total_page, _chunk_pages, _wait_for_element_with_driver, \
-    _remove_duplicates
-
-
-class ChromeDriverPool:
-    def __init__(self, headless=True):
-        self.lock = Lock()
-        self.headless = headless
-
-    def get_driver(self):
-        with self.lock:
-            options = uc.ChromeOptions()
-            if self.headless:
-                options.add_argument('--headless=new')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            options.add_argument("--disable-gpu")
-            options.add_argument("--disable-software-rasterizer")
-            options.add_argument("--disable-dev-shm-usage")
-            # options.add_argument("--single-process")
-            return uc.Chrome(options=options, use_subprocess=False)
+from jobhub_crawler.utils.helpers import _get_total_page, _chunk_pages, _wait_for_element_with_driver
+from jobhub_crawler.utils.urls import _canonical_url, _job_key
 
 
 class NewItViecSpider(BaseCrawler):
     '''Trình thu thập (Spider) danh sách việc làm từ ItViec.com '''
 
-    def __init__(self, headless=False, max_workers=2, use_undetected=True):
+    # Backend parser mặc định cho ItViec (xem jobhub_crawler.parsers.backends.PARSER_BACKENDS)
+    parser_backend = 'lxml'
+    # Tài nguyên trình duyệt không tải, xem driver_pool.BLOCKABLE_RESOURCES. Giữ CSS/font: cùng pool này
+    # vượt challenge Cloudflare (_refresh_clearance) và chờ title_xpath hiển thị ở chế độ browser
+    blocked_resources = DEFAULT_BLOCKED_RESOURCES
+    # Trang nạp sẵn vào profile mẫu để các driver mới khởi động với cache JS/HTML đã có
+    profile_warm_urls = ('https://itviec.com/it-jobs',)
+    # Cách tải trang chi tiết:
+    #   'http'    = vượt Cloudflare một lần bằng trình duyệt rồi tải qua requests với cookie + UA của trình duyệt
+    #   'browser' = mỗi job mở trang bằng một driver trong pool
+    detail_mode = 'http'
+    # Phần tử xuất hiện khi trang listing đã render xong danh sách job
+    listing_xpath = "//div[contains(@class, 'job-card') or contains(@class, 'job_content')]"
+    # Extractor chạy ngay trong trang đã render, trả về JSON gọn thay cho page_source (utils/js/);
+    # None = lấy page_source rồi parse bằng Python
+    listing_extractor = JsExtractor('itviec_listing')
+    detail_extractor = JsExtractor('itviec_detail')
+    # Số lần liên tiếp vẫn bị challenge ngay sau khi vừa lấy clearance thì bỏ HTTP, chuyển hẳn sang trình duyệt
+    max_http_blocks = 3
+
+    def __init__(self, headless=False, max_workers=2, use_undetected=True, max_pages_per_driver=50,
+                 parse_workers=None, parser_backend=None, max_concurrency=None, detail_mode=None,
+                 request_timeout=30, tabs_per_browser=None):
         """
         Khởi tạo spider ItViec với khả năng vượt qua bảo mật Cloudflare
 
@@ -46,29 +60,47 @@ class NewItViecSpider(BaseCrawler):
             headless (bool): Chạy ở chế độ không hiển thị trình duyệt nếu là True
             max_workers (int): Số lượng luồng xử lý song song tối đa
             use_undetected (bool): Sử dụng undetected_chromedriver để vượt qua Cloudflare
+            max_pages_per_driver (int): Số trang tối đa mỗi driver phục vụ trước khi được tái tạo
+            parse_workers (int): Số process parse HTML (mặc định: số CPU, 0 = parse ngay trong luồng)
+            parser_backend (str): Ghi đè backend parser mặc định của spider
+            max_concurrency (int): Số trang chi tiết tải đồng thời tối đa khi bộ điều khiển AIMD tăng dần
+                (mặc định: bằng max_workers, tức chỉ giảm khi bị chặn rồi hồi phục lại)
+            detail_mode (str): Ghi đè cách tải trang chi tiết ('http' hoặc 'browser')
+            request_timeout (int): Timeout (giây) mỗi request HTTP khi detail_mode='http'
+            tabs_per_browser (int): Nếu đặt, các trang tải bằng trình duyệt chạy trên các tab của
+                ít process Chrome (ChromeTabPool) thay vì mỗi worker một Chrome
 
         """
+        detail_mode = detail_mode or self.detail_mode
+        if detail_mode not in ('http', 'browser'):
+            raise ValueError(f"Unknown detail mode '{detail_mode}', expected 'http' or 'browser'")
+        self.detail_mode = detail_mode
+        self.request_timeout = request_timeout
+        max_concurrency = max(max_concurrency or max_workers, max_workers)
+        browsers = max_concurrency
+        if tabs_per_browser:
+            # Đủ browser cho max_concurrency tab, thêm một cho trang listing / làm mới clearance
+            browsers = -(-max_concurrency // tabs_per_browser) + 1
+        # Pool driver dùng chung cho trang listing, _crawl_range và _fetch_job_description
+        self.driver_pool = ChromeDriverPool(headless=headless, use_undetected=True, max_size=browsers,
+                                            max_pages_per_driver=max_pages_per_driver,
+                                            blocked_resources=self.blocked_resources,
+                                            profile_warm_urls=self.profile_warm_urls)
+
         # Luôn gọi hàm khởi tạo của lớp cha trước
         ua = UserAgent()
         super().__init__(headless=headless,
                          user_agent=ua,
-                         use_undetected=True
+                         use_undetected=True,
+                         driver_pool=self.driver_pool
                          )
         self.headless = headless
         self.use_undetected = use_undetected
         self.max_workers = max_workers
-
-        # Nếu sử dụng undetected_chromedriver, hãy thay thế trình điều khiển (driver) thông thường.
-        if use_undetected:
-            # Đóng trình điều khiển mặc định nếu nó đang tồn tại.
-            if hasattr(self, 'driver') and self.driver:
-                try:
-                    self.driver.quit()
-                except Exception as e:
-                    self.logger.warning(f"Error closing default driver: {str(e)}")
-
-            # Khởi tạo trình điều khiển ẩn danh (undetected driver).
-            BaseCrawler._init_undetected_driver(self)
+        self.max_concurrency = max_concurrency
+        # Số trang chi tiết tải đồng thời tự điều chỉnh theo latency và timeout (AIMD)
+        self.concurrency = AdaptiveConcurrency.for_host('itviec.com', initial=max_workers,
+                                                        max_limit=max_concurrency)
 
         self.jobs = []
         self.urls = []
@@ -92,72 +124,61 @@ class NewItViecSpider(BaseCrawler):
             "TE": "trailers"
         }
 
-        self.driver_pool = ChromeDriverPool(headless=self.headless)  # ✅ THÊM DÒNG NÀY
         self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Clearance Cloudflare hiện tại của session: tăng mỗi lần chép cookie mới từ trình duyệt
+        self._clearance_lock = threading.Lock()
+        self._clearance_version = 0
+        # Bộ đếm lần bị chặn có lock riêng: request thành công không phải chờ một lần làm mới clearance
+        self._http_blocks_lock = threading.Lock()
+        self._http_blocks = 0
+        # Clearance lưu từ lần chạy trước: còn hạn thì trang chi tiết tải qua HTTP ngay, không cần mở trình duyệt
+        self.clearance_store = ClearanceStore.shared()
+        saved = self.clearance_store.get(self.base_url)
+        if saved:
+            with self._clearance_lock:
+                self._set_session_clearance(saved['cookies'], saved['user_agent'])
+            self.logger.info("Reusing saved Cloudflare clearance for ItViec")
+        self.parse_stage = ParseStage(max_workers=parse_workers)
+        self.parser_backend = _check_backend(parser_backend or self.parser_backend)
+        # Chế độ nhiều tab: cookie clearance dùng chung cho mọi tab của một browser
+        self.tab_pool = None
+        if tabs_per_browser:
+            self.tab_pool = ChromeTabPool(
+                self.driver_pool, tabs_per_browser=tabs_per_browser, max_tabs=max_concurrency,
+                on_browser=lambda driver: self.clearance_store.apply_to_driver(driver, self.base_url))
 
     def run(self):
         '''Thực thi trình thu thập để lấy danh sách việc làm từ ItViec, đa luồng vượt Cloudflare.'''
         self.logger.info(f'🚀 Starting ItViec crawler with {self.max_workers} threads...')
         _send_telegram_message('', f'Starting ItViec crawler with {self.max_workers} threads!', '', '', '')
 
-        self.get(self.base_url)
-
-        if 'itviec' not in self.driver.current_url:
-            self.logger.error(f'❌ Lỗi khi truy cập trang web {self.driver.current_url}')
-            return []
-
-        # Lấy cookies từ Selenium -> để chia sẻ cho các requests sau này (nếu cần)
-        selenium_cookies = self.driver.get_cookies()
-        for cookie in selenium_cookies:
-            self.session.cookies.set(cookie['name'], cookie['value'])
-
-        # total_pages = _get_total_page(self, '//div[@class="page" or contains(@class, "pagination")][last()]')
-        total_pages = 5
+        try:
+            new_urls = self._resume_pending()
+            if new_urls is not None:
+                # Resume: bỏ qua bước listing, fetch tiếp các URL còn lại trong checkpoint
+                self.quit()
+                self.logger.info(f"Resuming with {len(new_urls)} pending URLs from checkpoint")
+            else:
+                new_urls = self._discover_urls()
+                if new_urls is None:
+                    return []
+                self._checkpoint_pending(new_urls)
 
-        self.quit()
+            if new_urls and len(new_urls) >= 1:
+                self.logger.info(f"Fetching descriptions for {len(new_urls)} jobs using {self.max_workers} threads")
 
-        page_ranges = _chunk_pages(self, total_pages, self.max_workers)
+                # Danh sách để lưu các URL có lỗi
+                failed_urls = []
 
-        job_urls = self._result_crawl_url(page_ranges)
-        old_url = _get_data_in_file()
-        new_urls = _find_diff_dict(old_url, job_urls)
-        if new_urls and len(new_urls) >= 1:
-            self.logger.info(f"Fetching descriptions for {len(new_urls)} jobs using {self.max_workers} threads")
-
-            # Danh sách để lưu các URL có lỗi
-            failed_urls = []
-
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                future_to_url = {
-                    executor.submit(self._fetch_job_description_with_retry, url, retries=3, delay=2): url for url in
-                    new_urls
-                }
-
-                for future in as_completed(future_to_url):
-                    url_obj = future_to_url[future]
-                    try:
-                        result = future.result()
-                        if result:
-                            self.jobs.append(result)
-                    except Exception as e:
-                        self.logger.error(f"❌ Lỗi khi xử lý {url_obj['url']}: {str(e)}")
-                        failed_urls.append(url_obj)  # Thêm vào danh sách failed URLs
-                        self.error_count += 1
-            if self.error_count >= 1:
-                _send_telegram_message('', f'Finished crawling ItViec. Collected {len(self.jobs)} job descriptions!', '', '',
-                                   f'{self.error_count}')
-
-            # Thử lại các URL bị lỗi nếu có
-            if failed_urls:
-                _send_telegram_message('', f'thử lấy lại dữ liệu của {len(failed_urls)} job descriptions!', '', '',
-                                       f'{self.error_count}')
-                failed_urls = _remove_duplicates(failed_urls)
-                self.error_count = 0
-                self.logger.info(f"Retrying {len(failed_urls)} failed URLs...")
-                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # Pool đủ lớn cho giới hạn tối đa của spider này (controller của host có thể được tạo trước
+                # với giới hạn khác); số trang thực sự tải do self.concurrency quyết định
+                with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
                     future_to_url = {
                         executor.submit(self._fetch_job_description_with_retry, url, retries=3, delay=2): url for url in
-                        failed_urls
+                        new_urls
                     }
 
                     for future in as_completed(future_to_url):
@@ -165,24 +186,86 @@ class NewItViecSpider(BaseCrawler):
                         try:
                             result = future.result()
                             if result:
-                                self.jobs.append(result)
+                                self._emit(result)
                         except Exception as e:
-                            self.logger.error(f"❌ Lỗi khi xử lý lại {url_obj['url']}: {str(e)}")
+                            self.logger.error(f"❌ Lỗi khi xử lý {url_obj['url']}: {str(e)}")
+                            self.frontier.record_fetch(url_obj['url'], 0)
+                            failed_urls.append(url_obj)  # Thêm vào danh sách failed URLs
+                            self._checkpoint_failed(url_obj)
                             self.error_count += 1
-
-            self.logger.info(f"Finished crawling. Collected {len(self.jobs)} job descriptions.")
-            if self.error_count >= 1:
-                _send_telegram_message('', f'Finished crawling ItViec. Collected {len(self.jobs)} job descriptions!',
-                                       '', '',
+                if self.error_count >= 1:
+                    _send_telegram_message('', f'Finished crawling ItViec. Collected {self.job_count} job descriptions!', '', '',
                                        f'{self.error_count}')
+
+                # Thử lại các URL bị lỗi nếu có
+                if failed_urls:
+                    _send_telegram_message('', f'thử lấy lại dữ liệu của {len(failed_urls)} job descriptions!', '', '',
+                                           f'{self.error_count}')
+                    failed_urls = list({_job_key(url['url']): url for url in failed_urls}.values())
+                    self.error_count = 0
+                    self.logger.info(f"Retrying {len(failed_urls)} failed URLs...")
+                    with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                        future_to_url = {
+                            executor.submit(self._fetch_job_description_with_retry, url, retries=3, delay=2): url for url in
+                            failed_urls
+                        }
+
+                        for future in as_completed(future_to_url):
+                            url_obj = future_to_url[future]
+                            try:
+                                result = future.result()
+                                if result:
+                                    self._emit(result)
+                            except Exception as e:
+                                self.logger.error(f"❌ Lỗi khi xử lý lại {url_obj['url']}: {str(e)}")
+                                self.error_count += 1
+
+                self.logger.info(f"Finished crawling. Collected {self.job_count} job descriptions.")
+                self.logger.info(f"ItViec concurrency metrics: {self.concurrency.metrics()}")
+                self.logger.info(f"ItViec driver pool metrics: {self.driver_pool.metrics()}")
+                if self.error_count >= 1:
+                    _send_telegram_message('', f'Finished crawling ItViec. Collected {self.job_count} job descriptions!',
+                                           '', '',
+                                           f'{self.error_count}')
+                else:
+                    _send_telegram_message('', f'Finished crawling ItViec. Collected {self.job_count} job descriptions!',
+                                           '', '', '')
             else:
-                _send_telegram_message('', f'Finished crawling ItViec. Collected {len(self.jobs)} job descriptions!',
-                                       '', '', '')
-        else:
-            self.logger.info("No new URLs to process.")
-            return self.jobs
+                self.logger.info("No new URLs to process.")
+            self.completed = True
+        finally:
+            # Đóng toàn bộ tab / driver đang giữ trong pool và các process parse, kể cả khi dừng giữa chừng.
+            # Driver của chính crawler (trang listing) được trả về trước để pool quit nó cùng các driver rảnh.
+            self.quit()
+            if self.tab_pool:
+                self.tab_pool.close()
+            self.driver_pool.close()
+            self.parse_stage.close()
         return self.jobs
 
+    def _discover_urls(self):
+        """Bước listing: lấy danh sách URL job và trả về các URL cần fetch theo frontier (None nếu lỗi)"""
+        self.get(self.base_url, bypass_cloudflare=True)
+
+        if 'itviec' not in self.driver.current_url:
+            self.logger.error(f'❌ Lỗi khi truy cập trang web {self.driver.current_url}')
+            return None
+
+        # Lấy cookies + UA từ Selenium -> trang chi tiết tải qua requests (detail_mode='http')
+        with self._clearance_lock:
+            self._adopt_browser_session(self.driver)
+
+        # total_pages = _get_total_page(self, '//div[@class="page" or contains(@class, "pagination")][last()]')
+        total_pages = 5
+
+        self.quit()
+
+        page_ranges = _chunk_pages(self, total_pages, self.max_workers)
+
+        job_urls = self._result_crawl_url(page_ranges)
+        # Chỉ fetch các URL mới / lỗi / quá hạn theo frontier
+        return self.frontier.mark_seen(self.base_url, job_urls)
+
     def _result_crawl_url(self, page_ranges):
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             futures = {
@@ -204,44 +287,78 @@ class NewItViecSpider(BaseCrawler):
 
             return self.urls
 
+    def _listing_from_page(self, page):
+        '''
+        Danh sách {'title', 'url'} của trang listing đang mở trên driver / tab
+
+        Dùng listing_extractor trong trang; chỉ khi extractor không nhận ra trang mới lấy page_source để parse.
+        '''
+        if self.listing_extractor:
+            jobs = self.listing_extractor.run(page)
+            if jobs is not None:
+                return [{'title': job['title'], 'url': _canonical_url(job['url'])} for job in jobs]
+        return self._parse_listing_page(page.page_source)
+
+    def _detail_from_page(self, page):
+        '''Field của trang chi tiết đang mở (dict từ detail_extractor), hoặc HTML (bytes) để parse khi extractor không dùng được'''
+        if self.detail_extractor:
+            fields = self.detail_extractor.run(page, TAG_HEADINGS, EXPERIENCE_HEADINGS)
+            if fields:
+                return fields
+        return page.page_source.encode('utf-8')
+
+    def _parse_listing_page(self, html):
+        '''Lấy danh sách {'title', 'url'} từ HTML một trang listing'''
+        soup = BeautifulSoup(html, _bs4_features(self.parser_backend))
+        jobs_on_page = []
+        for job in soup.find_all('div', class_='job-card'):
+            title_tag = job.find('h3')
+            if not title_tag:
+                continue
+
+            url = title_tag.get('data-url')
+            if not url:
+                continue
+
+            jobs_on_page.append({
+                'title': title_tag.text.strip(),
+                'url': _canonical_url(url)
+            })
+        return jobs_on_page
+
     def _crawl_range(self, start_page, end_page):
-        '''Crawl danh sách jobs từ trang start_page đến end_page sử dụng một driver riêng.'''
+        '''Crawl danh sách jobs từ trang start_page đến end_page bằng một driver mượn từ pool.'''
+        if self.tab_pool:
+            return self._crawl_range_tabs(start_page, end_page)
         crawl_urls = []
 
         driver = None
+        pages_served = 0
         try:
-            driver = self.driver_pool.get_driver()
+            driver = self.driver_pool.acquire()
+            self.clearance_store.apply_to_driver(driver, self.base_url)
 
             for page in range(start_page, end_page + 1):
+                if self.driver_pool.should_recycle(driver, pages_served):
+                    # Driver quá ngưỡng bộ nhớ / tuổi / số trang: đổi driver mới giữa hai trang
+                    self.driver_pool.release(driver, pages_served=pages_served)
+                    driver, pages_served = None, 0
+                    driver = self.driver_pool.acquire()
+                    self.clearance_store.apply_to_driver(driver, self.base_url)
                 try:
                     page_url = f'https://itviec.com/it-jobs?page={page}'
+                    _rate_limit(page_url)
                     driver.get(page_url)
+                    pages_served += 1
 
                     _wait_for_element_with_driver(
                         driver,
                         By.XPATH,
-                        "//div[contains(@class, 'job-card') or contains(@class, 'job_content')]",
-                        self.logger
+                        self.listing_xpath,
+                        logger=self.logger
                     )
 
-                    soup = BeautifulSoup(driver.page_source, 'html.parser')
-                    job_cards = soup.find_all('div', class_='job-card')
-
-                    jobs_on_page = []
-                    for job in job_cards:
-                        title_tag = job.find('h3')
-                        if not title_tag:
-                            continue
-
-                        url = title_tag.get('data-url')
-                        if not url:
-                            continue
-
-                        jobs_on_page.append({
-                            'title': title_tag.text.strip(),
-                            'url': url.strip()
-                        })
-
+                    jobs_on_page = self._listing_from_page(driver)
                     crawl_urls.extend(jobs_on_page)
                     self.logger.info(f"[{start_page}-{end_page}] ✅ Page {page}: {len(jobs_on_page)} jobs found")
 
@@ -253,108 +370,207 @@ class NewItViecSpider(BaseCrawler):
 
         finally:
             if driver:
-                driver.quit()
+                self.driver_pool.release(driver, pages_served=pages_served)
+
+        return crawl_urls
 
+    def _crawl_range_tabs(self, start_page, end_page):
+        '''Như _crawl_range nhưng mỗi trang chạy trên một tab mượn từ ChromeTabPool (nhiều tab chung một Chrome)'''
+        crawl_urls = []
+        for page in range(start_page, end_page + 1):
+            page_url = f'https://itviec.com/it-jobs?page={page}'
+            try:
+                with self.tab_pool.lease() as tab:
+                    _rate_limit(page_url)
+                    tab.navigate(page_url)
+                    tab.wait_for_xpath(self.listing_xpath)
+                    jobs_on_page = self._listing_from_page(tab)
+                crawl_urls.extend(jobs_on_page)
+                self.logger.info(f"[{start_page}-{end_page}] ✅ Page {page}: {len(jobs_on_page)} jobs found (tab)")
+            except Exception as e:
+                self.logger.error(f"[{start_page}-{end_page}] ⚠️ Error on page {page}: {str(e)}")
         return crawl_urls
 
+    def _set_session_clearance(self, cookies, user_agent):
+        """
+        Đặt cookie (cf_clearance...) và User-Agent của trình duyệt cho self.session
+
+        Clearance của Cloudflare gắn với UA nên requests phải gửi đúng UA của trình duyệt.
+        Gọi khi đang giữ self._clearance_lock.
+        """
+        for cookie in cookies:
+            self.session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'),
+                                     path=cookie.get('path', '/'))
+        self.session.headers['User-Agent'] = user_agent
+        # Chỉ nhận encoding mà urllib3 giải nén được (br cần thư viện brotli)
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        self._clearance_version += 1
+
+    def _adopt_browser_session(self, driver):
+        """Chép clearance của trình duyệt sang self.session và lưu lại cho các lần chạy sau"""
+        cookies = driver.get_cookies()
+        user_agent = driver.execute_script("return navigator.userAgent")
+        self._set_session_clearance(cookies, user_agent)
+        self.clearance_store.save(self.base_url, cookies, user_agent)
+
+    def _refresh_clearance(self, seen_version):
+        """
+        Vượt Cloudflare lại bằng một driver trong pool và chép clearance mới sang session
+
+        Args:
+            seen_version: _clearance_version lúc request bị challenge; nếu luồng khác đã làm mới
+                sau đó thì không mở trình duyệt nữa
+
+        Returns:
+            bool: True nếu session đang có clearance mới
+        """
+        with self._clearance_lock:
+            if self._clearance_version != seen_version:
+                return True
+
+            self.logger.info("🔑 Cloudflare clearance expired, refreshing it in the browser")
+            healthy = False
+            driver = self.driver_pool.acquire()
+            try:
+                _rate_limit(self.base_url)
+                driver.get(self.base_url)
+                healthy = True
+                try:
+                    WebDriverWait(driver, 30).until(lambda d: not _is_challenge_html(d.page_source))
+                except TimeoutException:
+                    self.logger.warning("Cloudflare challenge did not clear in the browser")
+                    self.clearance_store.invalidate(self.base_url)
+                    return False
+                self._adopt_browser_session(driver)
+                return True
+            except Exception as e:
+                self.logger.error(f"❌ Failed to refresh Cloudflare clearance: {e}")
+                return False
+            finally:
+                self.driver_pool.release(driver, discard=not healthy)
+
     def _fetch_job_description(self, url_obj):
+        if self.detail_mode == 'http':
+            return self._fetch_job_description_http(url_obj)
+        return self._fetch_job_description_browser(url_obj)
+
+    def _fetch_job_description_http(self, url_obj):
+        """
+        Tải trang chi tiết qua self.session với clearance của trình duyệt
+
+        Bị challenge thì làm mới clearance (một lần cho mọi luồng) rồi thử lại; vẫn bị chặn
+        thì job này dùng trình duyệt. Bị chặn liên tiếp max_http_blocks lần ngay sau khi vừa
+        có clearance thì chuyển hẳn sang detail_mode='browser'.
+        """
         self.logger.info(f"Fetching description for: {url_obj['title']}")
 
-        driver = self.driver_pool.get_driver()
-        try:
-            driver.get(url_obj['url'])
-
-            _wait_for_element_with_driver(
-                driver,
-                By.XPATH,
-                f"//div[contains(@class, 'jd-main')]//div[contains(@class, 'icontainer')]//h1[contains(text(), '{url_obj['title']}')]",
-                self.logger
-            )
-
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-            # --- Parse thông tin cơ bản ---
-            job_header = soup.find('div', class_='job-header-info')
-            job_title = job_header.find('h1').text.strip()
-            company_name = job_header.find('div', class_='employer-name').text.strip()
-            salary = job_header.find('a').text.strip()
-
-            job_mid = job_header.find_parent('div', class_='job-show-header').find_next_sibling()
-            location_spans = job_mid.find_all('span')
-            locations_text = [span.text.strip() for span in location_spans if span.text.strip()]
-            posted_at = locations_text[-1] if locations_text else ''
-            location = locations_text[:-1] if len(locations_text) > 1 else []
-
-            # --- Parse kỹ năng và kinh nghiệm ---
-            headings = ['Skills:', 'Job Domain:', 'Kỹ năng:', 'Lĩnh vực:']
-            experience_headings = ['Job Expertise:', 'Chuyên môn:']
-            tags, experience = [], []
-
-            overview_divs = job_mid.find_all('div')
-            for div in overview_divs:
-                text = div.get_text(strip=True)
-                if text in headings:
-                    next_div = div.find_next_sibling("div")
-                    if next_div:
-                        tag_elements = next_div.find_all('a')
-                        if tag_elements:
-                            tags.extend(tag.text.strip() for tag in tag_elements)
-                        else:
-                            tags.extend(
-                                span.get_text(strip=True)
-                                for span in next_div.find_all('div')
-                            )
-
-                if text in experience_headings:
-                    next_div = div.find_next_sibling("div")
-                    if next_div:
-                        experience_elems = next_div.find_all('a')
-                        experience.extend(exp.text.strip() for exp in experience_elems)
-
-            tags = _remove_duplicates(tags)
-            experience = _remove_duplicates(experience)
-            level = ''  # Chưa phân tích được level
-
-            description_section = soup.find('section', class_='job-content')
-            description = description_section.text.strip() if description_section else ''
-
-            job = JobItem(
-                title=job_title,
-                company=company_name,
-                location=location,
-                salary=salary,
-                posted_at=posted_at,
-                experience=experience,
-                level=level,
-                tags=tags,
-                url=url_obj['url'],
-                source=self.base_url,
-                description=description
-            )
-
-            self.logger.info(f"Crawled: {job_title}")
-            return job
+        for attempt in range(2):
+            seen_version = self._clearance_version
+            _rate_limit(url_obj['url'])
+            with self.concurrency.slot() as outcome:
+                response = self.session.get(url_obj['url'], timeout=self.request_timeout)
+                outcome.status = response.status_code
+
+            if not _is_cloudflare_challenge(response.status_code, response.headers, response.content):
+                with self._http_blocks_lock:
+                    self._http_blocks = 0
+                break
+            if attempt == 0 and self._refresh_clearance(seen_version):
+                continue
+
+            with self._http_blocks_lock:
+                self._http_blocks += 1
+                if self._http_blocks >= self.max_http_blocks and self.detail_mode == 'http':
+                    self.logger.warning("⚠️ Cloudflare keeps challenging plain HTTP requests, "
+                                        "switching ItViec detail pages to the browser")
+                    self.detail_mode = 'browser'
+            return self._fetch_job_description_browser(url_obj)
+
+        if response.status_code != 200:
+            self.logger.warning(f"Failed to fetch {url_obj['url']} - status {response.status_code}")
+            self.frontier.record_fetch(url_obj['url'], response.status_code)
+            return None
+
+        job = self.parse_stage.parse(_parse_itviec_detail, response.content, url_obj, self.base_url,
+                                     self.parser_backend)
+        self.frontier.record_fetch(url_obj['url'], response.status_code, job)
+        if job:
+            self.logger.info(f"Crawled: {job.title}")
+        return job
+
+    def _fetch_job_description_browser(self, url_obj):
+        self.logger.info(f"Fetching description for: {url_obj['title']} (browser)")
 
+        job_title = url_obj['title']
+        title_xpath = (f"//div[contains(@class, 'jd-main')]//div[contains(@class, 'icontainer')]"
+                       f"//h1[contains(text(), '{url_obj['title']}')]")
+        try:
+            if self.tab_pool:
+                page = self._load_detail_in_tab(url_obj, title_xpath)
+            else:
+                page = self._load_detail_in_driver(url_obj, title_xpath)
         except Exception as e:
             self.logger.error(f"❌ Error while crawling {job_title} - {str(e)}")
+            self.frontier.record_fetch(url_obj['url'], 0)
             return None
 
+        if isinstance(page, dict):
+            # Field đã được extractor lấy sẵn trong trang, không còn gì để parse
+            job = _job_from_fields(page, url_obj, self.base_url)
+        else:
+            # Parse ở process pool để không tranh GIL với các luồng điều khiển browser
+            job = self.parse_stage.parse(_parse_itviec_detail, page, url_obj, self.base_url, self.parser_backend)
+        # Selenium không trả HTTP status: trang tải được coi như 200
+        self.frontier.record_fetch(url_obj['url'], 200, job)
+        if job:
+            self.logger.info(f"Crawled: {job.title}")
+        return job
+
+    def _load_detail_in_driver(self, url_obj, title_xpath):
+        """Mở trang chi tiết bằng một driver mượn từ pool, trả về field (dict) hoặc HTML (bytes), xem _detail_from_page"""
+        healthy = False
+        driver = self.driver_pool.acquire()
+        try:
+            self.clearance_store.apply_to_driver(driver, url_obj['url'])
+            _rate_limit(url_obj['url'])
+            with self.concurrency.slot() as outcome:
+                driver.get(url_obj['url'])
+                healthy = True
+
+                found = _wait_for_element_with_driver(
+                    driver,
+                    By.XPATH,
+                    title_xpath,
+                    logger=self.logger
+                )
+                # Không có HTTP status: trang không hiện nội dung kịp (thường là Cloudflare chặn) tính như timeout
+                outcome.timeout = not found
+
+            return self._detail_from_page(driver)
+
         finally:
-            driver.quit()
+            # Driver lỗi khi điều hướng sẽ bị huỷ, còn lại trả về pool để tái sử dụng
+            self.driver_pool.release(driver, discard=not healthy)
+
+    def _load_detail_in_tab(self, url_obj, title_xpath):
+        """Mở trang chi tiết trên một tab của ChromeTabPool, trả về field (dict) hoặc HTML (bytes)"""
+        with self.tab_pool.lease() as tab:
+            _rate_limit(url_obj['url'])
+            with self.concurrency.slot() as outcome:
+                tab.navigate(url_obj['url'])
+                outcome.timeout = not tab.wait_for_xpath(title_xpath)
+            return self._detail_from_page(tab)
 
     def _fetch_job_description_with_retry(self, url_obj, retries=3, delay=2):
-        """Hàm xử lý job với cơ chế thử lại khi có lỗi."""
+        """Hàm xử lý job với cơ chế thử lại khi có lỗi; lần thử cuối vẫn lỗi thì ném lại exception cho caller."""
         attempt = 0
-        while attempt < retries:
+        while True:
             try:
-                result = self._fetch_job_description(url_obj)
-                return result
+                return self._fetch_job_description(url_obj)
             except Exception as e:
                 attempt += 1
                 self.logger.error(f"❌ Lỗi khi xử lý {url_obj['url']} (Thử lại {attempt}/{retries}): {str(e)}")
-                if attempt < retries:
-                    time.sleep(delay)  # Chờ một chút trước khi thử lại
-                else:
-                    self.error_count += 1
-                    return None  # Nếu đã thử hết các lần mà vẫn không được, trả về None
-        return None
+                if attempt >= retries:
+                    # Đã thử hết: caller ghi URL vào danh sách lỗi (và checkpoint) để thử lại sau
+                    raise
+                time.sleep(delay)  # Chờ một chút trước khi thử lại
@@ -1,17 +1,28 @@
-import re
+import asyncio
+import json
 import logging
 import requests
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin
-from typing import Optional
+from urllib.parse import urlencode, urljoin
+from typing import List, Optional
+from requests.adapters import HTTPAdapter
 
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from jobhub_crawler.core.async_fetcher import AsyncFetcher
 from jobhub_crawler.core.base_crawler import BaseCrawler
+from jobhub_crawler.core.concurrency import AdaptiveConcurrency
 from jobhub_crawler.core.job_item import JobItem
+from jobhub_crawler.core.js_extractor import JsExtractor
+from jobhub_crawler.core.parse_stage import ParseStage
+from jobhub_crawler.core.rate_limit import _rate_limit
+from jobhub_crawler.parsers.backends import _bs4_features, _check_backend
+from jobhub_crawler.parsers.topdev import _parse_job_detail as _parse_topdev_detail, _job_urls_from_api, \
+    _api_last_page
 from jobhub_crawler.utils.SeleniumCleaner import SeleniumCleaner
 from jobhub_crawler.utils.notifier import _send_telegram_message
-from jobhub_crawler.utils.check import _get_data_in_file, _find_diff_dict
-from jobhub_crawler.utils.helpers import _scroll_to_bottom, _remove_duplicates
+from jobhub_crawler.utils.helpers import _scroll_until_loaded
+from jobhub_crawler.utils.urls import _canonical_url, _job_key
+from jobhub_crawler.utils.network_capture import _captured_json_responses, _reset_network_capture
 
 
 # TODO: clean code, tối ưu lại, phân hàm rõ ràng, chỉnh sửa lại lấy dũ liệu còn thiếu, ghi chú tiếng việt
@@ -19,16 +30,54 @@ from jobhub_crawler.utils.helpers import _scroll_to_bottom, _remove_duplicates
 class NewTopDevSpider(BaseCrawler):
     """Spider for crawling job listings from TopDev.vn using BeautifulSoup and multi-threading"""
 
-    def __init__(self, headless=True, max_workers=5, delay=2, max_attempts=5):
+    # Backend parser mặc định cho TopDev (xem jobhub_crawler.parsers.backends.PARSER_BACKENDS)
+    parser_backend = 'lxml'
+    # Selector của một card job trên trang listing
+    listing_selector = "section ul li.mb-4.last\\:mb-0"
+    # Extractor chạy trong trang (utils/js/topdev_listing.js) cho chế độ 'dom': trả về [{title, url}]
+    # thay cho page_source của cả trang đã cuộn; None = parse page_source bằng BeautifulSoup
+    listing_extractor = JsExtractor('topdev_listing')
+    # Cách lấy danh sách URL:
+    #   'api' = gọi thẳng JSON API phân trang bằng HTTP, không khởi động Chrome
+    #   'xhr' = mở trang listing, đọc JSON API mà trang tự gọi (qua DevTools)
+    #   'dom' = mở trang listing, parse HTML
+    listing_mode = 'api'
+    LISTING_MODES = ('api', 'xhr', 'dom')
+    # Regex URL của API listing mà trang gọi khi cuộn
+    api_url_pattern = r'api\.topdev\.vn/.*jobs'
+    # Endpoint phân trang của API listing (chế độ 'api')
+    api_listing_url = "https://api.topdev.vn/td/v2/jobs"
+    api_listing_params = {'locale': 'vi_VN'}
+    api_page_size = 50
+    api_max_pages = 200
+
+    def __init__(self, headless=True, max_workers=5, delay=2, max_attempts=5, use_async=False,
+                 async_concurrency=100, request_timeout=30, parse_workers=None, parser_backend=None,
+                 max_concurrency=32, listing_mode=None):
         """
         Initialize the TopDev spider
 
         Args:
             headless (bool): Run in headless mode if True (kept for BaseCrawler compatibility)
-            max_workers (int): Maximum number of worker threads for parallel processing
+            max_workers (int): Initial number of concurrent detail requests; the AIMD controller
+                adapts it between 1 and max_concurrency (async_concurrency when use_async is True)
+            use_async (bool): Fetch detail pages with the asyncio engine instead of the thread pool
+            async_concurrency (int): Maximum detail requests in flight when use_async is True
+            request_timeout (int): Per-request timeout in seconds for detail pages
+            parse_workers (int): Parser processes, sized separately from fetch concurrency
+                (default: CPU count, 0 = parse inline)
+            parser_backend (str): Override the class-level parser backend for this instance
+            max_concurrency (int): Upper bound for the adaptive concurrency in thread mode
+            listing_mode (str): Override the class-level listing mode ('api', 'xhr' or 'dom');
+                in 'api' mode no browser is started unless the API fails and the spider falls back to 'xhr'
         """
+        listing_mode = listing_mode or self.listing_mode
+        if listing_mode not in self.LISTING_MODES:
+            raise ValueError(f"Unknown listing mode '{listing_mode}', expected one of {self.LISTING_MODES}")
+        self.listing_mode = listing_mode
         super().__init__(headless=headless,
-                         user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+                         user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+                         capture_network=listing_mode != 'dom')
 
         self.jobs = []
         self.urls = []
@@ -44,7 +93,24 @@ class NewTopDevSpider(BaseCrawler):
             'Upgrade-Insecure-Requests': '1',
         }
         self.session.headers.update(self.headers)
+        # Adapter đủ lớn để mỗi luồng (tối đa max_concurrency) có một connection riêng
+        adapter = HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        # Số request đồng thời tới topdev.vn tự điều chỉnh theo latency và 429/503 (AIMD)
+        self.concurrency = AdaptiveConcurrency.for_host(
+            self.base_url, initial=max_workers,
+            max_limit=async_concurrency if use_async else max(max_concurrency, max_workers))
+        # Concurrency riêng cho host của API listing (chế độ 'api')
+        self.api_concurrency = AdaptiveConcurrency.for_host(self.api_listing_url, initial=max_workers,
+                                                            max_limit=max_concurrency)
+        self.use_async = use_async
+        self.async_concurrency = async_concurrency
+        self.request_timeout = request_timeout
+        self.parse_stage = ParseStage(max_workers=parse_workers)
+        self.parser_backend = _check_backend(parser_backend or self.parser_backend)
         self.delay = delay
         self.max_attempts = max_attempts
 
@@ -54,98 +120,112 @@ class NewTopDevSpider(BaseCrawler):
             self.logger.info(f"Starting TopDev crawler with {self.max_workers} workers")
             _send_telegram_message('', f'Starting TopDev crawler with {self.max_workers} workers!', '', '', '')
 
-            # Initial page content is loaded via Selenium with _scroll_to_bottom in _extract_job_listings
+            # Danh sách URL lấy qua JSON API (không cần Chrome) hoặc Selenium + cuộn trang, xem listing_mode
 
-            # Extract job listings
-            job_urls = self._extract_job_listings(None)  # Pass None as we'll get the page in the method
-            self.logger.info(f"Found {len(job_urls)} url job listings")
+            new_urls = self._resume_pending()
+            if new_urls is not None:
+                # Resume: bỏ qua bước listing, fetch tiếp các URL còn lại trong checkpoint
+                self.quit()
+                self.logger.info(f"Resuming with {len(new_urls)} pending URLs from checkpoint")
+            else:
+                # Extract job listings
+                job_urls = self._extract_job_listings(None)  # Pass None as we'll get the page in the method
+                self.logger.info(f"Found {len(job_urls)} url job listings")
 
-            # find_diff_urls
-            old_url = _get_data_in_file()
-            new_urls = _find_diff_dict(old_url, job_urls)
+                # Chỉ fetch các URL mới / lỗi / quá hạn theo frontier
+                new_urls = self.frontier.mark_seen(self.base_url, job_urls)
+                self._checkpoint_pending(new_urls)
             if new_urls and len(new_urls) >= 1:
 
-                failed_urls = []
-                self.logger.info(f"Fetching descriptions for {len(new_urls)} jobs using {self.max_workers} threads")
-
-                # Dùng ThreadPoolExecutor để chạy đa luồng
-                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                    # Tạo map future -> url
-                    future_to_url = {executor.submit(self._fetch_job_description, url): url for url in new_urls}
-
-                    for future in as_completed(future_to_url):
-                        url = future_to_url[future]
-                        try:
-                            result = future.result()
-                            if result:
-                                self.jobs.append(result)
-                        except Exception as e:
-                            self.logger.error(f"Lỗi khi xử lý {url['url']}: {str(e)}")
-                            self.error_count += 1
-                            failed_urls.append(url)
+                self.logger.info(f"Fetching descriptions for {len(new_urls)} jobs "
+                                 f"({'async' if self.use_async else 'threads'}, concurrency {self.concurrency.limit}"
+                                 f"-{self.concurrency.max_limit})")
+                failed_urls = self._fetch_descriptions(new_urls)
 
                 if self.error_count >= 1:
                     _send_telegram_message('',
-                                           f'Finished crawling TopDev. Collected {len(self.jobs)} job descriptions!',
+                                           f'Finished crawling TopDev. Collected {self.job_count} job descriptions!',
                                            '', '',
                                            f'{self.error_count}')
 
-                    # Thử lại các URL bị lỗi nếu có
+                # Thử lại các URL bị lỗi nếu có
                 if failed_urls:
-                    failed_urls = _remove_duplicates(failed_urls)
+                    failed_urls = list({_job_key(url['url']): url for url in failed_urls}.values())
                     _send_telegram_message('', f'thử lấy lại dữ liệu của {len(failed_urls)} job descriptions!', '',
                                            '',
                                            f'{self.error_count}')
                     self.error_count = 0
                     self.logger.info(f"Retrying {len(failed_urls)} failed URLs...")
-                    with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                        future_to_url = {
-                            executor.submit(self._fetch_job_description, url): url for url in failed_urls
-                        }
-
-                        for future in as_completed(future_to_url):
-                            url_obj = future_to_url[future]
-                            try:
-                                result = future.result()
-                                if result:
-                                    self.jobs.append(result)
-                            except Exception as e:
-                                self.logger.error(f"❌ Lỗi khi xử lý lại {url_obj['url']}: {str(e)}")
-                                self.error_count += 1
+                    self._fetch_descriptions(failed_urls)
+                self.logger.info(f"TopDev concurrency metrics: {self.concurrency.metrics()}")
                 if self.error_count >= 1:
                     _send_telegram_message('',
-                                           f'Finished crawling TopDev. Collected {len(self.jobs)} job descriptions!',
+                                           f'Finished crawling TopDev. Collected {self.job_count} job descriptions!',
                                            '', '',
                                            f'{self.error_count}')
                 else:
                     self.logger.info(f"Finished crawling TopDev. Collected {len(new_urls)} job url record")
-                    _send_telegram_message('', f'Finished crawling TopDev. Collected {len(self.jobs)} job url record!',
+                    _send_telegram_message('', f'Finished crawling TopDev. Collected {self.job_count} job url record!',
                                            '',
                                            '',
                                            '')
             else:
                 self.logger.info("No new URLs to process.")
-                return self.jobs
+            self.completed = True
         except Exception as e:
             self.logger.error(f"Error during crawling: {str(e)}")
+        self.parse_stage.close()
         SeleniumCleaner.clean_selenium_temp_dirs(self)
         return self.jobs
 
     def _extract_job_listings(self, soup):
+        if self.listing_mode == 'api':
+            api_urls = self._extract_job_listings_from_api()
+            if api_urls:
+                self.quit()
+                self.urls.extend(api_urls)
+                return self.urls
+            # API đổi/không truy cập được: chỉ lúc này mới cần tới trình duyệt (self.driver mượn khi dùng lần đầu)
+            self.logger.warning("Listing API returned no jobs, falling back to the browser listing")
+
         # Use Selenium via BaseCrawler to scroll to the bottom to load all job listings
         try:
+            use_xhr = self.listing_mode != 'dom'
+            if use_xhr:
+                _reset_network_capture(self.driver)
             self.get(self.base_url)
-            _scroll_to_bottom(self.driver, self.delay, self.max_attempts)
+            # Cuộn tới khi card job mới không còn xuất hiện (theo dõi DOM + request, không sleep cố định).
+            # Ở chế độ xhr không dựa vào selector CSS: chỉ theo dõi chiều cao trang.
+            total_cards = _scroll_until_loaded(self.driver, item_selector=None if use_xhr else self.listing_selector,
+                                               idle_timeout=self.delay, max_scrolls=self.max_attempts,
+                                               logger=self.logger)
+            self.logger.info(f"Listing page loaded ({total_cards})")
+
+            if use_xhr:
+                api_urls = self._extract_job_listings_from_network()
+                if api_urls:
+                    self.quit()
+                    self.urls.extend(api_urls)
+                    return self.urls
+                self.logger.warning("No job data captured from listing API responses, falling back to DOM parsing")
+
+            if self.listing_extractor:
+                jobs = self.listing_extractor.run(self.driver, self.listing_selector)
+                if jobs:
+                    self.quit()
+                    self.logger.info(f"Found {len(jobs)} job elements on page")
+                    self.urls.extend({'title': job['title'], 'url': _canonical_url(job['url'])} for job in jobs)
+                    return self.urls
 
             # Now get the updated page source after scrolling
             updated_html = self.driver.page_source
-            self.driver.quit()
-            soup = BeautifulSoup(updated_html, 'html.parser')
+            self.quit()
+            soup = BeautifulSoup(updated_html, _bs4_features(self.parser_backend))
         except Exception as e:
             self.logger.warning(f"Error scrolling page: {str(e)}. Using initial page content.")
 
         # Find all job listing elements
-        job_elements = soup.select("section ul li.mb-4.last\\:mb-0")
+        job_elements = soup.select(self.listing_selector)
         self.logger.info(f"Found {len(job_elements)} job elements on page")
         for job in job_elements:
             try:
@@ -154,7 +234,8 @@ class NewTopDevSpider(BaseCrawler):
                 title = title_element.text.strip() if title_element else ""
                 url = urljoin(self.base_url, title_element.get('href')) if title_element else ""
                 if url != "":
-                    url = url.replace("viec-lam", "detail-jobs")
+                    # Bỏ tham số tracking, /viec-lam/ -> /detail-jobs/ để URL ổn định giữa các lần crawl
+                    url = _canonical_url(url)
                     self.urls.append({
                         'title': title,
                         'url': url
@@ -164,64 +245,197 @@ class NewTopDevSpider(BaseCrawler):
 
         return self.urls
 
-    def _fetch_job_description(self, url_obj: dict) -> Optional[JobItem]:
-        try:
-
-            self.logger.info(f"Fetching description for: {url_obj['title']}")
+    def _api_page_url(self, page: int) -> str:
+        params = dict(self.api_listing_params, page=page, page_size=self.api_page_size)
+        return f"{self.api_listing_url}?{urlencode(params)}"
 
-            # Get the job detail page
-            response = self.session.get(url_obj['url'])
+    def _fetch_api_page(self, page: int):
+        """Fetch one page of the listing API with the shared session; None when it is not usable JSON"""
+        url = self._api_page_url(page)
+        _rate_limit(url)
+        try:
+            with self.api_concurrency.slot() as outcome:
+                response = self.session.get(url, headers={'Accept': 'application/json'},
+                                            timeout=self.request_timeout)
+                outcome.status = response.status_code
             if response.status_code != 200:
-                self.logger.warning(f"Failed to fetch {url_obj['url']} - status {response.status_code}")
+                self.logger.warning(f"Listing API page {page} returned status {response.status_code}")
                 return None
+            return response.json()
+        except (requests.RequestException, ValueError) as e:
+            self.logger.warning(f"Listing API page {page} failed: {e}")
+            return None
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            card_job = soup.find('section', id='detailJobPage').find('div', id=re.compile(r'^card-job-\d+$'))
-
-            # lấy dữ liệu từ header
-            card_job_header = card_job.find('section', id='detailJobHeader')
-            job_title = card_job_header.find('h1').text.strip()
-            company_name = card_job_header.find('p').text.strip()
-            location = [card_job_header.find("div", {"data-testid": "flowbite-tooltip"}).text.strip()]
-
-            card_job_middle = card_job_header.find_next_sibling('section')
-            time_text = card_job_middle.find(string=lambda t: "Posted" in t).parent.get_text()
-            if time_text:
-                posted_at = time_text.strip()
-            salary_e = card_job_middle.find("button", string="Sign In to view salary")
-            if salary_e:
-                salary = salary_e.text.strip()
-            exp_section = card_job_middle.find("h3", string="Year of experience")
-            if exp_section:
-                experience = exp_section.find_next("a").text.strip()
-            level_section = card_job_middle.find("h3", string="Job Level")
-            if level_section:
-                level = level_section.find_next("a").text.strip()
-
-            skills = card_job_middle.select("a span.text-xs, a span.md\\:text-sm")
-            tags = [skill.text.strip() for skill in skills if skill.text.strip()]
-
-            # BUG: xuất hiện trường hợp không lấy được description: tìm dữ liệu mẫu không lấy được -> thực hiện trích xuất lại dữ liệu
-            job_Description = card_job.find('section', id='cardContentDetailJob')
-            if job_Description:
-                description = job_Description.find('div', id='JobDescription').text.strip()
-            else:
-                description = ''
-
-            return JobItem(
-                title=job_title,
-                company=company_name,
-                location=location,
-                salary=salary,
-                posted_at=posted_at,
-                experience=experience,
-                level=level,
-                tags=tags,
-                url=url_obj['url'],
-                source=self.base_url,
-                description=description
+    def _extract_job_listings_from_api(self) -> List[dict]:
+        """
+        Build the URL list by paging through the listing JSON API over plain HTTP
+
+        Page 1 gives the page count; the remaining pages are fetched concurrently through
+        AsyncFetcher under the API host's rate limiter and AIMD controller. When the response
+        has no pagination info, pages are walked one by one until an empty page.
+        """
+        first = self._fetch_api_page(1)
+        if first is None:
+            return []
+        pages = {1: _job_urls_from_api(first)}
+        if not pages[1]:
+            return []
+
+        last_page = _api_last_page(first)
+        if last_page is None:
+            page = 2
+            while page <= self.api_max_pages:
+                payload = self._fetch_api_page(page)
+                url_objs = _job_urls_from_api(payload) if payload is not None else []
+                if not url_objs:
+                    break
+                pages[page] = url_objs
+                page += 1
+        elif last_page > 1:
+            last_page = min(last_page, self.api_max_pages)
+            fetcher = AsyncFetcher(
+                max_concurrency=self.max_concurrency,
+                timeout=self.request_timeout,
+                headers=dict(self.headers, Accept='application/json'),
+                controller=self.api_concurrency,
             )
-        except Exception as e:
-            self.logger.error(f"Lỗi khi fetch {url_obj['url']}: {str(e)}")
+            page_urls = [{'url': self._api_page_url(page), 'page': page} for page in range(2, last_page + 1)]
+            for result in fetcher.run(page_urls):
+                if not result.ok:
+                    self.logger.warning(f"Listing API page {result.meta['page']} failed: "
+                                        f"{result.error or result.status}")
+                    continue
+                try:
+                    pages[result.meta['page']] = _job_urls_from_api(json.loads(result.body))
+                except ValueError as e:
+                    self.logger.warning(f"Listing API page {result.meta['page']} is not JSON: {e}")
+
+        urls = {}
+        for page in sorted(pages):
+            for url_obj in pages[page]:
+                urls.setdefault(_job_key(url_obj['url']), url_obj)
+        self.logger.info(f"Collected {len(urls)} job URLs from {len(pages)} listing API pages (no browser)")
+        return list(urls.values())
+
+    def _extract_job_listings_from_network(self) -> List[dict]:
+        """
+        Build the URL list from the JSON responses the listing page fetched while scrolling
+
+        No page_source serialization or HTML parsing; independent of the page's CSS classes.
+        """
+        urls = {}
+        responses = 0
+        for api_url, payload in _captured_json_responses(self.driver, self.api_url_pattern):
+            responses += 1
+            for url_obj in _job_urls_from_api(payload):
+                urls.setdefault(_job_key(url_obj['url']), url_obj)
+        self.logger.info(f"Captured {len(urls)} job URLs from {responses} listing API responses")
+        return list(urls.values())
+
+    def _fetch_descriptions(self, url_objs: List[dict]) -> List[dict]:
+        """
+        Fetch and parse detail pages, emitting parsed jobs via _emit()
+
+        Args:
+            url_objs: List of {'title', 'url'} dicts to fetch
+
+        Returns:
+            List of url dicts that failed at the network level (candidates for a retry)
+        """
+        if self.use_async:
+            return asyncio.run(self._fetch_descriptions_async(url_objs))
+
+        failed_urls = []
+        # Pool đủ lớn cho giới hạn tối đa của spider này; số request thực sự chạy do self.concurrency quyết định.
+        # Không lấy self.concurrency.max_limit: controller của host có thể đã được tạo trước với giới hạn khác
+        with ThreadPoolExecutor(max_workers=max(self.max_concurrency, self.max_workers)) as executor:
+            # Tạo map future -> url
+            future_to_url = {executor.submit(self._fetch_job_description, url): url for url in url_objs}
+
+            for future in as_completed(future_to_url):
+                url = future_to_url[future]
+                try:
+                    result = future.result()
+                    if result:
+                        self._emit(result)
+                except Exception as e:
+                    self.logger.error(f"Lỗi khi xử lý {url['url']}: {str(e)}")
+                    self.frontier.record_fetch(url['url'], 0)
+                    self._checkpoint_failed(url)
+                    self.error_count += 1
+                    failed_urls.append(url)
+        return failed_urls
+
+    async def _fetch_descriptions_async(self, url_objs: List[dict]) -> List[dict]:
+        """
+        Async variant of _fetch_descriptions: all detail pages go through one AsyncFetcher
+
+        Each job is emitted as soon as its page is parsed, while other pages are still being
+        fetched; a page whose parse fails only fails that URL.
+        """
+        fetcher = AsyncFetcher(
+            max_concurrency=self.async_concurrency,
+            timeout=self.request_timeout,
+            headers=self.headers,
+            cookies={cookie.name: cookie.value for cookie in self.session.cookies},
+            controller=self.concurrency,
+        )
+        failed_urls = []
+        parsing = set()
+
+        async def parse_and_emit(result):
+            # Body giao hẳn cho parse stage, không giữ lại trong danh sách kết quả của fetch_all
+            body, result.body = result.body, b""
+            try:
+                job = await asyncio.wrap_future(self.parse_stage.submit(
+                    _parse_topdev_detail, body, result.meta, self.base_url, self.parser_backend))
+            except Exception as e:
+                # vd BrokenProcessPool: chỉ URL này lỗi, lần retry sẽ fetch lại
+                self.logger.error(f"Lỗi khi parse {result.url}: {str(e)}")
+                self.frontier.record_fetch(result.url, result.status)
+                self._checkpoint_failed(result.meta)
+                self.error_count += 1
+                failed_urls.append(result.meta)
+                return
+            self.frontier.record_fetch(result.url, result.status, job)
+            if job:
+                self._emit(job)
+
+        def on_result(result):
+            if result.error:
+                self.frontier.record_fetch(result.url, 0)
+                self._checkpoint_failed(result.meta)
+                self.error_count += 1
+                failed_urls.append(result.meta)
+                return
+            if result.status != 200:
+                self.logger.warning(f"Failed to fetch {result.url} - status {result.status}")
+                self.frontier.record_fetch(result.url, result.status)
+                return
+            # Đẩy bytes thô sang parse stage, event loop tiếp tục fetch
+            task = asyncio.ensure_future(parse_and_emit(result))
+            parsing.add(task)
+            task.add_done_callback(parsing.discard)
+
+        await fetcher.fetch_all(url_objs, on_result=on_result)
+        if parsing:
+            await asyncio.gather(*parsing)
+        return failed_urls
+
+    def _fetch_job_description(self, url_obj: dict) -> Optional[JobItem]:
+        self.logger.info(f"Fetching description for: {url_obj['title']}")
+
+        # Get the job detail page: chờ lượt của rate limiter rồi giữ một slot concurrency trong lúc request
+        _rate_limit(url_obj['url'])
+        with self.concurrency.slot() as outcome:
+            response = self.session.get(url_obj['url'], timeout=self.request_timeout)
+            outcome.status = response.status_code
+        if response.status_code != 200:
+            self.logger.warning(f"Failed to fetch {url_obj['url']} - status {response.status_code}")
+            self.frontier.record_fetch(url_obj['url'], response.status_code)
             return None
+
+        job = self.parse_stage.parse(_parse_topdev_detail, response.content, url_obj, self.base_url,
+                                     self.parser_backend)
+        self.frontier.record_fetch(url_obj['url'], response.status_code, job)
+        return job
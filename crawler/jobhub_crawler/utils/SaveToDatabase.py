@@ -3,15 +3,18 @@ import logging
 import time
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
-from jobhub_crawler.utils.helpers import _find_project_root, _find_folder, _find_latest_file
+from jobhub_crawler.utils.helpers import _find_project_root, _find_folder
+from jobhub_crawler.utils.jsonl import _is_jsonl, _iter_jobs, _read_metadata, _find_latest_output
 from jobhub_crawler.utils.notifier import _send_telegram_message
+from jobhub_crawler.utils.urls import _job_key
 
 
 class SafeLogger:
@@ -55,6 +58,17 @@ class SafeLogger:
         self.logger.debug(self._safe_message(message))
 
 
+def _unique_jobs(jobs_data: Iterable[Dict]) -> Iterator[Dict]:
+    """Bỏ job trùng khoá _job_key (cùng job nhưng khác tham số tracking trong URL)"""
+    seen_keys = set()
+    for job in jobs_data:
+        key = _job_key(job.get('url'))
+        if key in seen_keys:
+            continue
+        seen_keys.add(key)
+        yield job
+
+
 @dataclass
 class APIConfig:
     """Configuration for API connection"""
@@ -201,17 +215,29 @@ class JobDataManager:
                 self.logger.error(f"Response: {e.response.text}")
             return False
 
-    def batch_upload_jobs(self, jobs_data: List[Dict], batch_size: int = 10) -> Tuple[int, int]:
-        """Upload jobs in batches with progress tracking"""
-        total_jobs = len(jobs_data)
+    def batch_upload_jobs(self, jobs_data: Iterable[Dict], batch_size: int = 10,
+                          total_jobs: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Upload jobs in batches with progress tracking
+
+        jobs_data may be a list or a lazy iterator (e.g. streamed from a JSONL file);
+        only one batch is held in memory at a time.
+        """
+        if total_jobs is None:
+            total_jobs = len(jobs_data) if hasattr(jobs_data, '__len__') else 0
         success_count = 0
+        jobs_iter = _unique_jobs(jobs_data)
 
         self.logger.info(f"Starting upload of {total_jobs} jobs in batches of {batch_size}")
 
-        for i in range(0, total_jobs, batch_size):
-            batch = jobs_data[i:i + batch_size]
-            batch_start = i + 1
-            batch_end = min(i + batch_size, total_jobs)
+        batch_end = 0
+        while True:
+            batch = list(islice(jobs_iter, batch_size))
+            if not batch:
+                break
+            batch_start = batch_end + 1
+            batch_end += len(batch)
+            total_jobs = max(total_jobs, batch_end)
 
             self.logger.info(f"Processing batch {batch_start}-{batch_end}/{total_jobs}")
 
@@ -234,10 +260,11 @@ class JobDataManager:
             if batch_end < total_jobs:
                 time.sleep(0.5)
 
+        total_jobs = batch_end
         self.logger.info(f"Upload complete: {success_count}/{total_jobs} jobs uploaded successfully")
         return success_count, total_jobs
 
-    def load_jobs_from_file(self, file_path) -> Optional[List[Dict]]:
+    def load_jobs_from_file(self, file_path) -> Optional[Iterable[Dict]]:
         """Load jobs data from JSON file with validation"""
         try:
             # Convert to Path object if it's a string
@@ -252,6 +279,11 @@ class JobDataManager:
 
             self.logger.info(f"Loading jobs from: {file_path}")
 
+            if _is_jsonl(file_path):
+                # File JSONL được đọc lười từng dòng, không nạp toàn bộ vào bộ nhớ
+                self.logger.info(f"📝 Streaming jobs from {file_path.name}")
+                return _iter_jobs(file_path)
+
             with open(file_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
 
@@ -292,7 +324,11 @@ class JobDataManager:
                 return False
 
             # Step 3: Upload new jobs
-            uploaded_count, total_new = self.batch_upload_jobs(jobs_data)
+            total_hint = _read_metadata(data_file_path).get('total_jobs') if _is_jsonl(data_file_path) else None
+            uploaded_count, total_new = self.batch_upload_jobs(jobs_data, total_jobs=total_hint)
+            if not total_new:
+                self.logger.error("No jobs found in data file, nothing uploaded")
+                return False
 
             # Summary
             self.logger.info("=" * 50)
@@ -316,7 +352,7 @@ def _SaveToData():
         project_root = _find_project_root(Path(__file__))
         crawler_folder = _find_folder('crawler', search_dir=project_root)
         output_folder = _find_folder('output', search_dir=crawler_folder)
-        latest_file = _find_latest_file(search_dir=output_folder, suffix='.json')
+        latest_file = _find_latest_output(search_dir=output_folder)
 
         # Debug information
         print(f"Debug - Project root: {project_root}")
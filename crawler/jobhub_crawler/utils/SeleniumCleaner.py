@@ -12,9 +12,10 @@ import shutil
 import tempfile
 import logging
 import argparse
-import psutil
 from pathlib import Path
 
+from jobhub_crawler.core.process_registry import BrowserProcessRegistry
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -28,31 +29,17 @@ class SeleniumCleaner:
         self.temp_dir = tempfile.gettempdir()
 
     def kill_browser_processes(self, force=False):
-        """Kill tất cả browser processes"""
-        browser_names = ['chrome', 'chromedriver', 'firefox', 'geckodriver', 'msedge', 'edgedriver']
-        killed_count = 0
-
-        logger.info("Scanning for browser processes...")
-
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-            try:
-                proc_name = proc.info['name'].lower()
-
-                # Check if it's a browser process
-                if any(browser in proc_name for browser in browser_names):
-                    if force:
-                        # Force kill
-                        proc.kill()
-                        killed_count += 1
-                        logger.info(f"Force killed: {proc.info['name']} (PID: {proc.info['pid']})")
-                    else:
-                        # Graceful termination
-                        proc.terminate()
-                        killed_count += 1
-                        logger.info(f"Terminated: {proc.info['name']} (PID: {proc.info['pid']})")
+        """
+        Kill browser processes bị bỏ lại bởi các crawler đã thoát
 
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
+        Chỉ dừng các cây process được ghi trong BrowserProcessRegistry bởi crawler process không
+        còn chạy; Chrome của crawler đang chạy (và mọi trình duyệt khác trên máy) không bị đụng tới.
+
+        Args:
+            force (bool): Kill ngay thay vì terminate rồi chờ process tự thoát
+        """
+        logger.info("Reaping browsers left by exited crawlers...")
+        killed_count, _ = BrowserProcessRegistry.shared().reap_stale(timeout=0 if force else 3)
 
         if killed_count == 0:
             logger.info("No browser processes found")
@@ -65,8 +52,12 @@ class SeleniumCleaner:
         temp_root = tempfile.gettempdir()  # Lấy đường dẫn %TEMP%
         pattern = os.path.join(temp_root, "selenium_jobhub_*")
         temp_dirs = glob.glob(pattern)
+        # Không xoá profile của Chrome đang chạy (của process này hay crawler khác trên máy)
+        in_use = BrowserProcessRegistry.shared().live_temp_dirs()
 
         for dir_path in temp_dirs:
+            if dir_path in in_use:
+                continue
             if os.path.isdir(dir_path):
                 try:
                     shutil.rmtree(dir_path)
@@ -90,6 +81,7 @@ class SeleniumCleaner:
         ]
 
         cutoff_time = time.time() - (days_old * 24 * 60 * 60) if days_old > 0 else 0
+        in_use = BrowserProcessRegistry.shared().live_temp_dirs()
         cleaned_count = 0
         total_size = 0
 
@@ -129,6 +121,10 @@ class SeleniumCleaner:
                     if not os.path.exists(item_path):
                         continue
 
+                    # Profile của Chrome đang chạy
+                    if item_path in in_use:
+                        continue
+
                     # Check age if specified
                     if days_old > 0:
                         file_time = os.path.getmtime(item_path)
@@ -267,7 +263,7 @@ class SeleniumCleaner:
         return f"{size_bytes:.1f} TB"
 
     def emergency_cleanup(self):
-        """Emergency cleanup - kill all và xóa tất cả"""
+        """Emergency cleanup - kill browser bị bỏ lại và xóa tất cả temp không còn dùng"""
         logger.info("🚨 EMERGENCY CLEANUP STARTED 🚨")
 
         # 1. Force kill all browser processes
@@ -388,9 +384,9 @@ class SeleniumCleaner:
 def main():
     parser = argparse.ArgumentParser(description='Selenium Cleanup Utility')
     parser.add_argument('--emergency', action='store_true',
-                        help='Emergency cleanup - kill all browsers and clean everything')
+                        help='Emergency cleanup - kill browsers left by exited crawlers and clean everything')
     parser.add_argument('--kill-processes', action='store_true',
-                        help='Kill browser processes only')
+                        help='Kill browser processes left by exited crawlers only')
     parser.add_argument('--clean-temp', action='store_true',
                         help='Clean temp files only')
     parser.add_argument('--find-large', type=int, default=0, metavar='MB',
@@ -6,12 +6,15 @@ from datetime import datetime
 
 from typing import List, Dict, Union, Optional, Any
 
-from jobhub_crawler.utils.helpers import _find_folder, _find_latest_file, _find_project_root
+from jobhub_crawler.utils.helpers import _find_folder, _find_project_root
+from jobhub_crawler.utils.urls import _job_key
+from jobhub_crawler.utils.jsonl import JsonlWriter, _is_jsonl, _iter_jobs, _read_metadata, _find_latest_output, \
+    _output_filename
 
 project_root = _find_project_root(Path(__file__))
 crawler_folder = _find_folder('crawler', search_dir=project_root)
 output_folder = _find_folder('output', search_dir=crawler_folder)
-last_file_output = _find_latest_file(search_dir=output_folder, suffix='.json')
+last_file_output = _find_latest_output(search_dir=output_folder)
 
 
 def _check_valid_input(data_check: Any) -> bool:
@@ -36,6 +39,9 @@ def _open_and_read_file(file_path: str, key_level1: str, key_level2: str) -> Uni
         print(f"❌ File không tồn tại hoặc tên file không hợp lệ: {file_path}")
         return [] if key_level1 == 'jobs' else {}
 
+    if _is_jsonl(file_path):
+        return _open_and_read_jsonl(file_path, key_level1, key_level2)
+
     try:
         with open(file_path, "r", encoding="utf-8") as f:
             json_data = json.load(f)
@@ -77,6 +83,25 @@ def _open_and_read_file(file_path: str, key_level1: str, key_level2: str) -> Uni
         return [] if key_level1 == 'jobs' else {}
 
 
+def _open_and_read_jsonl(file_path: str, key_level1: str, key_level2: str) -> Union[List[Dict[str, str]], Dict]:
+    """Giống _open_and_read_file nhưng đọc file JSONL theo từng dòng"""
+    try:
+        if key_level1 == 'jobs':
+            return [
+                {'title': entry.get('title', ''), 'url': entry[key_level2]}
+                for entry in _iter_jobs(file_path)
+                if key_level2 in entry
+            ]
+        elif key_level1 == 'metadata':
+            return _read_metadata(file_path)
+        else:
+            print(f"❌ Key cấp 1 '{key_level1}' chưa được hỗ trợ.")
+            return {}
+    except (json.JSONDecodeError, OSError, EOFError) as e:
+        print(f"❌ Lỗi khi đọc file JSONL {file_path}: {e}")
+        return [] if key_level1 == 'jobs' else {}
+
+
 def _find_diff_text_in_array(data: List[str], data_check: List[str]) -> List[str]:
     """Trả về các URL khác biệt giữa hai danh sách."""
     set_data = set(data)
@@ -89,24 +114,24 @@ def _find_diff_text_in_array(data: List[str], data_check: List[str]) -> List[str
 
 def _find_diff_dict(data: List[Dict], data_check: List[Dict]) -> List[Dict]:
     """
-    Trả về các dict trong data_check có URL chưa tồn tại trong data.
+    Trả về các dict trong data_check có URL chưa tồn tại trong data (so sánh theo khoá _job_key).
     """
-    # Tập hợp các URL đã tồn tại trong data
-    existing_urls = {item["url"] for item in data if "url" in item}
+    # Tập hợp các khoá job đã tồn tại trong data
+    existing_keys = {_job_key(item["url"]) for item in data if "url" in item}
 
-    # Trả về các dict trong data_check có URL chưa từng xuất hiện trong data
+    # Trả về các dict trong data_check có khoá chưa từng xuất hiện trong data
     result = [
         item for item in data_check
-        if "url" in item and item["url"] not in existing_urls
+        if "url" in item and _job_key(item["url"]) not in existing_keys
     ]
 
     return result
 
 def _find_diff_dict_2(data: List[Dict], data_check: List[Dict]) -> List[Dict]:
-    """Trả về các dict có URL khác biệt giữa hai danh sách."""
-    # Lọc và ánh xạ url -> dict
-    data_urls = {item["url"]: item for item in data if "url" in item}
-    check_urls = {item["url"]: item for item in data_check if "url" in item}
+    """Trả về các dict có URL khác biệt giữa hai danh sách (so sánh theo khoá _job_key)."""
+    # Lọc và ánh xạ khoá job -> dict
+    data_urls = {_job_key(item["url"]): item for item in data if "url" in item}
+    check_urls = {_job_key(item["url"]): item for item in data_check if "url" in item}
 
     # Tập hợp các url chỉ xuất hiện ở một trong hai danh sách
     diff_urls = set(data_urls) ^ set(check_urls)  # symmetric_difference
@@ -148,85 +173,76 @@ def _get_data_in_file(
 
     return data
 
-def _merge_two_records(record2: Dict[str, Any], filename: Optional[str] = None) -> Optional[str]:
-    try:
-        input_path = Path(last_file_output)
-        if not input_path.exists():
-            logging.warning(f"[⚠️] File gốc không tồn tại: {input_path}")
-            return None
+def _merge_output_files(new_file_path: str, filename: Optional[str] = None,
+                        compression: Optional[str] = "gzip") -> Optional[str]:
+    """
+    Gộp file output mới vào file output mới nhất trước đó, ghi ra một file JSONL.
 
-        with open(input_path, "r", encoding="utf-8") as file:
-            record1 = json.load(file)
+    Chạy với bộ nhớ không đổi theo số job: chỉ giữ tập URL của file mới, các job được
+    đọc và ghi lần lượt từng dòng. Job trùng khoá (_job_key) thì bản trong file mới được giữ lại.
 
-    except Exception as e:
-        logging.error(f"[❌] Lỗi khi đọc file đầu vào {last_file_output}: {e}")
+    Args:
+        new_file_path (str): File output của lần crawl vừa xong
+        filename (Optional[str]): Tên file gộp (mặc định: jobs_<timestamp>.jsonl[.gz|.zst])
+        compression (Optional[str]): 'gzip', 'zstd' hoặc None
+
+    Returns:
+        Optional[str]: Đường dẫn file gộp, None nếu lỗi
+    """
+    if not last_file_output or not Path(last_file_output).exists():
+        logging.warning(f"[⚠️] File gốc không tồn tại: {last_file_output}")
         return None
+    input_path = Path(last_file_output)
 
+    output_path = Path(output_folder) / (filename or _output_filename("jobs", compression))
+    writer = None
     try:
-        # Gộp job và loại trùng theo URL
-        job_map = {
-            job.get("url"): job
-            for job in record1.get("jobs", []) + record2.get("jobs", [])
-            if job.get("url")
-        }
-        jobs = list(job_map.values())
-
-        # Tổng hợp source
-        sources = {}
-        for job in jobs:
-            src = job.get("source")
-            if src:
-                sources[src] = sources.get(src, 0) + 1
-
-        # Metadata
-        meta1 = record1.get("metadata", {})
-        meta2 = record2.get("metadata", {})
+        meta1 = _read_metadata(input_path)
+        meta2 = _read_metadata(new_file_path)
+
+        # Lượt 1: tập khoá job của file mới (nhỏ hơn nhiều so với toàn bộ job)
+        new_keys = {_job_key(job["url"]) for job in _iter_jobs(new_file_path) if job.get("url")}
+
+        # Lượt 2: ghi job cũ không bị thay thế (bỏ cả bản trùng trong file cũ), rồi tới job mới
+        writer = JsonlWriter(output_path)
+        written = set()
+        for job in _iter_jobs(input_path):
+            key = _job_key(job.get("url"))
+            if key and key not in new_keys and key not in written:
+                written.add(key)
+                writer.write_job(job)
+
+        for job in _iter_jobs(new_file_path):
+            key = _job_key(job.get("url"))
+            if key and key not in written:
+                written.add(key)
+                writer.write_job(job)
+
         created_at = max(
             meta1.get("created_at", "1970-01-01"),
             meta2.get("created_at", "1970-01-01"),
             key=lambda x: datetime.fromisoformat(x)
         )
         execution_time = meta1.get("execution_time", 0.0) + meta2.get("execution_time", 0.0)
-
-        # Output record
-        output = {
-            "metadata": {
-                "total_jobs": len(jobs),
-                "created_at": created_at,
-                "execution_time": execution_time,
-                "sources": sources
-            },
-            "jobs": jobs
-        }
-
-        # Tạo tên file nếu chưa có
-        if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"jobs_{timestamp}.json"
-
-        filepath = os.path.join(output_folder, filename)
-        output_path = Path(filepath)
-
-        # Ghi file mới
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(output, f, ensure_ascii=False, indent=2)
-            f.flush()
-            os.fsync(f.fileno())
-
-        # Sau khi đã merge và ghi file thành công, mới xoá bản cũ
-        try:
-            input_path.unlink()
-            logging.info(f"[🗑️] Đã xoá file gốc: {input_path}")
-        except Exception as del_err:
-            logging.warning(f"[⚠️] Không thể xoá file gốc: {input_path} - {del_err}")
-
-        logging.info(f"[✅] Gộp file thành công: {output_path}")
-        return str(output_path)
+        writer.close(created_at=created_at, execution_time=execution_time)
+        writer = None
 
     except Exception as e:
         logging.error(f"[❌] Lỗi khi merge records: {e}")
+        if writer:
+            writer.abort()
         return None
 
+    # Sau khi đã merge và ghi file thành công, mới xoá bản cũ
+    try:
+        input_path.unlink()
+        logging.info(f"[🗑️] Đã xoá file gốc: {input_path}")
+    except Exception as del_err:
+        logging.warning(f"[⚠️] Không thể xoá file gốc: {input_path} - {del_err}")
+
+    logging.info(f"[✅] Gộp file thành công: {output_path}")
+    return str(output_path)
+
 
 # if __name__ == '__main__':
 #     data = get_data_in_file()
@@ -0,0 +1,32 @@
+from typing import Mapping, Optional, Union
+
+# Dấu hiệu chỉ có trên trang challenge của Cloudflare (managed challenge / JS challenge / Turnstile).
+# Không dùng 'challenge-platform' / 'cf-chl': trang bình thường sau Cloudflare cũng nhúng
+# /cdn-cgi/challenge-platform/scripts/jsd/main.js. Response HTTP còn được nhận qua header cf-mitigated
+CHALLENGE_MARKERS = ('<title>just a moment...', 'window._cf_chl_opt')
+CHALLENGE_STATUSES = (403, 429, 503)
+
+
+def _is_challenge_html(page: Union[bytes, str, None]) -> bool:
+    """Trang HTML (page_source hoặc body HTTP) có phải trang challenge của Cloudflare không"""
+    if not page:
+        return False
+    if isinstance(page, bytes):
+        # Marker luôn nằm trong <head>, không cần decode cả trang
+        page = page[:20000].decode('utf-8', errors='ignore')
+    page = page[:20000].lower()
+    return any(marker in page for marker in CHALLENGE_MARKERS)
+
+
+def _is_cloudflare_challenge(status: int, headers: Optional[Mapping[str, str]], body: Union[bytes, str, None]) -> bool:
+    """
+    Response HTTP có bị Cloudflare chặn bằng challenge không (cần clearance từ trình duyệt)
+
+    Args:
+        status: HTTP status
+        headers: Response headers (case-insensitive mapping như requests/aiohttp)
+        body: Response body
+    """
+    if headers and headers.get('cf-mitigated', '').lower() == 'challenge':
+        return True
+    return status in CHALLENGE_STATUSES and _is_challenge_html(body)
@@ -1,12 +1,13 @@
 import os
 import time
-import random
 from pathlib import Path
 from selenium.common import TimeoutException
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
+from jobhub_crawler.core.rate_limit import _rate_limit
+
 
 # simple
 
@@ -133,31 +134,66 @@ def _refresh(self):
         self.logger.error(f"Error refreshing page: {str(e)}")
 
 
+_SCROLL_LOADER_JS = None
+
+
+def _scroll_until_loaded(driver, item_selector=None, idle_timeout=3.0, settle=0.3, max_scrolls=100,
+                         max_wait=30.0, logger=None):
+    """
+    Cuộn trang infinite-scroll cho tới khi không còn item mới, dựa trên sự kiện thay vì sleep cố định.
+
+    Mỗi lần cuộn, trang được theo dõi bằng MutationObserver và bộ đếm request fetch/XHR đang chạy
+    (utils/js/scroll_loader.js): lần cuộn kết thúc ngay khi item mới đã xuất hiện và mạng rảnh
+    trong ``settle`` giây. Việc cuộn dừng khi một lần cuộn không thêm item nào sau ``idle_timeout``
+    giây kể từ lúc mạng rảnh, nên trang tải chậm không bị dừng sớm.
+
+    Args:
+        driver (selenium.webdriver): WebDriver đang mở trang listing
+        item_selector (str): CSS selector của một item (card job); None = so sánh scrollHeight
+        idle_timeout (float): Số giây chờ khi mạng đã rảnh mà không có item mới trước khi dừng
+        settle (float): Số giây DOM/mạng phải yên sau khi có item mới
+        max_scrolls (int): Số lần cuộn tối đa
+        max_wait (float): Thời gian tối đa cho một lần cuộn (request treo không làm kẹt vòng lặp)
+        logger (logging.Logger): Logger tuỳ chọn
+
+    Returns:
+        int: Số item (hoặc scrollHeight nếu không có item_selector) sau khi cuộn xong
+    """
+    global _SCROLL_LOADER_JS
+    if _SCROLL_LOADER_JS is None:
+        with open(_get_file('js', 'scroll_loader.js'), "r", encoding="utf-8") as f:
+            _SCROLL_LOADER_JS = f.read()
+
+    driver.set_script_timeout(max_wait + 5)
+    count = 0
+    for scroll in range(max_scrolls):
+        result = driver.execute_async_script(
+            _SCROLL_LOADER_JS, item_selector, int(idle_timeout * 1000), int(settle * 1000), int(max_wait * 1000)
+        )
+        count = result.get('count', 0)
+        if logger:
+            logger.debug(f"Scroll {scroll + 1}: {count} items after {result.get('elapsed', 0)} ms")
+        if not result.get('grew'):
+            break
+    return count
+
+
 def _scroll_to_bottom(driver, delay=2, max_attempts=10):
     """
     Scrolls to the bottom of the page to load all dynamic content (e.g. infinite scroll).
 
-    This function repeatedly scrolls the web page down using Selenium WebDriver
-    until no new content is loaded or the maximum number of attempts is reached.
+    Kept for existing callers; now delegates to the event-driven _scroll_until_loaded(), so each
+    scroll returns as soon as new content has loaded instead of always sleeping ``delay``.
 
     Args:
         driver (selenium.webdriver): The Selenium WebDriver instance controlling the browser.
-        delay (int, optional): Number of seconds to wait after each scroll. Defaults to 2.
+        delay (int, optional): Seconds to wait for new content once the network is idle. Defaults to 2.
         max_attempts (int, optional): Maximum number of scroll attempts before stopping. Defaults to 10.
 
     Returns:
         None
     """
-    last_height = driver.execute_script("return document.body.scrollHeight")
-
-    for _ in range(max_attempts):
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(delay)  # Wait for new content to load
-
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            break  # No more new content to load
-        last_height = new_height
+    _scroll_until_loaded(driver, idle_timeout=delay, max_scrolls=max_attempts)
 
 
 def _find_page_number(driver, xpath, delay=2):
@@ -332,6 +368,9 @@ def _click_next_button(self, selector, page_number, last_page_number, wait_after
             # Get current URL to verify navigation
             current_url = self.driver.current_url
 
+            # Click sẽ điều hướng sang trang mới -> lấy lượt từ rate limiter của host trước
+            _rate_limit(current_url)
+
             # Try different click methods
             click_success = False
 
@@ -365,7 +404,7 @@ def _click_next_button(self, selector, page_number, last_page_number, wait_after
 
             if wait_after_click:
                 # Wait for page to load with multiple strategies
-                _wait_for_page_load(current_url, max_wait_time)
+                _wait_for_page_load(self, current_url, max_wait_time)
 
             self.logger.info("Successfully navigated to next page")
             return True
@@ -402,8 +441,3 @@ def _wait_for_page_load(self, previous_url, max_wait_time=10):
         self.logger.debug("Page load state is complete")
     except TimeoutException:
         self.logger.warning("Page load state timeout")
-
-    # Strategy 3: Additional random wait to ensure content loads
-    wait_time = random.uniform(2, 4)
-    self.logger.debug(f"Additional wait time: {wait_time:.1f}s")
-    time.sleep(wait_time)
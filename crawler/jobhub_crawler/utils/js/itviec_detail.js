@@ -0,0 +1,66 @@
+/*
+ * Extractor trang chi tiết ItViec, chạy trong trang (xem core/js_extractor.py).
+ * Trả về đúng các field mà parsers/itviec.py lấy từ HTML, dưới dạng JSON gọn thay cho cả page_source.
+ *
+ * Tham số: tagHeadings, experienceHeadings (TAG_HEADINGS / EXPERIENCE_HEADINGS của parser).
+ * Trả về null khi không nhận ra bố cục trang, để spider quay lại parse HTML.
+ */
+(function (tagHeadings, experienceHeadings) {
+    function text(el) {
+        return el ? el.textContent.trim() : '';
+    }
+
+    // Tương đương get_text(strip=True) của BeautifulSoup: ghép các đoạn text đã strip
+    function strippedText(el) {
+        var parts = [];
+        var walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+        while (walker.nextNode()) {
+            var part = walker.currentNode.nodeValue.trim();
+            if (part) parts.push(part);
+        }
+        return parts.join('');
+    }
+
+    function nextDiv(el) {
+        var next = el.nextElementSibling;
+        while (next && next.tagName !== 'DIV') next = next.nextElementSibling;
+        return next;
+    }
+
+    function all(root, selector) {
+        return Array.prototype.slice.call(root.querySelectorAll(selector));
+    }
+
+    var header = document.querySelector('div.job-header-info');
+    var showHeader = header && header.closest('div.job-show-header');
+    var mid = showHeader && showHeader.nextElementSibling;
+    if (!header || !mid || !header.querySelector('h1')) return null;
+
+    var spans = all(mid, 'span').map(text).filter(Boolean);
+    var tags = [], experience = [];
+    all(mid, 'div').forEach(function (div) {
+        var heading = strippedText(div);
+        var isTag = tagHeadings.indexOf(heading) >= 0;
+        var isExperience = experienceHeadings.indexOf(heading) >= 0;
+        if (!isTag && !isExperience) return;
+        var values = nextDiv(div);
+        if (!values) return;
+        var links = all(values, 'a');
+        if (isTag) {
+            tags = tags.concat(links.length ? links.map(text) : all(values, 'div').map(strippedText));
+        } else {
+            experience = experience.concat(links.map(text));
+        }
+    });
+
+    return {
+        title: text(header.querySelector('h1')),
+        company: text(header.querySelector('div.employer-name')),
+        salary: text(header.querySelector('a')),
+        location: spans.length > 1 ? spans.slice(0, -1) : [],
+        posted_at: spans.length ? spans[spans.length - 1] : '',
+        experience: experience,
+        tags: tags,
+        description: text(document.querySelector('section.job-content'))
+    };
+})
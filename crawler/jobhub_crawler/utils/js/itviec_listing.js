@@ -0,0 +1,13 @@
+/*
+ * Extractor trang listing ItViec: [{title, url}] của các job card, thay cho page_source + BeautifulSoup.
+ * URL trả về nguyên dạng data-url; spider tự chuẩn hoá bằng _canonical_url.
+ */
+(function () {
+    var jobs = [];
+    document.querySelectorAll('div.job-card').forEach(function (card) {
+        var title = card.querySelector('h3');
+        var url = title && title.getAttribute('data-url');
+        if (url) jobs.push({title: title.textContent.trim(), url: url});
+    });
+    return jobs;
+})
@@ -0,0 +1,71 @@
+/*
+ * Event-driven infinite-scroll step, run with
+ * driver.execute_async_script(source, itemSelector, idleMs, settleMs, maxMs).
+ *
+ * Lần đầu chạy sẽ cài MutationObserver và bộ đếm request fetch/XHR đang chạy vào window.__jobhubScroll.
+ * Mỗi lần gọi: cuộn xuống cuối trang rồi chờ cho tới khi
+ *   - có nội dung mới (DOM thay đổi) và mạng rảnh trong settleMs  -> trả về {grew: true, ...}
+ *   - hoặc không có gì mới sau idleMs kể từ lúc mạng rảnh           -> trả về {grew: false, ...}
+ *   - hoặc quá maxMs (vd request long-polling không bao giờ xong)    -> trả về theo số item hiện tại
+ */
+(function (itemSelector, idleMs, settleMs, maxMs, done) {
+    var state = window.__jobhubScroll;
+    if (!state) {
+        state = window.__jobhubScroll = {inflight: 0, lastMutation: 0, lastNetwork: Date.now()};
+
+        var origFetch = window.fetch;
+        if (origFetch) {
+            window.fetch = function () {
+                state.inflight++;
+                return origFetch.apply(this, arguments).finally(function () {
+                    state.inflight--;
+                    state.lastNetwork = Date.now();
+                });
+            };
+        }
+
+        var origSend = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function () {
+            state.inflight++;
+            this.addEventListener('loadend', function () {
+                state.inflight--;
+                state.lastNetwork = Date.now();
+            });
+            return origSend.apply(this, arguments);
+        };
+
+        new MutationObserver(function (mutations) {
+            for (var i = 0; i < mutations.length; i++) {
+                if (mutations[i].addedNodes.length) {
+                    state.lastMutation = Date.now();
+                    return;
+                }
+            }
+        }).observe(document.body, {childList: true, subtree: true});
+    }
+
+    function count() {
+        return itemSelector ? document.querySelectorAll(itemSelector).length : document.body.scrollHeight;
+    }
+
+    var before = count();
+    var start = Date.now();
+    window.scrollTo(0, document.body.scrollHeight);
+
+    (function poll() {
+        var now = Date.now();
+        var idle = state.inflight <= 0;
+        var current = count();
+
+        if (current > before && idle && now - Math.max(state.lastMutation, state.lastNetwork) >= settleMs) {
+            return done({grew: true, count: current, elapsed: now - start});
+        }
+        if (current <= before && idle && now - Math.max(start, state.lastNetwork) >= idleMs) {
+            return done({grew: false, count: current, elapsed: now - start});
+        }
+        if (now - start >= maxMs) {
+            return done({grew: current > before, count: current, elapsed: now - start});
+        }
+        setTimeout(poll, 50);
+    })();
+})(arguments[0], arguments[1], arguments[2], arguments[3], arguments[arguments.length - 1]);
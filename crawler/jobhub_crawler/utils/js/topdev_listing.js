@@ -0,0 +1,12 @@
+/*
+ * Extractor trang listing TopDev sau khi cuộn xong: [{title, url}] của các card khớp cardSelector.
+ * a.href đã là URL tuyệt đối (trình duyệt tự ghép với URL trang); spider tự chuẩn hoá bằng _canonical_url.
+ */
+(function (cardSelector) {
+    var jobs = [];
+    document.querySelectorAll(cardSelector).forEach(function (card) {
+        var link = card.querySelector('h3.line-clamp-1 a');
+        if (link && link.getAttribute('href')) jobs.push({title: link.textContent.trim(), url: link.href});
+    });
+    return jobs;
+})
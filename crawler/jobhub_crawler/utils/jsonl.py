@@ -0,0 +1,146 @@
+import os
+import gzip
+import json
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+# Định dạng output: mỗi dòng một record JSON
+#   dòng đầu : {"_type": "header", "format": "jobhub-jsonl", "version": 1, "created_at": ...}
+#   giữa     : mỗi dòng là một job (dict của JobItem)
+#   dòng cuối: {"_type": "footer", "metadata": {"total_jobs", "created_at", "execution_time", "sources"}}
+JSONL_FORMAT = "jobhub-jsonl"
+JSONL_VERSION = 1
+
+COMPRESSION_SUFFIXES = {
+    None: ".jsonl",
+    "gzip": ".jsonl.gz",
+    "zstd": ".jsonl.zst",
+}
+OUTPUT_PATTERNS = ("jobs_*.json",) + tuple(f"jobs_*{suffix}" for suffix in COMPRESSION_SUFFIXES.values())
+
+
+def _normalize_compression(compression: Optional[str]) -> Optional[str]:
+    if compression in (None, "", "none"):
+        return None
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unsupported compression '{compression}', expected gzip, zstd or none")
+    return compression
+
+
+def _output_filename(prefix: str = "jobs", compression: Optional[str] = None) -> str:
+    """Tạo tên file output theo timestamp, đuôi file theo kiểu nén"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"{prefix}_{timestamp}{COMPRESSION_SUFFIXES[_normalize_compression(compression)]}"
+
+
+def _is_jsonl(path) -> bool:
+    return any(str(path).endswith(suffix) for suffix in COMPRESSION_SUFFIXES.values())
+
+
+def _open_text(path, mode: str):
+    """Mở file JSONL ở chế độ text, tự chọn gzip/zstd theo đuôi file"""
+    path = str(path)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    if path.endswith(".zst"):
+        import zstandard  # Chỉ cần khi dùng nén zstd
+
+        return zstandard.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class JsonlWriter:
+    """Ghi file JSONL tăng dần: header khi mở, từng job một, footer metadata khi đóng"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.total_jobs = 0
+        self.sources: Dict[str, int] = {}
+        self._file = _open_text(self.path, "w")
+        self._write_record({
+            "_type": "header",
+            "format": JSONL_FORMAT,
+            "version": JSONL_VERSION,
+            "created_at": datetime.now().isoformat(),
+        })
+
+    def _write_record(self, record: Dict[str, Any]):
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        self._file.write("\n")
+
+    def write_job(self, job: Dict[str, Any]):
+        self._write_record(job)
+        self.total_jobs += 1
+        source = job.get("source")
+        if source:
+            self.sources[source] = self.sources.get(source, 0) + 1
+
+    def close(self, created_at: Optional[str] = None, execution_time: float = 0.0) -> Dict[str, Any]:
+        """Ghi footer và đóng file; trả về metadata đã ghi"""
+        metadata = {
+            "total_jobs": self.total_jobs,
+            "created_at": created_at or datetime.now().isoformat(),
+            "execution_time": execution_time,
+            "sources": self.sources,
+        }
+        self._write_record({"_type": "footer", "metadata": metadata})
+        self._file.close()
+        return metadata
+
+    def abort(self):
+        """Đóng và xoá file đang ghi dở"""
+        self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _iter_records(path) -> Iterator[Dict[str, Any]]:
+    """Đọc lần lượt từng record của file JSONL (bao gồm header/footer)"""
+    with _open_text(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _iter_jobs(path) -> Iterator[Dict[str, Any]]:
+    """
+    Đọc lần lượt từng job trong file output.
+
+    File JSONL được đọc theo dòng (bộ nhớ không đổi); file .json cũ vẫn được hỗ trợ
+    nhưng phải json.load toàn bộ.
+    """
+    if not _is_jsonl(path):
+        with open(path, "r", encoding="utf-8") as f:
+            yield from json.load(f).get("jobs", [])
+        return
+
+    for record in _iter_records(path):
+        if "_type" not in record:
+            yield record
+
+
+def _read_metadata(path) -> Dict[str, Any]:
+    """Đọc metadata (footer) của file output; với file .json cũ đọc key 'metadata'"""
+    if not _is_jsonl(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("metadata", {})
+
+    metadata = {}
+    for record in _iter_records(path):
+        if record.get("_type") == "footer":
+            metadata = record.get("metadata", {})
+    return metadata
+
+
+def _find_latest_output(search_dir="output") -> Optional[str]:
+    """Tìm file output mới nhất (.json cũ hoặc .jsonl/.jsonl.gz/.jsonl.zst)"""
+    path_dir = Path(search_dir) if search_dir else None
+    if not path_dir or not path_dir.exists():
+        return None
+
+    files = [f for pattern in OUTPUT_PATTERNS for f in path_dir.glob(pattern)]
+    if not files:
+        return None
+    return str(max(files, key=lambda f: f.stat().st_mtime))
@@ -0,0 +1,65 @@
+import re
+import json
+import base64
+import logging
+from typing import Any, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _drain_performance_log(driver) -> List[dict]:
+    """
+    Đọc (và xoá) các sự kiện DevTools đã ghi trong performance log của driver.
+
+    Driver phải được tạo với capability goog:loggingPrefs = {'performance': 'ALL'}
+    (ChromeDriverPool(capture_network=True)).
+    """
+    events = []
+    for entry in driver.get_log('performance'):
+        try:
+            events.append(json.loads(entry['message'])['message'])
+        except (KeyError, ValueError):
+            continue
+    return events
+
+
+def _reset_network_capture(driver):
+    """Bỏ các sự kiện cũ (driver trong pool có thể còn log của lần mượn trước)"""
+    _drain_performance_log(driver)
+
+
+def _captured_json_responses(driver, url_pattern: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Lấy body JSON của các response mà trang đã tự fetch, khớp url_pattern, từ sự kiện Network của DevTools.
+
+    Args:
+        driver: WebDriver có bật performance log
+        url_pattern (str): Regex áp dụng lên URL của response (vd API listing)
+
+    Yields:
+        (url, dữ liệu JSON đã parse) cho từng response đọc được body
+    """
+    pattern = re.compile(url_pattern)
+    responses = {}
+    finished = set()
+
+    for event in _drain_performance_log(driver):
+        method = event.get('method')
+        params = event.get('params', {})
+        if method == 'Network.responseReceived':
+            response = params.get('response', {})
+            if 'json' in response.get('mimeType', '') and pattern.search(response.get('url', '')):
+                responses[params['requestId']] = response['url']
+        elif method == 'Network.loadingFinished':
+            finished.add(params.get('requestId'))
+
+    for request_id, url in responses.items():
+        # Chỉ response đã tải xong mới có body
+        if request_id not in finished:
+            continue
+        try:
+            body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+            text = base64.b64decode(body['body']) if body.get('base64Encoded') else body['body']
+            yield url, json.loads(text)
+        except Exception as e:
+            logger.debug(f"Could not read response body of {url}: {e}")
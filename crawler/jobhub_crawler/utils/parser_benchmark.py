@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Parser Backend Benchmark
+Đo tốc độ (pages/sec) và bộ nhớ đỉnh của từng backend parser trên các trang TopDev/ItViec đã lưu
+
+Ví dụ:
+    python -m jobhub_crawler.utils.parser_benchmark --site topdev --pages saved_pages/topdev --repeat 5
+"""
+
+import time
+import logging
+import argparse
+import tracemalloc
+import multiprocessing
+from pathlib import Path
+
+import psutil
+
+from jobhub_crawler.parsers import itviec, topdev
+from jobhub_crawler.parsers.backends import PARSER_BACKENDS
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SITE_PARSERS = {
+    'topdev': topdev._parse_job_detail,
+    'itviec': itviec._parse_job_detail,
+}
+
+
+def _load_pages(pages_dir: str):
+    """Đọc tất cả file *.html trong thư mục dưới dạng bytes"""
+    return [path.read_bytes() for path in sorted(Path(pages_dir).glob('*.html'))]
+
+
+def _run_backend(site: str, backend: str, pages_dir: str, repeat: int, results, json_ld: bool = False):
+    """Chạy một backend trong process riêng để số liệu bộ nhớ không bị ảnh hưởng bởi backend khác"""
+    parser = SITE_PARSERS[site]
+    pages = _load_pages(pages_dir)
+    process = psutil.Process()
+    base_rss = process.memory_info().rss
+    peak_rss = base_rss
+
+    # Tắt log lỗi parse để không tính thời gian ghi log
+    logging.getLogger(parser.__module__).setLevel(logging.CRITICAL)
+
+    tracemalloc.start()
+    parsed = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            if parser(page, {'url': ''}, site, backend, json_ld):
+                parsed += 1
+            peak_rss = max(peak_rss, process.memory_info().rss)
+    elapsed = time.perf_counter() - start
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = len(pages) * repeat
+    results[backend] = {
+        'pages': total,
+        'parsed': parsed,
+        'seconds': elapsed,
+        'pages_per_sec': total / elapsed if elapsed else 0.0,
+        'peak_rss_mb': (peak_rss - base_rss) / (1024 * 1024),
+        'py_peak_mb': py_peak / (1024 * 1024),
+    }
+
+
+def benchmark(site: str, pages_dir: str, backends=PARSER_BACKENDS, repeat: int = 3, json_ld: bool = False):
+    """
+    Benchmark các backend parser trên thư mục trang đã lưu
+
+    Args:
+        site (str): 'topdev' hoặc 'itviec'
+        pages_dir (str): Thư mục chứa các file .html
+        backends (tuple): Các backend cần đo
+        repeat (int): Số lần lặp lại toàn bộ tập trang
+        json_ld (bool): Đo cả đường đọc JSON-LD (trang không có JobPosting mới parse DOM theo backend)
+
+    Returns:
+        dict: backend -> số liệu đo được
+    """
+    if not _load_pages(pages_dir):
+        raise ValueError(f"No .html pages found in {pages_dir}")
+
+    ctx = multiprocessing.get_context('spawn')
+    with ctx.Manager() as manager:
+        results = manager.dict()
+        for backend in backends:
+            logger.info(f"Benchmarking {site} with backend '{backend}'...")
+            proc = ctx.Process(target=_run_backend, args=(site, backend, pages_dir, repeat, results, json_ld))
+            proc.start()
+            proc.join()
+        return dict(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parser Backend Benchmark')
+    parser.add_argument('--site', required=True, choices=sorted(SITE_PARSERS),
+                        help='Site whose detail-page parser is benchmarked')
+    parser.add_argument('--pages', required=True,
+                        help='Directory of saved detail pages (*.html)')
+    parser.add_argument('--backends', nargs='+', default=list(PARSER_BACKENDS), choices=PARSER_BACKENDS,
+                        help='Backends to benchmark')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of passes over the page set')
+    parser.add_argument('--json-ld', action='store_true',
+                        help='Read the JSON-LD JobPosting block first, as the spiders do')
+
+    args = parser.parse_args()
+    results = benchmark(args.site, args.pages, args.backends, args.repeat, args.json_ld)
+
+    print(f"\n{'backend':<14}{'pages':>8}{'parsed':>8}{'pages/sec':>12}{'peak RSS MB':>14}{'py peak MB':>12}")
+    for backend in args.backends:
+        r = results.get(backend)
+        if not r:
+            print(f"{backend:<14}{'failed':>8}")
+            continue
+        print(f"{backend:<14}{r['pages']:>8}{r['parsed']:>8}{r['pages_per_sec']:>12.1f}"
+              f"{r['peak_rss_mb']:>14.1f}{r['py_peak_mb']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
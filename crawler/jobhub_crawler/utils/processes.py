@@ -0,0 +1,100 @@
+from typing import Dict, Iterable, List
+
+import psutil
+
+
+def _driver_root_pids(driver) -> List[int]:
+    """
+    PID gốc của một driver: process chromedriver (service) và Chrome do undetected_chromedriver
+    tự khởi chạy (browser_pid); Chrome của Selenium thường là con của chromedriver
+    """
+    pids = []
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    if getattr(process, 'pid', None):
+        pids.append(process.pid)
+    browser_pid = getattr(driver, 'browser_pid', None)
+    if browser_pid and browser_pid not in pids:
+        pids.append(browser_pid)
+    return pids
+
+
+def _process_tree(root_pids: Iterable[int]) -> List[psutil.Process]:
+    """Các process gốc còn sống cùng toàn bộ process con (renderer, GPU, utility...), không trùng lặp"""
+    processes = {}
+    for pid in root_pids:
+        try:
+            root = psutil.Process(pid)
+            processes[root.pid] = root
+            for child in root.children(recursive=True):
+                processes[child.pid] = child
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+    return list(processes.values())
+
+
+def _process_tree_rss(root_pids: Iterable[int]) -> int:
+    """
+    Tổng RSS (bytes) của cây process
+
+    Trang bộ nhớ dùng chung giữa các process Chrome bị cộng nhiều lần, nên đây là cận trên;
+    đủ để phát hiện renderer rò rỉ bộ nhớ mà không tốn chi phí đọc USS.
+    """
+    total = 0
+    for process in _process_tree(root_pids):
+        try:
+            total += process.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+    return total
+
+
+def _snapshot_tree(root_pids: Iterable[int]) -> Dict[int, float]:
+    """
+    PID -> create_time của cả cây process tại thời điểm gọi
+
+    create_time đi kèm để sau này nhận ra PID đã bị hệ điều hành cấp lại cho process khác.
+    """
+    snapshot = {}
+    for process in _process_tree(root_pids):
+        try:
+            snapshot[process.pid] = process.create_time()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+    return snapshot
+
+
+def _live_processes(snapshot: Dict[int, float]) -> List[psutil.Process]:
+    """Các process trong snapshot còn chạy (đúng process đã ghi, không phải PID bị cấp lại) cùng process con"""
+    roots = []
+    for pid, create_time in snapshot.items():
+        try:
+            process = psutil.Process(int(pid))
+            if abs(process.create_time() - create_time) < 0.01:
+                roots.append(process.pid)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+    return _process_tree(roots)
+
+
+def _kill_process_tree(snapshot: Dict[int, float], timeout: float = 3) -> int:
+    """
+    Dừng các process còn sống của một cây đã snapshot: terminate, chờ tối đa timeout giây rồi kill
+
+    Returns:
+        int: Số process đã dừng
+    """
+    processes = _live_processes(snapshot)
+    for process in processes:
+        try:
+            process.terminate()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    _, alive = psutil.wait_procs(processes, timeout=timeout)
+    for process in alive:
+        try:
+            process.kill()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    if alive:
+        psutil.wait_procs(alive, timeout=timeout)
+    return len(processes)
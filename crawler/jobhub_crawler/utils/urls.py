@@ -0,0 +1,96 @@
+import re
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Tham số tracking không ảnh hưởng nội dung trang, bỏ đi khi chuẩn hoá URL
+TRACKING_PARAMS = {'src', 'medium', 'lab_feature', 'ref', 'fbclid', 'gclid'}
+TRACKING_PREFIXES = ('utm_',)
+
+# ID số ở cuối slug: .../ky-su-ai-mbbank-2036518, .../technical-project-manager-wata-software-4450
+_JOB_ID_RE = re.compile(r'-(\d+)$')
+
+
+def _normalize_topdev_path(path: str) -> str:
+    # Trang listing trả về /viec-lam/<slug>, trang chi tiết là /detail-jobs/<slug>
+    if path.startswith('/viec-lam/'):
+        return '/detail-jobs/' + path[len('/viec-lam/'):]
+    return path
+
+
+# host -> (tên nguồn, hàm chuẩn hoá path, số cuối slug có phải ID job duy nhất không)
+# TopDev: số cuối slug là ID job, slug đổi (vd thêm "cap-2") nhưng ID giữ nguyên.
+# ItViec: số cuối slug chỉ là hậu tố, trùng giữa các công ty -> khoá theo slug đầy đủ.
+SOURCES = {
+    'topdev.vn': ('topdev', _normalize_topdev_path, True),
+    'itviec.com': ('itviec', None, False),
+}
+
+
+def _split_host(url: str):
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return parts, host
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def _canonical_url(url: str) -> str:
+    """
+    Chuẩn hoá URL job: https, host chữ thường không 'www.', path theo quy tắc của nguồn,
+    bỏ tham số tracking, fragment và dấu '/' cuối.
+
+    Args:
+        url (str): URL gốc lấy từ trang listing hoặc file output
+
+    Returns:
+        str: URL chuẩn hoá (trả nguyên chuỗi rỗng nếu url rỗng)
+    """
+    if not url:
+        return url
+
+    parts, host = _split_host(url)
+    path = re.sub(r'/{2,}', '/', parts.path or '/')
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    source = SOURCES.get(host)
+    if source and source[1]:
+        path = source[1](path)
+
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                             if not _is_tracking_param(k)))
+    return urlunsplit(('https', host, path, query, ''))
+
+
+def _job_id(url: str) -> Optional[str]:
+    """ID số của job trong URL, None nếu URL không có dạng slug-<id>"""
+    if not url:
+        return None
+    match = _JOB_ID_RE.search(urlsplit(url.strip()).path.rstrip('/'))
+    return match.group(1) if match else None
+
+
+def _job_key(url: str) -> str:
+    """
+    Khoá dedup ổn định giữa các lần crawl: '<nguồn>:<id>' (vd 'topdev:2036518') với nguồn có
+    ID job trong URL, '<nguồn>:<slug>' với nguồn khác, hoặc URL chuẩn hoá nếu không nhận diện được nguồn.
+    """
+    if not url:
+        return url
+
+    _, host = _split_host(url)
+    source = SOURCES.get(host)
+    if not source:
+        return _canonical_url(url)
+
+    name, _, has_job_id = source
+    canonical = _canonical_url(url)
+    job_id = _job_id(canonical) if has_job_id else None
+    if job_id:
+        return f'{name}:{job_id}'
+    return f'{name}:{urlsplit(canonical).path.rsplit("/", 1)[-1]}'